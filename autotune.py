@@ -0,0 +1,263 @@
+"""
+Autotune Module
+Sweeps the engine thresholds on synthetic data, picks the fastest value
+for this machine and saves it as a tuning profile (see
+sorting_algorithms.load_tuning_profile)
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+from performance_analyzer import PerformanceAnalyzer
+from sorting_algorithms import (SortingAlgorithms, load_tuning_profile, profile_key,
+                                TUNING_PROFILE_PATH)
+from typed_buffers import np
+
+# Bytes per radix pass when tuning the radix crossover (keys below 2**31)
+RADIX_TUNING_BYTES = 4
+
+
+class Autotuner:
+    """Finds the fastest value of every tunable threshold on this machine"""
+    
+    def __init__(self, analyzer: PerformanceAnalyzer = None, repeats: int = 3,
+                 quick: bool = False, seed: int = 0):
+        """
+        Args:
+            analyzer: Supplies the test data (default: a new PerformanceAnalyzer)
+            repeats: Runs per candidate; the fastest one counts
+            quick: Use smaller inputs (about 4x faster, noisier)
+            seed: Seed for the test data
+        """
+        self.analyzer = analyzer or PerformanceAnalyzer()
+        self.sorter = SortingAlgorithms(metrics_level='none')
+        self.repeats = repeats
+        self.scale = 0.25 if quick else 1.0
+        self.seed = seed
+        self.timings = {}   # threshold -> {candidate: best seconds}
+    
+    def _size(self, size: int) -> int:
+        """Input size scaled for quick mode"""
+        return max(int(size * self.scale), 1)
+    
+    def _time(self, run: Callable[[], object]) -> float:
+        """Best wall time of run() over self.repeats runs"""
+        best = float('inf')
+        for _ in range(self.repeats):
+            gc.collect()
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        return best
+    
+    def _sweep(self, name: str, candidates: List, run: Callable[[], object]):
+        """
+        Time run() with the threshold set to every candidate in turn
+        
+        Args:
+            name: Threshold to vary (lowercase, e.g. 'min_merge')
+            candidates: Values to try
+            run: Workload to time
+        
+        Returns:
+            The fastest candidate
+        """
+        timings = {}
+        for candidate in candidates:
+            previous = self.sorter.thresholds.update({name: candidate})
+            try:
+                timings[candidate] = self._time(run)
+            finally:
+                self.sorter.thresholds.update(previous)
+        self.timings[name] = timings
+        return min(timings, key=timings.get)
+    
+    def tune_insertion_sort_threshold(self) -> int:
+        """Cutoff below which quick sort and merge sort use insertion sort"""
+        data = self.analyzer.generate_test_data(self._size(20000), 'random', self.seed)
+        return self._sweep('insertion_sort_threshold', [8, 12, 16, 24, 32, 48],
+                           lambda: (self.sorter.quick_sort(data), self.sorter.merge_sort(data)))
+    
+    def tune_ninther_threshold(self) -> int:
+        """Partition size from which introsort takes a ninther pivot"""
+        data = self.analyzer.generate_test_data(self._size(20000), 'random', self.seed)
+        return self._sweep('ninther_threshold', [20, 40, 80, 160, 320],
+                           lambda: self.sorter.quick_sort(data))
+    
+    def tune_min_merge(self) -> int:
+        """Minimum run length of natural merge sort"""
+        random_data = self.analyzer.generate_test_data(self._size(20000), 'random', self.seed)
+        nearly_sorted = self.analyzer.generate_test_data(self._size(20000), 'nearly_sorted', self.seed)
+        return self._sweep('min_merge', [16, 32, 64, 128],
+                           lambda: (self.sorter.merge_sort(random_data, mode='natural'),
+                                    self.sorter.merge_sort(nearly_sorted, mode='natural')))
+    
+    def tune_vector_leaf_size(self) -> int:
+        """Block size the NumPy engines hand to NumPy's own sort (None without NumPy)"""
+        if np is None:
+            return None
+        data = np.array(self.analyzer.generate_test_data(self._size(400000), 'random', self.seed))
+        return self._sweep('vector_leaf_size', [256, 1024, 4096, 16384],
+                           lambda: (self.sorter.quick_sort(data), self.sorter.merge_sort(data)))
+    
+    def tune_parallel(self) -> Dict[str, int]:
+        """
+        Grain size of parallel_quick_sort and the size from which
+        parallel_merge_sort beats merge_sort (empty on one CPU)
+        """
+        if (os.cpu_count() or 1) < 2:
+            return {}
+        data = self.analyzer.generate_test_data(self._size(200000), 'random', self.seed)
+        grain_size = self._sweep('parallel_grain_size', [2000, 10000, 50000],
+                                 lambda: self.sorter.parallel_quick_sort(data))
+        
+        # First size where the parallel version wins (and keeps winning)
+        sizes = [self._size(size) for size in (25000, 50000, 100000, 200000, 400000)]
+        timings = {}
+        for size in sizes:
+            data = self.analyzer.generate_test_data(size, 'random', self.seed)
+            timings[size] = (self._time(lambda: self.sorter.merge_sort(data)),
+                             self._time(lambda: self.sorter.parallel_merge_sort(data, threshold=0)))
+        self.timings['parallel_threshold'] = timings
+        threshold = 2 * sizes[-1]
+        for size in reversed(sizes):
+            serial, parallel = timings[size]
+            if parallel >= serial:
+                break
+            threshold = size
+        return {'parallel_grain_size': grain_size, 'parallel_threshold': threshold}
+    
+    def tune_radix_pass_ratio(self) -> float:
+        """Fraction of log2(n) radix passes at which sort() prefers radix sort"""
+        # The generated distributions only go up to 1000, so use wide keys here
+        rng = random.Random(self.seed)
+        sizes = [1 << power for power in range(6, 15)]
+        timings = {}
+        for size in sizes:
+            data = [rng.getrandbits(8 * RADIX_TUNING_BYTES - 1) for _ in range(size)]
+            timings[size] = (self._time(lambda: self.sorter.quick_sort(data)),
+                             self._time(lambda: self.sorter.radix_sort(data)))
+        self.timings['radix_pass_ratio'] = timings
+        
+        # Smallest size from which radix sort keeps winning
+        crossover = 2 * sizes[-1]
+        for size in reversed(sizes):
+            comparison, radix = timings[size]
+            if radix >= comparison:
+                break
+            crossover = size
+        return round(RADIX_TUNING_BYTES / crossover.bit_length(), 3)
+    
+    def tune_external_memory_budget(self) -> int:
+        """Memory budget (and so run length) for external_sort"""
+        size = self._size(400000)
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, 'input.bin')
+            output_path = os.path.join(directory, 'output.bin')
+            self.analyzer.generator.write_to_file(input_path, size, 'random', self.seed)
+            mib = 1024 * 1024
+            return self._sweep('external_memory_budget', [mib, 4 * mib, 16 * mib, 64 * mib],
+                               lambda: self.sorter.external_sort(input_path, output_path,
+                                                                 temp_dir=directory))
+    
+    def run(self, only: List[str] = None) -> Dict[str, object]:
+        """
+        Tune every threshold (or only the named ones)
+        
+        Args:
+            only: Threshold names to tune (default: all)
+        
+        Returns:
+            Threshold name -> fastest value
+        """
+        steps = {
+            'insertion_sort_threshold': self.tune_insertion_sort_threshold,
+            'ninther_threshold': self.tune_ninther_threshold,
+            'min_merge': self.tune_min_merge,
+            'vector_leaf_size': self.tune_vector_leaf_size,
+            'parallel': self.tune_parallel,
+            'radix_pass_ratio': self.tune_radix_pass_ratio,
+            'external_memory_budget': self.tune_external_memory_budget,
+        }
+        thresholds = {}
+        for name, step in steps.items():
+            if only and name not in only:
+                continue
+            print(f"Tuning {name}...")
+            value = step()
+            if isinstance(value, dict):
+                thresholds.update(value)
+            elif value is not None:
+                thresholds[name] = value
+        return thresholds
+
+
+def save_profile(thresholds: Dict[str, object], path: str = None,
+                 timings: Dict[str, dict] = None) -> str:
+    """
+    Store tuned thresholds under this machine's key in a profile file
+    
+    Entries for other hosts and Python versions in the same file are kept.
+    
+    Args:
+        thresholds: Threshold name -> value
+        path: Profile file (default: TUNING_PROFILE_PATH)
+        timings: Sweep timings to keep alongside, for reference
+    
+    Returns:
+        The path written
+    """
+    path = path or TUNING_PROFILE_PATH
+    try:
+        with open(path) as file:
+            profiles = json.load(file)
+    except (OSError, ValueError):
+        profiles = {}
+    profiles[profile_key()] = {
+        'thresholds': thresholds,
+        'tuned_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timings': {name: {str(candidate): seconds for candidate, seconds in values.items()}
+                    for name, values in (timings or {}).items()},
+    }
+    with open(path, 'w') as file:
+        json.dump(profiles, file, indent=2)
+    return path
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line: tune this machine and save the profile"""
+    choices = ['insertion_sort_threshold', 'ninther_threshold', 'min_merge', 'vector_leaf_size',
+               'parallel', 'radix_pass_ratio', 'external_memory_budget']
+    parser = argparse.ArgumentParser(description="Tune the sorting thresholds for this machine")
+    parser.add_argument('--profile', default=TUNING_PROFILE_PATH, help="profile file to update")
+    parser.add_argument('--only', nargs='+', choices=choices, help="tune only these")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--quick', action='store_true', help="smaller inputs, faster but noisier")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dry-run', action='store_true', help="print the results without saving")
+    args = parser.parse_args(argv)
+    
+    current = load_tuning_profile(args.profile)
+    tuner = Autotuner(repeats=args.repeats, quick=args.quick, seed=args.seed)
+    thresholds = tuner.run(args.only)
+    
+    print(f"\nTuned thresholds for {profile_key()}:")
+    for name, value in thresholds.items():
+        print(f"  {name}: {value} (current {getattr(current, name)})")
+    if not args.dry_run:
+        print(f"Saved to {save_profile(thresholds, args.profile, tuner.timings)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""
+Benchmark Module
+Statistically careful timing of the sorting engines, with saved results
+and regression checks against a stored baseline
+"""
+
+import argparse
+import csv
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+from performance_analyzer import PerformanceAnalyzer
+from sorting_algorithms import SortingAlgorithms
+
+# Engines the benchmark knows about: name -> function(sorter, data)
+ENGINES = {
+    'quick_sort': lambda sorter, data: sorter.quick_sort(data),
+    'merge_sort': lambda sorter, data: sorter.merge_sort(data),
+    'natural_merge_sort': lambda sorter, data: sorter.merge_sort(data, mode='natural'),
+}
+
+# Columns written to CSV files (the samples only go to JSON)
+CSV_COLUMNS = ['engine', 'distribution', 'size', 'seed', 'repeats', 'median', 'iqr',
+               'min', 'mean', 'stdev', 'relative_ci', 'throughput']
+
+
+def machine_metadata() -> Dict[str, object]:
+    """Describe the machine and Python build the results were measured on"""
+    return {
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    Summary statistics of a list of timings
+    
+    Args:
+        samples: Timings in seconds
+        
+    Returns:
+        median, iqr, min, mean, stdev and relative_ci (half width of the
+        95% confidence interval of the mean, divided by the mean)
+    """
+    ordered = sorted(samples)
+    mean = statistics.fmean(ordered)
+    stdev = statistics.stdev(ordered) if len(ordered) > 1 else 0.0
+    if len(ordered) >= 4:
+        quartiles = statistics.quantiles(ordered, n=4)
+        iqr = quartiles[2] - quartiles[0]
+    else:
+        iqr = ordered[-1] - ordered[0]
+    half_width = 1.96 * stdev / math.sqrt(len(ordered))
+    return {
+        'median': statistics.median(ordered),
+        'iqr': iqr,
+        'min': ordered[0],
+        'mean': mean,
+        'stdev': stdev,
+        'relative_ci': half_width / mean if mean else 0.0,
+    }
+
+
+def mann_whitney_p_value(first: List[float], second: List[float]) -> float:
+    """
+    Two-sided p-value of the Mann-Whitney U test (normal approximation)
+    
+    Tells how likely it is to see samples this different if both came
+    from the same distribution. Doesn't assume the timings are normal.
+    
+    Args:
+        first: First group of samples
+        second: Second group of samples
+        
+    Returns:
+        p-value between 0 and 1
+    """
+    n1, n2 = len(first), len(second)
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    
+    # Rank all samples together, giving ties their average rank
+    combined = sorted([(value, 0) for value in first] + [(value, 1) for value in second])
+    ranks = [0.0] * len(combined)
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        i = j + 1
+    
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean_u = n1 * n2 / 2
+    sd_u = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    if sd_u == 0:
+        return 1.0
+    z = abs(u - mean_u) / sd_u
+    return math.erfc(z / math.sqrt(2))
+
+
+class BenchmarkSuite:
+    """Runs the sorting engines until their timings are statistically stable"""
+    
+    def __init__(self, engines: Dict[str, Callable] = None, warmup: int = 2,
+                 min_repeats: int = 5, max_repeats: int = 50,
+                 target_ci: float = 0.02, max_seconds: float = 30.0,
+                 cache_dir: str = None):
+        """
+        Args:
+            engines: name -> function(sorter, data) to benchmark (default: ENGINES)
+            warmup: Untimed runs before measuring
+            min_repeats: Timed runs always made
+            max_repeats: Timed runs never exceeded
+            target_ci: Stop once the 95% confidence interval of the mean is
+                       within this fraction of the mean
+            max_seconds: Stop adding runs for one case after this long
+            cache_dir: Reuse generated inputs from this dataset cache
+        """
+        self.engines = engines if engines is not None else dict(ENGINES)
+        self.warmup = warmup
+        self.min_repeats = max(min_repeats, 2)
+        self.max_repeats = max(max_repeats, self.min_repeats)
+        self.target_ci = target_ci
+        self.max_seconds = max_seconds
+        # Uninstrumented sorter: we time the sort, not the bookkeeping
+        self.sorter = SortingAlgorithms(metrics_level='none')
+        self.analyzer = PerformanceAnalyzer(cache_dir)
+        self.results = []
+        self.metadata = machine_metadata()
+    
+    def run(self, sizes: List[int], distributions: List[str], seed: int = 0) -> List[Dict]:
+        """
+        Benchmark every engine on every size and distribution
+        
+        Args:
+            sizes: Array sizes to test
+            distributions: Data types to test
+            seed: Base seed; each (distribution, size) case gets its own
+                  seed derived from it, so reruns use identical data
+            
+        Returns:
+            One result dictionary per (engine, distribution, size)
+        """
+        for distribution in distributions:
+            for size in sizes:
+                case_seed = seed * 1_000_003 + size
+                data = self.analyzer.generate_test_data(size, distribution, case_seed)
+                for engine in self.engines:
+                    result = self._measure(engine, data)
+                    result.update({'engine': engine, 'distribution': distribution,
+                                   'size': size, 'seed': case_seed})
+                    self.results.append(result)
+                    print(f"{engine:<20} {distribution:<15} n={size:<9} "
+                          f"median {result['median']:.6f}s  IQR {result['iqr']:.6f}s  "
+                          f"{result['throughput']:,.0f} elements/s ({result['repeats']} runs)")
+        return self.results
+    
+    def _measure(self, engine: str, data: List[int]) -> Dict:
+        """
+        Time one engine on one input until the timings settle
+        
+        Args:
+            engine: Name of the engine to run
+            data: Input to sort (not modified)
+            
+        Returns:
+            Summary statistics, throughput and the raw samples
+        """
+        sort = self.engines[engine]
+        for _ in range(self.warmup):
+            sort(self.sorter, data)
+        
+        samples = []
+        started = time.perf_counter()
+        gc_was_enabled = gc.isenabled()
+        try:
+            while len(samples) < self.max_repeats:
+                # Collect now so a collection doesn't land inside the timing
+                gc.collect()
+                gc.disable()
+                sort(self.sorter, data)
+                gc.enable()
+                samples.append(self.sorter.get_metrics().execution_time)
+                
+                if len(samples) >= self.min_repeats:
+                    if summarize(samples)['relative_ci'] <= self.target_ci:
+                        break
+                    if time.perf_counter() - started > self.max_seconds:
+                        break
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+            else:
+                gc.disable()
+        
+        result = summarize(samples)
+        result['repeats'] = len(samples)
+        result['throughput'] = len(data) / result['median'] if result['median'] else 0.0
+        result['samples'] = samples
+        return result
+    
+    def save_json(self, path: str):
+        """Write the metadata and all results (with raw samples) to a JSON file"""
+        with open(path, 'w') as file:
+            json.dump({'metadata': self.metadata, 'results': self.results}, file, indent=2)
+    
+    def save_csv(self, path: str):
+        """Write the summary statistics to a CSV file, with metadata as comments"""
+        with open(path, 'w', newline='') as file:
+            for key, value in self.metadata.items():
+                file.write(f"# {key}: {value}\n")
+            writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(self.results)
+
+
+def load_results(path: str) -> Dict:
+    """Read a JSON file written by BenchmarkSuite.save_json"""
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float = 0.05,
+                    alpha: float = 0.01) -> List[Dict]:
+    """
+    Find cases that got significantly slower than the baseline
+    
+    A case is a regression when its median time grew by more than
+    threshold and the Mann-Whitney test says the difference is real
+    (p-value below alpha).
+    
+    Args:
+        baseline: Results loaded with load_results
+        current: Results loaded with load_results
+        threshold: Smallest slowdown worth reporting (0.05 = 5%)
+        alpha: Significance level
+        
+    Returns:
+        One dictionary per compared case, with a 'regression' flag
+    """
+    def key(result):
+        return result['engine'], result['distribution'], result['size']
+    
+    baseline_by_case = {key(result): result for result in baseline['results']}
+    comparisons = []
+    for result in current['results']:
+        old = baseline_by_case.get(key(result))
+        if old is None:
+            continue
+        change = result['median'] / old['median'] - 1 if old['median'] else 0.0
+        p_value = mann_whitney_p_value(old['samples'], result['samples'])
+        comparisons.append({
+            'engine': result['engine'],
+            'distribution': result['distribution'],
+            'size': result['size'],
+            'baseline_median': old['median'],
+            'current_median': result['median'],
+            'change': change,
+            'p_value': p_value,
+            'regression': change > threshold and p_value < alpha,
+        })
+    return comparisons
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line: 'run' a benchmark or 'compare' two result files"""
+    parser = argparse.ArgumentParser(description="Benchmark the sorting engines")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = commands.add_parser('run', help="run the benchmark and save the results")
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    run_parser.add_argument('--distributions', nargs='+', default=['random', 'sorted', 'reverse_sorted'])
+    run_parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES), default=sorted(ENGINES))
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--warmup', type=int, default=2)
+    run_parser.add_argument('--min-repeats', type=int, default=5)
+    run_parser.add_argument('--max-repeats', type=int, default=50)
+    run_parser.add_argument('--target-ci', type=float, default=0.02)
+    run_parser.add_argument('--output', default='benchmark_results.json')
+    run_parser.add_argument('--csv', help="also write a CSV summary here")
+    run_parser.add_argument('--cache-dir', help="keep generated inputs here and reuse them")
+    
+    compare_parser = commands.add_parser('compare', help="flag regressions against a baseline")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.05)
+    compare_parser.add_argument('--alpha', type=float, default=0.01)
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == 'run':
+        suite = BenchmarkSuite({name: ENGINES[name] for name in args.engines},
+                               warmup=args.warmup, min_repeats=args.min_repeats,
+                               max_repeats=args.max_repeats, target_ci=args.target_ci,
+                               cache_dir=args.cache_dir)
+        suite.run(args.sizes, args.distributions, args.seed)
+        suite.save_json(args.output)
+        if args.csv:
+            suite.save_csv(args.csv)
+        return 0
+    
+    comparisons = compare_results(load_results(args.baseline), load_results(args.current),
+                                  args.threshold, args.alpha)
+    regressions = 0
+    for comparison in comparisons:
+        flag = "REGRESSION" if comparison['regression'] else "ok"
+        regressions += comparison['regression']
+        print(f"{comparison['engine']:<20} {comparison['distribution']:<15} "
+              f"n={comparison['size']:<9} {comparison['change']:+.1%} "
+              f"(p={comparison['p_value']:.4f}) {flag}")
+    print(f"{regressions} regression(s) in {len(comparisons)} case(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""
+Command Line Module
+Headless entry point (python -m cli ...): benchmark the engines, sort
+numbers from a file or stdin, plot saved results to an image file, and
+measure how fast the program starts
+
+Heavy optional packages (NumPy, psutil, matplotlib) are only imported by
+the commands that need them, so 'sort' starts quickly.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from typing import Iterable, List
+
+# Engines the sort command can use: name -> function(sorter, values)
+SORT_ENGINES = {
+    'auto': lambda sorter, values: sorter.sort(values, inplace=True),
+    'quick': lambda sorter, values: sorter.quick_sort(values, inplace=True),
+    'merge': lambda sorter, values: sorter.merge_sort(values, inplace=True),
+    'natural': lambda sorter, values: sorter.merge_sort(values, mode='natural', inplace=True),
+    'radix': lambda sorter, values: sorter.radix_sort(values, inplace=True),
+    'counting': lambda sorter, values: sorter.counting_sort(values, inplace=True),
+    'string': lambda sorter, values: sorter.string_sort(values, inplace=True),
+}
+
+# Modules whose import dominates start-up time
+HEAVY_MODULES = ('numpy', 'psutil', 'matplotlib', 'multiprocessing')
+
+# Where the startup command appends its measurements
+STARTUP_HISTORY = 'startup_history.jsonl'
+
+# Values written to stdout per write call
+OUTPUT_BATCH = 65536
+
+
+def parse_number(token: str):
+    """Read a token as an int if possible, otherwise as a finite float"""
+    try:
+        return int(token)
+    except ValueError:
+        value = float(token)
+    if not math.isfinite(value):
+        # nan doesn't compare with anything, so the output would be unordered
+        raise ValueError(f"not a finite number: {token!r}")
+    return value
+
+
+def parse_integer(token: str) -> int:
+    """Read a token as an int (external sort only handles integers)"""
+    try:
+        return int(token)
+    except ValueError:
+        raise ValueError(f"--external sorts integers only, not {token!r}") from None
+
+
+def read_values(lines: Iterable[str], strings: bool) -> list:
+    """
+    Read whitespace-separated numbers (or one string per line)
+    
+    Args:
+        lines: Lines of input
+        strings: Keep every line as a string instead of parsing numbers
+    
+    Returns:
+        The values in input order
+    """
+    if strings:
+        return [line.rstrip('\n') for line in lines]
+    return [parse_number(token) for line in lines for token in line.split()]
+
+
+def write_values(values: Iterable, stream):
+    """Write one value per line, in batches"""
+    batch = []
+    for value in values:
+        batch.append(str(value))
+        if len(batch) >= OUTPUT_BATCH:
+            stream.write('\n'.join(batch) + '\n')
+            batch = []
+    if batch:
+        stream.write('\n'.join(batch) + '\n')
+
+
+def open_input(path: str):
+    """Open a file for reading, or stdin for '-' (which the with block leaves open)"""
+    return nullcontext(sys.stdin) if path == '-' else open(path)
+
+
+def command_sort(args) -> int:
+    """Sort numbers (or lines) from a file or stdin and write them to stdout"""
+    from sorting_algorithms import SortingAlgorithms
+    
+    # 'counters' doesn't read process memory, so psutil is never imported
+    sorter = SortingAlgorithms(metrics_level='counters')
+    
+    if args.external:
+        # Spool the input to a file and sort it with bounded memory
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, 'input.txt')
+            output_path = os.path.join(directory, 'output.txt')
+            with open_input(args.input) as source, open(input_path, 'w') as spool:
+                try:
+                    for line in source:
+                        for token in line.split():
+                            spool.write(f"{parse_integer(token)}\n")
+                except ValueError as error:
+                    print(f"sort: {error}", file=sys.stderr)
+                    return 1
+            try:
+                sorter.external_sort(input_path, output_path, file_format='text',
+                                     memory_budget=args.memory_budget, temp_dir=directory)
+            except ValueError as error:
+                print(f"sort: {error}", file=sys.stderr)
+                return 1
+            with open(output_path) as result:
+                for line in result:
+                    sys.stdout.write(line)
+    else:
+        with open_input(args.input) as source:
+            try:
+                values = read_values(source, args.strings)
+            except ValueError as error:
+                print(f"sort: {error}", file=sys.stderr)
+                return 1
+        engine = 'string' if args.strings and args.engine == 'auto' else args.engine
+        try:
+            SORT_ENGINES[engine](sorter, values)
+        except (TypeError, ValueError) as error:
+            # e.g. radix or counting sort on floats, or string sort on numbers
+            print(f"sort: the {engine} engine can't sort this input: {error}", file=sys.stderr)
+            return 1
+        if args.reverse:
+            # Equal values are indistinguishable, so reversing is enough
+            values.reverse()
+        write_values(values, sys.stdout)
+    
+    if args.metrics:
+        print(sorter.get_metrics(), file=sys.stderr)
+    return 0
+
+
+def command_bench(args) -> int:
+    """Run the quick sort / merge sort comparison, appending samples to a results log"""
+    from performance_analyzer import PerformanceAnalyzer
+    
+    analyzer = PerformanceAnalyzer(cache_dir=args.cache_dir, results_path=args.output)
+    if args.output and len(analyzer.results):
+        print(f"Resuming: {len(analyzer.results)} samples already in {args.output}")
+    with analyzer.results:
+        analyzer.run_performance_test(args.sizes, args.data_types, args.iterations)
+    analyzer.print_performance_summary(args.sizes)
+    
+    if args.output:
+        print(f"Results saved to {args.output}")
+    if args.plot:
+        analyzer.visualize_results(args.sizes, output=args.plot)
+    return 0
+
+
+def command_plot(args) -> int:
+    """Summarize and chart a results log written by 'bench --output' (no re-running)"""
+    from performance_analyzer import PerformanceAnalyzer, MATPLOTLIB_AVAILABLE
+    
+    if not os.path.exists(args.results):
+        print(f"No results log at {args.results}", file=sys.stderr)
+        return 1
+    analyzer = PerformanceAnalyzer(results_path=args.results)
+    analyzer.print_performance_summary(args.sizes)
+    if not MATPLOTLIB_AVAILABLE:
+        print("matplotlib is not installed", file=sys.stderr)
+        return 1
+    analyzer.visualize_results(args.sizes, output=args.output)
+    return 0
+
+
+def measure_startup(repeats: int) -> dict:
+    """
+    Time fresh interpreter runs of 'sort' on a tiny input
+    
+    Args:
+        repeats: Number of runs
+    
+    Returns:
+        Run times in seconds, and which heavy modules the command imported
+    """
+    command = [sys.executable, os.path.abspath(__file__), 'sort']
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, input='3 1 2\n', capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - start)
+    
+    # One more run with -X importtime to see what got imported
+    traced = subprocess.run([sys.executable, '-X', 'importtime'] + command[1:], input='3 1 2\n',
+                            capture_output=True, text=True, check=True)
+    imported = {line.rsplit('|', 1)[-1].strip() for line in traced.stderr.splitlines()
+                if line.startswith('import time:')}
+    return {'times': times, 'heavy_imports': [name for name in HEAVY_MODULES if name in imported]}
+
+
+def command_startup(args) -> int:
+    """Measure cold-start time of the sort command and append it to a history file"""
+    measured = measure_startup(args.repeats)
+    entry = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'host': platform.node(),
+        'python': platform.python_version(),
+        'median': statistics.median(measured['times']),
+        'min': min(measured['times']),
+        'repeats': args.repeats,
+        'heavy_imports': measured['heavy_imports'],
+    }
+    
+    previous = None
+    if os.path.exists(args.history):
+        with open(args.history) as file:
+            lines = [line for line in file if line.strip()]
+        if lines:
+            previous = json.loads(lines[-1])
+    with open(args.history, 'a') as file:
+        file.write(json.dumps(entry) + '\n')
+    
+    print(f"Cold start: median {entry['median'] * 1000:.1f} ms, min {entry['min'] * 1000:.1f} ms "
+          f"over {args.repeats} runs")
+    print(f"Heavy modules imported: {', '.join(entry['heavy_imports']) or 'none'}")
+    if previous:
+        change = entry['median'] / previous['median'] - 1
+        print(f"Previous run ({previous['timestamp']}): median {previous['median'] * 1000:.1f} ms "
+              f"({change:+.1%})")
+    if args.max_seconds is not None and entry['median'] > args.max_seconds:
+        print(f"Cold start is over the {args.max_seconds * 1000:.0f} ms budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: List[str] = None) -> int:
+    """Command line: bench, sort, plot or startup"""
+    parser = argparse.ArgumentParser(description="Sorting algorithm toolkit")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    sort_parser = commands.add_parser('sort', help="sort numbers from a file or stdin to stdout")
+    sort_parser.add_argument('input', nargs='?', default='-', help="input file ('-' for stdin)")
+    sort_parser.add_argument('--engine', choices=sorted(SORT_ENGINES), default='auto')
+    sort_parser.add_argument('--reverse', action='store_true', help="largest first")
+    sort_parser.add_argument('--strings', action='store_true', help="sort lines as text")
+    sort_parser.add_argument('--external', action='store_true',
+                             help="sort integers through temporary files with bounded memory")
+    sort_parser.add_argument('--memory-budget', type=int, default=None,
+                             help="bytes of memory for --external")
+    sort_parser.add_argument('--metrics', action='store_true', help="print metrics to stderr")
+    
+    bench_parser = commands.add_parser('bench', help="compare quick sort and merge sort")
+    bench_parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000, 2000, 5000])
+    bench_parser.add_argument('--data-types', nargs='+', default=['random'])
+    bench_parser.add_argument('--iterations', type=int, default=3)
+    bench_parser.add_argument('--output', help="append the samples to this JSON-lines log; "
+                                               "samples already in it are not measured again")
+    bench_parser.add_argument('--plot', help="save the charts to this PNG/SVG file")
+    bench_parser.add_argument('--cache-dir', help="keep generated inputs here and reuse them")
+    
+    plot_parser = commands.add_parser('plot', help="chart results saved by bench --output")
+    plot_parser.add_argument('results', help="JSON-lines log written by bench --output")
+    plot_parser.add_argument('--sizes', type=int, nargs='+', help="only these sizes")
+    plot_parser.add_argument('--output', default='performance_results.png',
+                             help="image file to write (PNG, SVG or PDF)")
+    
+    startup_parser = commands.add_parser('startup', help="measure and track cold-start time")
+    startup_parser.add_argument('--repeats', type=int, default=5)
+    startup_parser.add_argument('--history', default=STARTUP_HISTORY)
+    startup_parser.add_argument('--max-seconds', type=float, help="exit 1 if the median is slower")
+    
+    args = parser.parse_args(argv)
+    if args.command == 'sort' and args.external and (args.reverse or args.strings):
+        parser.error("--external sorts integers in ascending order only")
+    handlers = {'sort': command_sort, 'bench': command_bench, 'plot': command_plot,
+                'startup': command_startup}
+    return handlers[args.command](args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
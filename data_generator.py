@@ -0,0 +1,242 @@
+"""
+Data Generator Module
+Fast, seeded test data in many shapes, in one piece or streamed in chunks
+"""
+
+import random
+from array import array
+from collections import deque
+from itertools import accumulate
+from typing import Iterator, List
+from typed_buffers import np, NUMPY_AVAILABLE
+
+DISTRIBUTIONS = ('random', 'sorted', 'reverse_sorted', 'nearly_sorted', 'few_unique',
+                 'organ_pipe', 'sawtooth', 'zipf', 'all_equal')
+
+# Data is made in blocks of this many values, each with its own seed, so the
+# same seed gives the same data whatever chunk size it is read with
+GENERATION_BLOCK = 1 << 16
+
+# Values of 'random', 'few_unique' and 'zipf' data are between 1 and this
+MAX_VALUE = 1000
+
+
+class DataGenerator:
+    """Makes test arrays, using NumPy when it's installed"""
+    
+    def __init__(self, perturbation: float = 0.05, unique_values: int = 10,
+                 period: int = 1000, zipf_exponent: float = 1.2,
+                 use_numpy: bool = NUMPY_AVAILABLE):
+        """
+        Args:
+            perturbation: Fraction of 'nearly_sorted' values moved out of place
+            unique_values: Number of distinct values in 'few_unique' data
+            period: Length of one 'sawtooth' tooth
+            zipf_exponent: Skew of 'zipf' data (bigger means more skewed)
+            use_numpy: Generate with NumPy (results differ from pure Python
+                       for the same seed, but each is reproducible)
+        """
+        if use_numpy and not NUMPY_AVAILABLE:
+            raise ValueError("NumPy is not installed")
+        self.perturbation = perturbation
+        self.unique_values = unique_values
+        self.period = period
+        self.zipf_exponent = zipf_exponent
+        self.use_numpy = use_numpy
+        # Probability of value k in 'zipf' data is proportional to 1 / k^s
+        weights = [1 / k ** zipf_exponent for k in range(1, MAX_VALUE + 1)]
+        self._zipf_cumulative = list(accumulate(weights))
+    
+    def generate(self, size: int, distribution: str, seed: int = None) -> List[int]:
+        """
+        Generate a list of test data
+        
+        Args:
+            size: Number of values
+            distribution: One of DISTRIBUTIONS
+            seed: Seed for reproducible data (default: different every time)
+            
+        Returns:
+            List of integers
+        """
+        values = []
+        for chunk in self.iter_chunks(size, distribution, GENERATION_BLOCK, seed):
+            values.extend(chunk.tolist() if self.use_numpy else chunk)
+        return values
+    
+    def generate_array(self, size: int, distribution: str, seed: int = None):
+        """
+        Generate test data as an int64 NumPy array (or array('q') without NumPy)
+        
+        Args:
+            size: Number of values
+            distribution: One of DISTRIBUTIONS
+            seed: Seed for reproducible data (default: different every time)
+        """
+        chunks = list(self.iter_chunks(size, distribution, GENERATION_BLOCK, seed))
+        if self.use_numpy:
+            return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+        values = array('q')
+        for chunk in chunks:
+            values.extend(chunk)
+        return values
+    
+    def iter_chunks(self, size: int, distribution: str, chunk_size: int,
+                    seed: int = None) -> Iterator:
+        """
+        Generate test data piece by piece, for inputs bigger than memory
+        
+        Args:
+            size: Total number of values
+            distribution: One of DISTRIBUTIONS
+            chunk_size: Values per chunk (the last chunk may be shorter)
+            seed: Seed for reproducible data (default: different every time)
+            
+        Yields:
+            int64 NumPy arrays, or lists without NumPy
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Invalid data type. Use one of: {', '.join(DISTRIBUTIONS)}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        
+        # Generated blocks not handed out yet; the first one from offset on
+        pending = deque()
+        offset = 0
+        pending_count = 0
+        for start in range(0, size, GENERATION_BLOCK):
+            count = min(GENERATION_BLOCK, size - start)
+            pending.append(self._block(distribution, size, start, count, seed))
+            pending_count += count
+            
+            # Cut whole chunks off what has been generated so far, copying
+            # every value only once
+            while pending_count >= chunk_size:
+                parts = []
+                needed = chunk_size
+                while needed:
+                    block = pending[0]
+                    taken = min(needed, len(block) - offset)
+                    parts.append(block[offset:offset + taken])
+                    offset += taken
+                    needed -= taken
+                    if offset == len(block):
+                        pending.popleft()
+                        offset = 0
+                yield self._join(parts)
+                pending_count -= chunk_size
+        
+        if pending_count:
+            pending[0] = pending[0][offset:]
+            yield self._join(list(pending))
+    
+    def write_to_file(self, path: str, size: int, distribution: str, seed: int = None,
+                      file_format: str = 'binary', chunk_size: int = 1 << 20):
+        """
+        Stream generated data to a file in the format external_sort reads
+        
+        Args:
+            path: File to create
+            size: Number of values
+            distribution: One of DISTRIBUTIONS
+            seed: Seed for reproducible data
+            file_format: 'binary' (native int64) or 'text' (one integer per line)
+            chunk_size: Values held in memory at a time
+        """
+        if file_format not in ('binary', 'text'):
+            raise ValueError("Invalid file format. Use 'binary' or 'text'")
+        
+        with open(path, 'wb') as file:
+            for chunk in self.iter_chunks(size, distribution, chunk_size, seed):
+                if file_format == 'binary':
+                    if self.use_numpy:
+                        file.write(chunk.astype(np.int64, copy=False).tobytes())
+                    else:
+                        file.write(array('q', chunk).tobytes())
+                else:
+                    file.write(''.join(f"{value}\n" for value in chunk).encode())
+    
+    def _join(self, pieces: list):
+        """Concatenate generated pieces (NumPy arrays or lists)"""
+        if self.use_numpy:
+            return pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+        return [value for piece in pieces for value in piece]
+    
+    def _block(self, distribution: str, size: int, start: int, count: int, seed: int):
+        """
+        Generate values start .. start + count - 1 of a distribution
+        
+        Args:
+            distribution: One of DISTRIBUTIONS
+            size: Total size of the data (the shape of some distributions depends on it)
+            start: Position of the first value
+            count: Number of values
+            seed: Seed of the whole data set
+            
+        Returns:
+            int64 NumPy array, or a list without NumPy
+        """
+        block_number = start // GENERATION_BLOCK
+        if self.use_numpy:
+            return self._numpy_block(distribution, size, start, count,
+                                     np.random.default_rng([seed, block_number]))
+        return self._python_block(distribution, size, start, count,
+                                  random.Random(f"{seed}:{block_number}"))
+    
+    def _numpy_block(self, distribution, size, start, count, rng):
+        """Vectorized NumPy version of _block"""
+        positions = np.arange(start, start + count, dtype=np.int64)
+        if distribution == 'random':
+            return rng.integers(1, MAX_VALUE + 1, count, dtype=np.int64)
+        if distribution == 'sorted':
+            return positions + 1
+        if distribution == 'reverse_sorted':
+            return size - positions
+        if distribution == 'nearly_sorted':
+            values = positions + 1
+            moved = rng.choice(count, int(count * self.perturbation), replace=False)
+            values[moved] = values[rng.permutation(moved)]
+            return values
+        if distribution == 'few_unique':
+            choices = np.linspace(1, MAX_VALUE, self.unique_values, dtype=np.int64)
+            return choices[rng.integers(0, self.unique_values, count)]
+        if distribution == 'organ_pipe':
+            return np.minimum(positions, size - 1 - positions) + 1
+        if distribution == 'sawtooth':
+            return positions % self.period + 1
+        if distribution == 'zipf':
+            cumulative = np.asarray(self._zipf_cumulative)
+            draws = rng.random(count) * cumulative[-1]
+            return np.searchsorted(cumulative, draws, side='right').astype(np.int64) + 1
+        return np.ones(count, dtype=np.int64)
+    
+    def _python_block(self, distribution, size, start, count, rng):
+        """Pure Python version of _block (bulk calls, no per-value randint)"""
+        if distribution == 'random':
+            return rng.choices(range(1, MAX_VALUE + 1), k=count)
+        if distribution == 'sorted':
+            return list(range(start + 1, start + count + 1))
+        if distribution == 'reverse_sorted':
+            return list(range(size - start, size - start - count, -1))
+        if distribution == 'nearly_sorted':
+            values = list(range(start + 1, start + count + 1))
+            moved = rng.sample(range(count), int(count * self.perturbation))
+            shuffled = [values[i] for i in moved]
+            rng.shuffle(shuffled)
+            for i, value in zip(moved, shuffled):
+                values[i] = value
+            return values
+        if distribution == 'few_unique':
+            step = (MAX_VALUE - 1) / max(self.unique_values - 1, 1)
+            choices = [1 + round(i * step) for i in range(self.unique_values)]
+            return rng.choices(choices, k=count)
+        if distribution == 'organ_pipe':
+            return [min(i, size - 1 - i) + 1 for i in range(start, start + count)]
+        if distribution == 'sawtooth':
+            return [i % self.period + 1 for i in range(start, start + count)]
+        if distribution == 'zipf':
+            return rng.choices(range(1, MAX_VALUE + 1), cum_weights=self._zipf_cumulative, k=count)
+        return [1] * count
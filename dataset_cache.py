@@ -0,0 +1,154 @@
+"""
+Dataset Cache Module
+Keeps generated benchmark inputs (and their sorted versions) on disk as raw
+int64 files that are memory-mapped back in instead of being regenerated
+"""
+
+import mmap
+import os
+from typing import List
+from data_generator import DataGenerator
+from typed_buffers import np, NUMPY_AVAILABLE
+
+# Default upper limit on the total size of the cache directory
+DEFAULT_CACHE_BYTES = 2 * 1024 ** 3
+
+
+class DatasetCache:
+    """Size-bounded, least-recently-used cache of generated datasets"""
+    
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_BYTES,
+                 generator: DataGenerator = None):
+        """
+        Args:
+            directory: Where the dataset files are kept (created if needed)
+            max_bytes: Oldest datasets are deleted once the cache is bigger
+            generator: Generator for missing datasets (default: DataGenerator())
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.generator = generator if generator is not None else DataGenerator()
+        os.makedirs(directory, exist_ok=True)
+    
+    def path_for(self, distribution: str, size: int, seed: int, sorted_copy: bool = False) -> str:
+        """File holding a dataset (or its sorted reference copy)"""
+        suffix = '.sorted.bin' if sorted_copy else '.bin'
+        return os.path.join(self.directory, f"{distribution}_{size}_{seed}{suffix}")
+    
+    def get(self, distribution: str, size: int, seed: int):
+        """
+        Memory-map a dataset, generating and storing it first if needed
+        
+        Args:
+            distribution: One of data_generator.DISTRIBUTIONS
+            size: Number of values
+            seed: Seed the data was (or will be) generated with
+            
+        Returns:
+            Read-only int64 NumPy memmap (or memoryview without NumPy)
+        """
+        self._ensure(distribution, size, seed)
+        return self._map(self.path_for(distribution, size, seed))
+    
+    def get_sorted(self, distribution: str, size: int, seed: int):
+        """Memory-map the sorted reference copy of a dataset (see get)"""
+        self._ensure(distribution, size, seed)
+        return self._map(self.path_for(distribution, size, seed, sorted_copy=True))
+    
+    def load(self, distribution: str, size: int, seed: int) -> List[int]:
+        """Read a cached dataset into a new list (for the list-based sorts)"""
+        return self.get(distribution, size, seed).tolist()
+    
+    def matches_reference(self, result, distribution: str, size: int, seed: int) -> bool:
+        """
+        Check a sort result against the stored sorted copy
+        
+        Args:
+            result: Output of a sort of the dataset
+            distribution: Distribution of the dataset
+            size: Size of the dataset
+            seed: Seed of the dataset
+            
+        Returns:
+            True if result holds exactly the reference values in order
+        """
+        reference = self.get_sorted(distribution, size, seed)
+        if len(result) != len(reference):
+            return False
+        if NUMPY_AVAILABLE:
+            return bool(np.array_equal(np.asarray(result), reference))
+        return list(result) == reference.tolist()
+    
+    def _ensure(self, distribution: str, size: int, seed: int):
+        """Create a dataset and its sorted copy if they aren't cached yet"""
+        if seed is None:
+            raise ValueError("Cached datasets need an explicit seed")
+        
+        path = self.path_for(distribution, size, seed)
+        sorted_path = self.path_for(distribution, size, seed, sorted_copy=True)
+        if os.path.exists(path) and os.path.exists(sorted_path):
+            # Mark them as recently used
+            os.utime(path)
+            os.utime(sorted_path)
+            return
+        
+        # The dataset and its sorted copy hold 8 bytes per value each
+        if 16 * size > self.max_bytes:
+            raise ValueError(f"{distribution} dataset of {size} values needs {16 * size} bytes, "
+                             f"more than the cache's max_bytes={self.max_bytes}")
+        
+        # Write to temporary names first so a crash never leaves half a file
+        self.generator.write_to_file(path + '.tmp', size, distribution, seed)
+        values = self._map(path + '.tmp')
+        with open(sorted_path + '.tmp', 'wb') as file:
+            if NUMPY_AVAILABLE:
+                file.write(np.sort(values).tobytes())
+            else:
+                from array import array
+                file.write(array('q', sorted(values)).tobytes())
+        del values
+        os.replace(path + '.tmp', path)
+        os.replace(sorted_path + '.tmp', sorted_path)
+        
+        self._evict(keep=os.path.basename(path)[:-len('.bin')])
+    
+    def _map(self, path: str):
+        """Memory-map a raw int64 file read-only"""
+        if os.path.getsize(path) == 0:
+            # Empty files can't be mapped
+            return np.empty(0, dtype=np.int64) if NUMPY_AVAILABLE else memoryview(b'').cast('q')
+        if NUMPY_AVAILABLE:
+            return np.memmap(path, dtype=np.int64, mode='r')
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(mapped).cast('q')
+    
+    def _evict(self, keep: str = None):
+        """
+        Delete least recently used datasets until the cache fits in max_bytes
+        
+        Args:
+            keep: Name (without suffix) of a dataset that must stay, such as
+                  the one just created for the caller
+        """
+        datasets = {}
+        for name in os.listdir(self.directory):
+            if not name.endswith('.bin'):
+                continue
+            path = os.path.join(self.directory, name)
+            key = name[:-len('.sorted.bin')] if name.endswith('.sorted.bin') else name[:-len('.bin')]
+            size, last_used = datasets.get(key, (0, 0))
+            stat = os.stat(path)
+            datasets[key] = (size + stat.st_size, max(last_used, stat.st_mtime))
+        
+        total = sum(size for size, _ in datasets.values())
+        for key, (size, _) in sorted(datasets.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            for suffix in ('.bin', '.sorted.bin'):
+                path = os.path.join(self.directory, key + suffix)
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
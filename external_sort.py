@@ -0,0 +1,139 @@
+"""
+External Sort Module
+Reads and writes the files used by the external (out-of-core) merge sort
+"""
+
+from array import array
+from typing import Iterable, Iterator, List
+from performance_metrics import PerformanceMetrics
+
+# Size of one int64 key in a binary file
+INT64_BYTES = 8
+
+# Rough memory a Python list needs per int while merge_sort works on it
+# (list slot + int object + slot in the merge buffer)
+BYTES_PER_LIST_ELEMENT = 64
+
+# Smallest I/O buffer: one int64 value (callers size buffers from the budget)
+MIN_BUFFER_BYTES = INT64_BYTES
+
+
+def read_chunks(path: str, file_format: str, chunk_size: int,
+                metrics: PerformanceMetrics) -> Iterator[List[int]]:
+    """
+    Read a file of integers in chunks of at most chunk_size values
+    
+    Args:
+        path: Input file
+        file_format: 'binary' (native int64) or 'text' (one integer per line)
+        chunk_size: Maximum number of values per chunk
+        metrics: Metrics object whose io_bytes_read is updated
+        
+    Yields:
+        Lists of integers
+    """
+    if file_format == 'binary':
+        with open(path, 'rb') as file:
+            while True:
+                data = file.read(chunk_size * INT64_BYTES)
+                if not data:
+                    return
+                if len(data) % INT64_BYTES:
+                    raise ValueError(f"{path} is not a whole number of int64 values")
+                metrics.io_bytes_read += len(data)
+                yield array('q', data).tolist()
+    
+    with open(path, 'r') as file:
+        chunk = []
+        for line in file:
+            metrics.io_bytes_read += len(line)
+            line = line.strip()
+            if line:
+                chunk.append(int(line))
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+
+def iter_values(path: str, file_format: str, buffer_bytes: int,
+                metrics: PerformanceMetrics) -> Iterator[int]:
+    """
+    Stream the integers of a file one by one using large buffered reads
+    
+    Args:
+        path: File to read
+        file_format: 'binary' (native int64) or 'text' (one integer per line)
+        buffer_bytes: How many bytes to read at a time
+        metrics: Metrics object whose io_bytes_read is updated
+        
+    Yields:
+        Integers in file order
+    """
+    buffer_bytes = max(buffer_bytes - buffer_bytes % INT64_BYTES, MIN_BUFFER_BYTES)
+    
+    if file_format == 'binary':
+        with open(path, 'rb', buffering=0) as file:
+            # A raw read can stop mid-value; carry the partial value over
+            tail = b''
+            while True:
+                data = file.read(buffer_bytes)
+                if not data:
+                    if tail:
+                        raise ValueError(f"{path} is not a whole number of int64 values")
+                    return
+                metrics.io_bytes_read += len(data)
+                data = tail + data
+                end = len(data) - len(data) % INT64_BYTES
+                tail = data[end:]
+                yield from array('q', data[:end])
+    
+    with open(path, 'r', buffering=buffer_bytes) as file:
+        for line in file:
+            metrics.io_bytes_read += len(line)
+            line = line.strip()
+            if line:
+                yield int(line)
+
+
+def write_values(path: str, values: Iterable[int], file_format: str,
+                 buffer_bytes: int, metrics: PerformanceMetrics):
+    """
+    Write integers to a file, collecting them into large blocks first
+    
+    Args:
+        path: File to create (or overwrite)
+        values: Integers to write, in order
+        file_format: 'binary' (native int64) or 'text' (one integer per line)
+        buffer_bytes: Roughly how many bytes to collect before each write
+        metrics: Metrics object whose io_bytes_written is updated
+    """
+    buffer_bytes = max(buffer_bytes, MIN_BUFFER_BYTES)
+    block_size = buffer_bytes // INT64_BYTES
+    
+    if file_format == 'binary':
+        with open(path, 'wb', buffering=0) as file:
+            block = array('q')
+            for value in values:
+                block.append(value)
+                if len(block) == block_size:
+                    metrics.io_bytes_written += file.write(block)
+                    block = array('q')
+            if block:
+                metrics.io_bytes_written += file.write(block)
+        return
+    
+    with open(path, 'w', buffering=buffer_bytes) as file:
+        lines = []
+        for value in values:
+            lines.append(f"{value}\n")
+            if len(lines) == block_size:
+                text = ''.join(lines)
+                file.write(text)
+                metrics.io_bytes_written += len(text)
+                lines = []
+        if lines:
+            text = ''.join(lines)
+            file.write(text)
+            metrics.io_bytes_written += len(text)
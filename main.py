@@ -3,6 +3,7 @@ Main Program
 Entry point for running sorting algorithm performance analysis
 """
 
+from importlib.util import find_spec
 from performance_analyzer import PerformanceAnalyzer
 import sys
 
@@ -15,23 +16,19 @@ def main():
     print("and compare their performance across different data sizes.")
     print()
     
-    # Check if required packages are available
+    # Check if required packages are available (without importing them yet)
     print("📋 Checking system requirements...")
-    try:
-        import psutil
-        print("✅ psutil is available")
-    except ImportError:
+    if find_spec('psutil') is None:
         print("❌ Error: Required package 'psutil' not found.")
         print("Please install with: pip install psutil")
         return
+    print("✅ psutil is available")
     
-    try:
-        import matplotlib.pyplot as plt
+    matplotlib_available = find_spec('matplotlib') is not None
+    if matplotlib_available:
         print("✅ matplotlib is available - charts will be generated")
-        matplotlib_available = True
-    except ImportError:
+    else:
         print("⚠️  matplotlib not available - charts will be skipped")
-        matplotlib_available = False
     
     print()
     print("🔧 Initializing performance analyzer...")
@@ -104,7 +101,10 @@ def main():
     print("Thank you for using the Sorting Algorithm Performance Analyzer.")
     print()
     
-    # Ask user if they want to see additional information
+    # Ask user if they want to see additional information (only when interactive)
+    if not sys.stdin.isatty():
+        print("For scripted runs, use cli.py (python cli.py --help).")
+        return
     try:
         response = input("Would you like to see detailed algorithm information? (y/n): ")
         if response.lower() in ['y', 'yes']:
@@ -122,8 +122,8 @@ def print_algorithm_info():
     
     print("\n🔵 Quick Sort:")
     print("   • Average Time Complexity: O(n log n)")
-    print("   • Worst Case: O(n²)")
-    print("   • Space Complexity: O(log n)")
+    print("   • Worst Case: O(n log n) (introsort mode falls back to heap sort)")
+    print("   • Space Complexity: O(log n) (recurses only into the smaller side)")
     print("   • In-place sorting: Yes")
     print("   • Stable: No")
     print("   • Best for: Random data, memory-constrained systems")
@@ -136,7 +136,7 @@ def print_algorithm_info():
     print("   • Best for: Large datasets, external sorting, parallel processing")
     
     print("\n💡 Key Differences:")
-    print("   • Quick Sort is faster on average but can be slow on sorted data")
+    print("   • Quick Sort is faster on average; classic mode can be slow on sorted data")
     print("   • Merge Sort is consistent but uses more memory")
     print("   • Quick Sort is preferred for general-purpose sorting")
     print("   • Merge Sort is preferred when stability is required")
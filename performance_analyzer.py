@@ -3,51 +3,85 @@ Performance Analyzer Module
 Handles testing and comparison of sorting algorithms
 """
 
-import random
+import os
+import sys
+from importlib.util import find_spec
 from typing import List, Dict
-from sorting_algorithms import SortingAlgorithms
+from sorting_algorithms import SortingAlgorithms, METRICS_LEVELS
+from data_generator import DataGenerator
+from dataset_cache import DatasetCache
+from results_store import ResultStore
 
-try:
+# matplotlib is optional and slow to import, so it is only imported when
+# a chart is actually drawn
+MATPLOTLIB_AVAILABLE = find_spec('matplotlib') is not None
+
+
+def load_pyplot(headless: bool):
+    """
+    Import matplotlib.pyplot on first use
+    
+    Args:
+        headless: Use the Agg backend (files only, no display needed)
+        
+    Returns:
+        The pyplot module
+    """
+    import matplotlib
+    if headless:
+        matplotlib.use('Agg')
     import matplotlib.pyplot as plt
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
-    print("Matplotlib not available. Visualization features will be disabled.")
+    return plt
+
+# Engines compared by run_performance_test: method name -> label in charts
+ANALYZED_ENGINES = {'quick_sort': 'Quick Sort', 'merge_sort': 'Merge Sort'}
 
 class PerformanceAnalyzer:
     """Class to analyze and compare algorithm performance"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: str = None, results_path: str = None):
+        """
+        Args:
+            cache_dir: Keep generated test data in this directory and reuse
+                       it across runs (default: generate it every time)
+            results_path: JSON-lines log the samples are appended to. Samples
+                          already in it are loaded and not measured again,
+                          so an interrupted sweep resumes where it stopped
+                          (default: keep the results in memory only)
+        """
         self.sorter = SortingAlgorithms()
-        self.results = {
-            'quick_sort': {'time': [], 'comparisons': [], 'memory': []},
-            'merge_sort': {'time': [], 'comparisons': [], 'memory': []}
-        }
+        self.generator = DataGenerator()
+        self.cache = DatasetCache(cache_dir, generator=self.generator) if cache_dir else None
+        self.results = ResultStore(results_path)
     
-    def generate_test_data(self, size: int, data_type: str) -> List[int]:
+    def generate_test_data(self, size: int, data_type: str, seed: int = None) -> List[int]:
         """
         Generate test data of specified type and size
         
         Args:
             size: Size of the array
-            data_type: Type of data ('random', 'sorted', 'reverse_sorted')
+            data_type: Type of data, one of data_generator.DISTRIBUTIONS
+                       ('random', 'sorted', 'reverse_sorted', 'nearly_sorted',
+                       'few_unique', 'organ_pipe', 'sawtooth', 'zipf', 'all_equal')
+            seed: Seed for the random numbers, for reproducible data
+                  (default: not reproducible). Seeded data comes from the
+                  dataset cache when there is one.
             
         Returns:
             Generated test data
         """
-        if data_type == 'random':
-            return [random.randint(1, 1000) for _ in range(size)]
-        elif data_type == 'sorted':
-            return list(range(1, size + 1))
-        elif data_type == 'reverse_sorted':
-            return list(range(size, 0, -1))
-        else:
-            raise ValueError("Invalid data type. Use 'random', 'sorted', or 'reverse_sorted'")
+        if self.cache is not None and seed is not None:
+            return self.cache.load(data_type, size, seed)
+        return self.generator.generate(size, data_type, seed)
     
     def run_performance_test(self, sizes: List[int], data_types: List[str], iterations: int = 3):
         """
         Run comprehensive performance tests
         
+        Every sample is added to self.results as soon as it is measured.
+        Iteration i always sorts the data generated with seed i, and samples
+        already in the results are skipped.
+        
         Args:
             sizes: List of array sizes to test
             data_types: List of data types to test
@@ -66,161 +100,195 @@ class PerformanceAnalyzer:
             for size in sizes:
                 current_test += 1
                 print(f"📊 Array size: {size} (Test {current_test}/{total_tests})")
-                
-                # Quick Sort performance
-                quick_times = []
-                quick_comparisons = []
-                quick_memory = []
-                
-                # Merge Sort performance
-                merge_times = []
-                merge_comparisons = []
-                merge_memory = []
-                
                 print(f"   🔄 Running {iterations} iterations...")
                 
                 for iteration in range(iterations):
                     print(f"      Iteration {iteration + 1}/{iterations}", end="")
                     
-                    # Generate test data
-                    test_data = self.generate_test_data(size, data_type)
-                    
-                    # Test Quick Sort
-                    print(" - Quick Sort", end="")
-                    self.sorter.quick_sort(test_data)
-                    metrics = self.sorter.get_metrics()
-                    quick_times.append(metrics.execution_time)
-                    quick_comparisons.append(metrics.comparisons)
-                    quick_memory.append(metrics.memory_usage)
-                    
-                    # Test Merge Sort
-                    print(" - Merge Sort", end="")
-                    self.sorter.merge_sort(test_data)
-                    metrics = self.sorter.get_metrics()
-                    merge_times.append(metrics.execution_time)
-                    merge_comparisons.append(metrics.comparisons)
-                    merge_memory.append(metrics.memory_usage)
+                    # Seeded data, so a resumed sweep measures the same inputs
+                    seed = iteration
+                    engines = [engine for engine in ANALYZED_ENGINES
+                               if not self.results.has(engine, data_type, size, seed, iteration)]
+                    if not engines:
+                        print(" - already stored")
+                        continue
+                    test_data = self.generate_test_data(size, data_type, seed)
                     
-                    print(" ✅")
-                
-                # Calculate averages
-                avg_quick_time = sum(quick_times) / len(quick_times)
-                avg_quick_comparisons = sum(quick_comparisons) / len(quick_comparisons)
-                avg_quick_memory = sum(quick_memory) / len(quick_memory)
-                
-                avg_merge_time = sum(merge_times) / len(merge_times)
-                avg_merge_comparisons = sum(merge_comparisons) / len(merge_comparisons)
-                avg_merge_memory = sum(merge_memory) / len(merge_memory)
-                
-                # Store results
-                self.results['quick_sort']['time'].append(avg_quick_time)
-                self.results['quick_sort']['comparisons'].append(avg_quick_comparisons)
-                self.results['quick_sort']['memory'].append(avg_quick_memory)
+                    correct = True
+                    for engine in engines:
+                        print(f" - {ANALYZED_ENGINES[engine]}", end="")
+                        sorted_data = getattr(self.sorter, engine)(test_data)
+                        metrics = self.sorter.get_metrics()
+                        self.results.append(engine=engine, distribution=data_type, size=size,
+                                            seed=seed, iteration=iteration,
+                                            time=metrics.execution_time,
+                                            comparisons=metrics.comparisons,
+                                            swaps=metrics.swaps, memory=metrics.aux_peak)
+                        # With a cache the stored sorted copy makes checking cheap
+                        if self.cache is not None:
+                            correct = correct and self.cache.matches_reference(
+                                sorted_data, data_type, size, seed)
+                    print(" ✅" if correct else " ❌ wrong result")
                 
-                self.results['merge_sort']['time'].append(avg_merge_time)
-                self.results['merge_sort']['comparisons'].append(avg_merge_comparisons)
-                self.results['merge_sort']['memory'].append(avg_merge_memory)
+                # Averages over every stored sample, including earlier runs
+                quick = self.results.summary('quick_sort', data_type, size)
+                merge = self.results.summary('merge_sort', data_type, size)
                 
                 # Print results
                 print(f"   📈 Results:")
-                print(f"      Quick Sort - Time: {avg_quick_time:.6f}s, "
-                      f"Comparisons: {avg_quick_comparisons:.0f}, "
-                      f"Memory: {avg_quick_memory:,} bytes")
-                print(f"      Merge Sort - Time: {avg_merge_time:.6f}s, "
-                      f"Comparisons: {avg_merge_comparisons:.0f}, "
-                      f"Memory: {avg_merge_memory:,} bytes")
+                print(f"      Quick Sort - Time: {quick['time']:.6f}s, "
+                      f"Comparisons: {quick['comparisons']:.0f}, "
+                      f"Aux space: {quick['memory']:,.0f} elements")
+                print(f"      Merge Sort - Time: {merge['time']:.6f}s, "
+                      f"Comparisons: {merge['comparisons']:.0f}, "
+                      f"Aux space: {merge['memory']:,.0f} elements")
                 
                 # Show which is faster
-                if avg_quick_time < avg_merge_time:
-                    speedup = avg_merge_time / avg_quick_time
+                if quick['time'] < merge['time']:
+                    speedup = merge['time'] / quick['time']
                     print(f"      🏆 Quick Sort is {speedup:.2f}x faster")
                 else:
-                    speedup = avg_quick_time / avg_merge_time
+                    speedup = quick['time'] / merge['time']
                     print(f"      🏆 Merge Sort is {speedup:.2f}x faster")
                 
                 print()
     
-    def visualize_results(self, sizes: List[int]):
+    def benchmark_metrics_levels(self, size: int = 100000, data_type: str = 'random',
+                                 iterations: int = 3) -> Dict[str, Dict[str, float]]:
+        """
+        Measure how much the metrics level costs in sorting throughput
+        
+        Args:
+            size: Size of the array
+            data_type: Type of data ('random', 'sorted', 'reverse_sorted')
+            iterations: Number of runs per level (the fastest one is kept)
+            
+        Returns:
+            Elements sorted per second, by algorithm and metrics level
+        """
+        print(f"\nMetrics Level Overhead ({size} {data_type} elements):")
+        print("-" * 50)
+        
+        test_data = self.generate_test_data(size, data_type)
+        throughput = {'quick_sort': {}, 'merge_sort': {}}
+        
+        for level in METRICS_LEVELS:
+            sorter = SortingAlgorithms(metrics_level=level)
+            for algorithm in throughput:
+                best_time = float('inf')
+                for _ in range(iterations):
+                    getattr(sorter, algorithm)(test_data)
+                    best_time = min(best_time, sorter.get_metrics().execution_time)
+                throughput[algorithm][level] = size / best_time
+        
+        for algorithm, by_level in throughput.items():
+            baseline = by_level['full']
+            for level, elements_per_second in by_level.items():
+                print(f"   {algorithm:<10} {level:<8} {elements_per_second:>14,.0f} elements/s "
+                      f"({elements_per_second / baseline:.2f}x)")
+        
+        return throughput
+    
+    def visualize_results(self, sizes: List[int] = None, output: str = None):
         """
         Create visualizations of performance results
         
+        One line is drawn per engine and data type, from the running means
+        in self.results (so charts of a partly finished sweep work too).
+        
         Args:
-            sizes: List of array sizes used in testing
+            sizes: Only plot these array sizes (default: every stored size)
+            output: Save the charts to this file (PNG, SVG or PDF, by
+                    extension) with the headless Agg backend instead of
+                    showing a window. Without a display (Linux, no
+                    DISPLAY or WAYLAND_DISPLAY) the charts go to
+                    performance_results.png in the current directory,
+                    and the path is printed.
         """
         if not MATPLOTLIB_AVAILABLE:
             print("Matplotlib not available. Skipping visualization.")
             return
         
+        if output is None and sys.platform.startswith('linux') and \
+                not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+            # No screen to show a window on (cron, CI, ssh)
+            output = os.path.abspath('performance_results.png')
+            print(f"No display found; saving the charts to {output} instead")
+        plt = load_pyplot(headless=output is not None)
+        
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('Algorithm Performance Comparison', fontsize=16)
         
-        # Execution Time Comparison
-        axes[0, 0].plot(sizes, self.results['quick_sort']['time'], 
-                       marker='o', label='Quick Sort', linewidth=2)
-        axes[0, 0].plot(sizes, self.results['merge_sort']['time'], 
-                       marker='s', label='Merge Sort', linewidth=2)
-        axes[0, 0].set_xlabel('Array Size')
-        axes[0, 0].set_ylabel('Execution Time (seconds)')
-        axes[0, 0].set_title('Execution Time Comparison')
-        axes[0, 0].legend()
-        axes[0, 0].grid(True, alpha=0.3)
-        
-        # Comparisons Comparison
-        axes[0, 1].plot(sizes, self.results['quick_sort']['comparisons'], 
-                       marker='o', label='Quick Sort', linewidth=2)
-        axes[0, 1].plot(sizes, self.results['merge_sort']['comparisons'], 
-                       marker='s', label='Merge Sort', linewidth=2)
-        axes[0, 1].set_xlabel('Array Size')
-        axes[0, 1].set_ylabel('Number of Comparisons')
-        axes[0, 1].set_title('Comparisons Comparison')
-        axes[0, 1].legend()
-        axes[0, 1].grid(True, alpha=0.3)
-        
-        # Memory Usage Comparison
-        axes[1, 0].plot(sizes, self.results['quick_sort']['memory'], 
-                       marker='o', label='Quick Sort', linewidth=2)
-        axes[1, 0].plot(sizes, self.results['merge_sort']['memory'], 
-                       marker='s', label='Merge Sort', linewidth=2)
-        axes[1, 0].set_xlabel('Array Size')
-        axes[1, 0].set_ylabel('Memory Usage (bytes)')
-        axes[1, 0].set_title('Memory Usage Comparison')
-        axes[1, 0].legend()
-        axes[1, 0].grid(True, alpha=0.3)
-        
-        # Time Complexity Analysis (Log Scale)
-        axes[1, 1].loglog(sizes, self.results['quick_sort']['time'], 
-                         marker='o', label='Quick Sort', linewidth=2)
-        axes[1, 1].loglog(sizes, self.results['merge_sort']['time'], 
-                         marker='s', label='Merge Sort', linewidth=2)
-        axes[1, 1].set_xlabel('Array Size (log scale)')
-        axes[1, 1].set_ylabel('Execution Time (log scale)')
-        axes[1, 1].set_title('Time Complexity Analysis')
-        axes[1, 1].legend()
-        axes[1, 1].grid(True, alpha=0.3)
+        # (axes, column, y label, title, log scale)
+        charts = [
+            (axes[0, 0], 'time', 'Execution Time (seconds)', 'Execution Time Comparison', False),
+            (axes[0, 1], 'comparisons', 'Number of Comparisons', 'Comparisons Comparison', False),
+            # Peak auxiliary buffer space counted by the algorithms
+            (axes[1, 0], 'memory', 'Peak Auxiliary Space (elements)', 'Memory Usage Comparison',
+             False),
+            (axes[1, 1], 'time', 'Execution Time (log scale)', 'Time Complexity Analysis', True),
+        ]
+        distributions = self.results.values('distribution')
+        markers = {'quick_sort': 'o', 'merge_sort': 's'}
+        for ax, column, ylabel, title, log_scale in charts:
+            for distribution in distributions:
+                for engine, label in ANALYZED_ENGINES.items():
+                    xs, ys = self.results.series(engine, distribution, column, sizes)
+                    if not xs:
+                        continue
+                    if len(distributions) > 1:
+                        label = f"{label} ({distribution})"
+                    plot = ax.loglog if log_scale else ax.plot
+                    plot(xs, ys, marker=markers[engine], label=label, linewidth=2)
+            ax.set_xlabel('Array Size (log scale)' if log_scale else 'Array Size')
+            ax.set_ylabel(ylabel)
+            ax.set_title(title)
+            ax.legend()
+            ax.grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.show()
+        if output is not None:
+            fig.savefig(output)
+            plt.close(fig)
+            print(f"Charts saved to {output}")
+        else:
+            plt.show()
     
-    def print_performance_summary(self, sizes: List[int]):
-        """Print a summary of performance results"""
+    def print_performance_summary(self, sizes: List[int] = None):
+        """
+        Print a summary of performance results, per data type
+        
+        Args:
+            sizes: Only include these array sizes (default: every stored size)
+        """
         print("\nPerformance Summary")
         print("=" * 50)
         
-        total_quick_time = sum(self.results['quick_sort']['time'])
-        total_merge_time = sum(self.results['merge_sort']['time'])
-        
-        avg_quick_comparisons = sum(self.results['quick_sort']['comparisons']) / len(sizes)
-        avg_merge_comparisons = sum(self.results['merge_sort']['comparisons']) / len(sizes)
-        
-        print(f"Total Quick Sort Time: {total_quick_time:.6f} seconds")
-        print(f"Total Merge Sort Time: {total_merge_time:.6f} seconds")
-        print(f"Average Quick Sort Comparisons: {avg_quick_comparisons:.0f}")
-        print(f"Average Merge Sort Comparisons: {avg_merge_comparisons:.0f}")
-        
-        if total_quick_time < total_merge_time:
-            print(f"Quick Sort is {(total_merge_time/total_quick_time):.2f}x faster on average")
-        else:
-            print(f"Merge Sort is {(total_quick_time/total_merge_time):.2f}x faster on average")
+        for distribution in self.results.values('distribution'):
+            _, quick_times = self.results.series('quick_sort', distribution, 'time', sizes)
+            _, merge_times = self.results.series('merge_sort', distribution, 'time', sizes)
+            _, quick_comparisons = self.results.series('quick_sort', distribution,
+                                                       'comparisons', sizes)
+            _, merge_comparisons = self.results.series('merge_sort', distribution,
+                                                       'comparisons', sizes)
+            if not quick_times or not merge_times:
+                continue
+            
+            total_quick_time = sum(quick_times)
+            total_merge_time = sum(merge_times)
+            avg_quick_comparisons = sum(quick_comparisons) / len(quick_comparisons)
+            avg_merge_comparisons = sum(merge_comparisons) / len(merge_comparisons)
+            
+            print(f"{distribution} data:")
+            print(f"  Total Quick Sort Time: {total_quick_time:.6f} seconds")
+            print(f"  Total Merge Sort Time: {total_merge_time:.6f} seconds")
+            print(f"  Average Quick Sort Comparisons: {avg_quick_comparisons:.0f}")
+            print(f"  Average Merge Sort Comparisons: {avg_merge_comparisons:.0f}")
+            
+            if total_quick_time < total_merge_time:
+                print(f"  Quick Sort is {(total_merge_time/total_quick_time):.2f}x faster on average")
+            else:
+                print(f"  Merge Sort is {(total_quick_time/total_merge_time):.2f}x faster on average")
     
     def verify_correctness(self):
         """Test algorithm correctness with sample data"""
@@ -6,11 +6,34 @@ Tracks and stores algorithm performance data
 class PerformanceMetrics:
     """Class to keep track of how well algorithms perform"""
     
+    # Fixed attribute set: smaller objects and faster attribute access
+    __slots__ = ('comparisons', 'swaps', 'execution_time', 'memory_usage',
+                 'memory_peak', 'memory_by_level', 'aux_allocated', 'aux_live',
+                 'aux_peak', 'aux_peak_bytes', 'io_bytes_read', 'io_bytes_written',
+                 'merge_passes', 'passes', 'moves', 'key_evaluations',
+                 'char_inspections', 'engine', 'dispatch_reason', 'dispatch_stats')
+    
     def __init__(self):
         self.comparisons = 0  # How many times we compare two numbers
         self.swaps = 0        # How many times we swap two numbers
         self.execution_time = 0  # How long the algorithm takes to run
         self.memory_usage = 0    # How much computer memory is used
+        self.memory_peak = 0     # Highest extra memory during the call (tracemalloc)
+        self.memory_by_level = {}  # Peak memory per recursion level or merge pass
+        self.aux_allocated = 0   # Elements allocated in auxiliary buffers
+        self.aux_live = 0        # Auxiliary buffer elements currently in use
+        self.aux_peak = 0        # Most auxiliary buffer elements in use at once
+        self.aux_peak_bytes = 0  # The same in bytes (merge sort)
+        self.io_bytes_read = 0     # Bytes read from disk (external sort)
+        self.io_bytes_written = 0  # Bytes written to disk (external sort)
+        self.merge_passes = 0      # Passes over the data merging runs (external sort)
+        self.passes = 0     # Passes over the data (counting and radix sort)
+        self.moves = 0      # Elements written (counting/radix sort, keyed sorts)
+        self.key_evaluations = 0  # Calls to the key function
+        self.char_inspections = 0  # Characters read one at a time (string sort)
+        self.engine = None          # Engine chosen by sort()
+        self.dispatch_reason = None  # Why sort() chose it
+        self.dispatch_stats = {}     # Input statistics sort() based the choice on
         
     def reset(self):
         """Set all measurements back to zero"""
@@ -18,13 +41,53 @@ class PerformanceMetrics:
         self.swaps = 0
         self.execution_time = 0
         self.memory_usage = 0
+        self.memory_peak = 0
+        self.memory_by_level = {}
+        self.aux_allocated = 0
+        self.aux_live = 0
+        self.aux_peak = 0
+        self.aux_peak_bytes = 0
+        self.io_bytes_read = 0
+        self.io_bytes_written = 0
+        self.merge_passes = 0
+        self.passes = 0
+        self.moves = 0
+        self.key_evaluations = 0
+        self.char_inspections = 0
+        self.engine = None
+        self.dispatch_reason = None
+        self.dispatch_stats = {}
+    
+    def add_counts(self, other: 'PerformanceMetrics'):
+        """Add the comparisons and swaps counted in another metrics object"""
+        self.comparisons += other.comparisons
+        self.swaps += other.swaps
     
     def __str__(self):
         """Return a string representation of the metrics"""
-        return (f"Comparisons: {self.comparisons}, "
+        text = (f"Comparisons: {self.comparisons}, "
                 f"Swaps: {self.swaps}, "
                 f"Time: {self.execution_time:.6f}s, "
                 f"Memory: {self.memory_usage} bytes")
+        if self.memory_peak:
+            text += f", Peak memory: {self.memory_peak} bytes"
+        if self.aux_allocated:
+            text += f", Aux space: {self.aux_peak} elements peak"
+            if self.aux_peak_bytes:
+                text += f" ({self.aux_peak_bytes} bytes)"
+        if self.io_bytes_read or self.io_bytes_written:
+            text += (f", Read: {self.io_bytes_read} bytes, "
+                     f"Written: {self.io_bytes_written} bytes, "
+                     f"Merge passes: {self.merge_passes}")
+        if self.passes or self.moves:
+            text += f", Passes: {self.passes}, Moves: {self.moves}"
+        if self.key_evaluations:
+            text += f", Key evaluations: {self.key_evaluations}"
+        if self.char_inspections:
+            text += f", Character inspections: {self.char_inspections}"
+        if self.engine:
+            text += f", Engine: {self.engine} ({self.dispatch_reason})"
+        return text
     
     def to_dict(self):
         """Convert metrics to dictionary format"""
@@ -32,5 +95,20 @@ class PerformanceMetrics:
             'comparisons': self.comparisons,
             'swaps': self.swaps,
             'execution_time': self.execution_time,
-            'memory_usage': self.memory_usage
+            'memory_usage': self.memory_usage,
+            'memory_peak': self.memory_peak,
+            'memory_by_level': dict(self.memory_by_level),
+            'aux_allocated': self.aux_allocated,
+            'aux_peak': self.aux_peak,
+            'aux_peak_bytes': self.aux_peak_bytes,
+            'io_bytes_read': self.io_bytes_read,
+            'io_bytes_written': self.io_bytes_written,
+            'merge_passes': self.merge_passes,
+            'passes': self.passes,
+            'moves': self.moves,
+            'key_evaluations': self.key_evaluations,
+            'char_inspections': self.char_inspections,
+            'engine': self.engine,
+            'dispatch_reason': self.dispatch_reason,
+            'dispatch_stats': dict(self.dispatch_stats)
         }
\ No newline at end of file
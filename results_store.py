@@ -0,0 +1,176 @@
+"""
+Results Store Module
+Columnar store of benchmark samples (one row per engine, distribution, size,
+seed and iteration) that appends every row to a JSON-lines log as it arrives,
+so long sweeps can be resumed and queried without running them again
+"""
+
+import json
+import os
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+# Column name -> array typecode (None: plain list, for strings)
+COLUMNS = {
+    'engine': None,
+    'distribution': None,
+    'size': 'q',
+    'seed': 'q',
+    'iteration': 'q',
+    'time': 'd',
+    'comparisons': 'q',
+    'swaps': 'q',
+    'memory': 'q',
+}
+
+# Columns that identify a sample (a sweep skips samples that are already stored)
+KEY_COLUMNS = ('engine', 'distribution', 'size', 'seed', 'iteration')
+
+# Columns averaged by the running summaries
+MEASURE_COLUMNS = ('time', 'comparisons', 'swaps', 'memory')
+
+
+class ResultStore:
+    """Append-only columnar results with running per-group summaries"""
+    
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: JSON-lines log to load and append to (created if missing).
+                  Without a path the results are kept in memory only.
+        """
+        self.path = path
+        self.columns = {name: ([] if typecode is None else array(typecode))
+                        for name, typecode in COLUMNS.items()}
+        self._keys = set()
+        # (engine, distribution, size) -> [count, min time, sum per MEASURE_COLUMNS...]
+        self._groups = {}
+        self._file = None
+        if path is not None and os.path.exists(path):
+            self._load()
+    
+    def __len__(self) -> int:
+        return len(self.columns['engine'])
+    
+    def _load(self):
+        """Read the log, dropping a last line cut short by an interrupted write"""
+        with open(self.path, 'rb') as file:
+            lines = file.readlines()
+        offset = 0
+        for number, line in enumerate(lines, 1):
+            try:
+                row = json.loads(line)
+            except ValueError:
+                if number == len(lines):
+                    # Truncate so the next append starts on a clean line
+                    with open(self.path, 'r+b') as file:
+                        file.truncate(offset)
+                    break
+                raise ValueError(f"{self.path}:{number}: not a JSON row")
+            offset += len(line)
+            self._add(row)
+        else:
+            if lines and not lines[-1].endswith(b'\n'):
+                # Complete last row that is only missing its newline
+                with open(self.path, 'ab') as file:
+                    file.write(b'\n')
+    
+    def _add(self, row: Dict):
+        """Put a row into the columns and the running summaries"""
+        for name, column in self.columns.items():
+            column.append(row[name])
+        self._keys.add(tuple(row[name] for name in KEY_COLUMNS))
+        group = self._groups.setdefault((row['engine'], row['distribution'], row['size']),
+                                        [0, float('inf')] + [0] * len(MEASURE_COLUMNS))
+        group[0] += 1
+        group[1] = min(group[1], row['time'])
+        for index, name in enumerate(MEASURE_COLUMNS, 2):
+            group[index] += row[name]
+    
+    def append(self, **row):
+        """
+        Store one sample and write it to the log straight away
+        
+        Args:
+            row: A value for every column in COLUMNS
+        """
+        missing = [name for name in COLUMNS if name not in row]
+        if missing:
+            raise ValueError(f"missing columns: {', '.join(missing)}")
+        row = {name: row[name] for name in COLUMNS}
+        self._add(row)
+        if self.path is not None:
+            if self._file is None:
+                self._file = open(self.path, 'a')
+            self._file.write(json.dumps(row) + '\n')
+            self._file.flush()
+    
+    def close(self):
+        """Close the log file (appending reopens it)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def has(self, engine: str, distribution: str, size: int, seed: int, iteration: int) -> bool:
+        """Whether this sample is already stored"""
+        return (engine, distribution, size, seed, iteration) in self._keys
+    
+    def rows(self, **filters) -> Iterable[Dict]:
+        """
+        Iterate over stored rows as dictionaries
+        
+        Args:
+            filters: Column name -> required value (e.g. engine='quick_sort')
+        """
+        names = list(self.columns)
+        for values in zip(*self.columns.values()):
+            row = dict(zip(names, values))
+            if all(row[name] == value for name, value in filters.items()):
+                yield row
+    
+    def values(self, name: str) -> List:
+        """Distinct values of a column, in first-seen order"""
+        return list(dict.fromkeys(self.columns[name]))
+    
+    def summary(self, engine: str, distribution: str, size: int) -> Dict[str, float]:
+        """
+        Running summary of one (engine, distribution, size) group
+        
+        Returns:
+            {'samples', 'min_time', and the mean of every MEASURE_COLUMNS
+            column}, or None if the group has no samples
+        """
+        group = self._groups.get((engine, distribution, size))
+        if group is None:
+            return None
+        count = group[0]
+        summary = {'samples': count, 'min_time': group[1]}
+        for index, name in enumerate(MEASURE_COLUMNS, 2):
+            summary[name] = group[index] / count
+        return summary
+    
+    def series(self, engine: str, distribution: str, column: str,
+               sizes: List[int] = None) -> Tuple[List[int], List[float]]:
+        """
+        Mean of a column per size, for plotting
+        
+        Args:
+            engine: Engine name
+            distribution: Data type
+            column: One of MEASURE_COLUMNS (or 'min_time')
+            sizes: Only these sizes (default: every stored size)
+        
+        Returns:
+            (sizes, values), sorted by size, for sizes that have samples
+        """
+        points = sorted((size, self.summary(engine, distribution, size)[column])
+                        for (group_engine, group_distribution, size) in self._groups
+                        if group_engine == engine and group_distribution == distribution
+                        and (sizes is None or size in sizes))
+        return [size for size, _ in points], [value for _, value in points]
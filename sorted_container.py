@@ -0,0 +1,270 @@
+"""
+Sorted Container Module
+A sorted multiset that takes new data in batches and merges it into
+existing sorted runs (LSM-tree style) instead of re-sorting everything
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+from performance_metrics import PerformanceMetrics
+from sorting_algorithms import SortingAlgorithms
+
+# A run is merged into the one before it while that one is at most this
+# many times bigger, which keeps O(log n) runs of geometrically growing size
+RUN_GROWTH_FACTOR = 2
+
+
+class SortedRunContainer:
+    """Sorted multiset of numbers stored as a few sorted runs"""
+    
+    def __init__(self, values: Iterable[int] = ()):
+        """
+        Args:
+            values: Optional initial numbers (added as one batch)
+        """
+        self.sorter = SortingAlgorithms(metrics_level='counters')
+        self.runs = []             # Sorted lists, oldest (and biggest) first
+        self.deleted = Counter()   # value -> copies removed but not yet compacted away
+        self._size = 0             # Values in runs, including deleted ones
+        self._lock = threading.RLock()
+        # Runs [0, _frozen) are being compacted in the background
+        self._frozen = 0
+        # Deletions the background compaction is taking care of
+        self._reserved = Counter()
+        self._compaction = None
+        # Held for a whole compaction, so compact() and the background
+        # compaction never work on the same runs at once
+        self._compacting = threading.Lock()
+        
+        values = list(values)
+        if values:
+            self.add_batch(values)
+    
+    @property
+    def metrics(self) -> PerformanceMetrics:
+        """Comparisons and swaps made by all batches, merges and compactions so far"""
+        return self.sorter.metrics
+    
+    def add_batch(self, values: Iterable[int]):
+        """
+        Sort a batch and merge it into the container
+        
+        The batch becomes a new run and is merged with the newest runs
+        only while they are about the same size, so each value takes part
+        in O(log n) merges in total: the amortized cost of a batch of b
+        values is O(b log n), however big the container already is.
+        
+        Args:
+            values: Numbers to add
+        """
+        # Sorted outside the lock with its own sorter, so batches from
+        # several threads don't share counters
+        sorter = SortingAlgorithms(metrics_level='counters')
+        run = sorter._merge_sort_helper(list(values))
+        
+        with self._lock:
+            self.sorter.metrics.add_counts(sorter.metrics)
+            if not run:
+                return
+            self.runs.append(run)
+            self._size += len(run)
+            while (len(self.runs) - self._frozen >= 2 and
+                   len(self.runs[-2]) <= RUN_GROWTH_FACTOR * len(self.runs[-1])):
+                newer = self.runs.pop()
+                older = self.runs.pop()
+                merged = self.sorter._merge(older, newer)
+                # The merged run replaces its inputs, so it's no extra space
+                self.sorter._release_aux(len(merged))
+                self.runs.append(self._drop_deleted(merged))
+    
+    def remove(self, value: int):
+        """
+        Remove one copy of value
+        
+        The copy is only marked as deleted here; it is dropped for real the
+        next time its run is merged or the container is compacted.
+        
+        Raises:
+            KeyError: If value isn't in the container
+        """
+        with self._lock:
+            if self.count(value) == 0:
+                raise KeyError(value)
+            self.deleted[value] += 1
+    
+    def discard(self, value: int):
+        """Remove one copy of value if there is one"""
+        try:
+            self.remove(value)
+        except KeyError:
+            pass
+    
+    def count(self, value: int) -> int:
+        """Number of copies of value in the container"""
+        with self._lock:
+            stored = 0
+            for run in self.runs:
+                stored += bisect_right(run, value) - bisect_left(run, value)
+            return stored - self.deleted[value]
+    
+    def range(self, low: int, high: int) -> Iterator[int]:
+        """
+        Yield the values with low <= value < high in sorted order
+        
+        Each run is searched with bisect and the matching slices are
+        merged lazily, so the cost is O(k log n + matches) for k runs.
+        The values are read from a snapshot taken when iteration starts.
+        
+        Args:
+            low: Smallest value to include
+            high: First value to leave out
+        """
+        with self._lock:
+            slices = []
+            for run in self.runs:
+                start = bisect_left(run, low)
+                end = bisect_left(run, high, start)
+                if start < end:
+                    slices.append(islice(run, start, end))
+            skip = Counter({value: copies for value, copies in self.deleted.items()
+                            if low <= value < high})
+        
+        for value in self.sorter._kway_merge(slices):
+            if skip[value]:
+                skip[value] -= 1
+                continue
+            yield value
+    
+    def __iter__(self) -> Iterator[int]:
+        """Yield every value in sorted order"""
+        with self._lock:
+            if not self.runs:
+                return iter(())
+            low = min(run[0] for run in self.runs)
+            high = max(run[-1] for run in self.runs)
+        return self._iter_all(low, high)
+    
+    def _iter_all(self, low: int, high: int) -> Iterator[int]:
+        """range() including high itself"""
+        for value in self.range(low, high):
+            yield value
+        for _ in range(self.count(high)):
+            yield high
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size - sum(self.deleted.values())
+    
+    def __contains__(self, value: int) -> bool:
+        return self.count(value) > 0
+    
+    def compact(self):
+        """
+        Merge every run into one and drop all deleted values, right now
+        
+        Waits for a running background compaction to finish first.
+        """
+        self._compact()
+    
+    def compact_in_background(self) -> threading.Thread:
+        """
+        Compact the current runs on a background thread
+        
+        Batches can still be added (and values removed and queried) while
+        it runs; new runs simply aren't part of this compaction.
+        
+        Returns:
+            The compaction thread (already started)
+        """
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return self._compaction
+            self._compaction = threading.Thread(target=self._compact, daemon=True)
+            self._compaction.start()
+            return self._compaction
+    
+    def _compact(self):
+        """Merge the current runs into one, freezing them while that happens"""
+        with self._compacting:
+            with self._lock:
+                runs, deleted = self._snapshot()
+                # add_batch leaves frozen runs alone, so they are still
+                # self.runs[:len(runs)] when the result is installed
+                self._frozen = len(runs)
+                self._reserved = deleted
+            try:
+                # Own sorter so the counters aren't shared between threads
+                sorter = SortingAlgorithms(metrics_level='counters')
+                merged, applied = self._compact_runs(sorter, runs, deleted)
+                with self._lock:
+                    self._install(runs, applied, merged, sorter.metrics)
+            finally:
+                with self._lock:
+                    self._frozen = 0
+                    self._reserved = Counter()
+    
+    def _snapshot(self) -> Tuple[List[List[int]], Counter]:
+        """The current runs and deletions (call with the lock held)"""
+        return list(self.runs), Counter(self.deleted)
+    
+    def _compact_runs(self, sorter: SortingAlgorithms, runs: List[List[int]],
+                      deleted: Counter) -> Tuple[List[int], Counter]:
+        """
+        k-way merge runs into one list, leaving out the deleted copies
+        
+        Returns:
+            The merged run, and the deletions that were actually applied
+            (a deleted value may also sit in a newer run)
+        """
+        skip = Counter(deleted)
+        merged = []
+        for value in sorter._kway_merge(runs):
+            if skip[value]:
+                skip[value] -= 1
+                continue
+            merged.append(value)
+        return merged, deleted - skip
+    
+    def _install(self, runs: List[List[int]], applied: Counter, merged: List[int],
+                 metrics: PerformanceMetrics):
+        """
+        Replace compacted runs with their merged result (call with the lock held)
+        
+        Args:
+            runs: Runs that were compacted (still the first runs in self.runs)
+            applied: Deletions that were applied during the compaction
+            merged: The compacted run
+            metrics: Counters of the compaction, added to the container's
+        """
+        self.runs[:len(runs)] = [merged] if merged else []
+        self._size -= sum(applied.values())
+        self.deleted -= applied
+        if metrics is not self.sorter.metrics:
+            self.sorter.metrics.add_counts(metrics)
+    
+    def _drop_deleted(self, run: List[int]) -> List[int]:
+        """Remove deleted copies that are in run (call with the lock held)"""
+        # Deletions reserved by a background compaction are left to it
+        available = self.deleted - self._reserved
+        if not available:
+            return run
+        
+        # Check the deleted values against the run with binary search
+        positions = []
+        for value, copies in available.items():
+            start = bisect_left(run, value)
+            end = min(bisect_right(run, value, start), start + copies)
+            if end > start:
+                positions.append((start, end))
+                self.deleted[value] -= end - start
+                self._size -= end - start
+        if not positions:
+            return run
+        
+        self.deleted += Counter()  # drops the entries that reached zero
+        for start, end in sorted(positions, reverse=True):
+            del run[start:end]
+        return run
@@ -4,131 +4,2352 @@ Contains Quick Sort and Merge Sort implementations with performance tracking
 """
 
 import time
-import psutil
 import os
-from typing import List
+import math
+import json
+import platform
+import sys
+import shutil
+import tempfile
+import tracemalloc
+from contextlib import ExitStack
+from array import array
+from typing import Any, Callable, Iterable, Iterator, List, Tuple
 from performance_metrics import PerformanceMetrics
+from work_stealing import WorkStealingPool
+from external_sort import BYTES_PER_LIST_ELEMENT, INT64_BYTES, read_chunks, iter_values, write_values
+from typed_buffers import np, copy_buffer, as_numpy_view, is_ndarray, store_values
+from tracer import RecursionTracer
+
+# Ranges this small are finished with insertion sort
+INSERTION_SORT_THRESHOLD = 16
+
+# Optimal sorting networks (comparator pairs) for sort_many's tiny rows
+SORTING_NETWORKS = {
+    2: ((0, 1),),
+    3: ((0, 2), (0, 1), (1, 2)),
+    4: ((0, 2), (1, 3), (0, 1), (2, 3), (1, 2)),
+    5: ((0, 3), (1, 4), (0, 2), (1, 3), (0, 1), (2, 4), (1, 2), (3, 4), (2, 3)),
+    6: ((0, 5), (1, 3), (2, 4), (1, 2), (3, 4), (0, 3), (2, 5), (0, 1), (2, 3),
+        (4, 5), (1, 2), (3, 4)),
+    7: ((0, 6), (2, 3), (4, 5), (0, 2), (1, 4), (3, 6), (0, 1), (2, 5), (3, 4),
+        (1, 2), (4, 6), (2, 3), (4, 5), (1, 2), (3, 4), (5, 6)),
+    8: ((0, 2), (1, 3), (4, 6), (5, 7), (0, 4), (1, 5), (2, 6), (3, 7), (0, 1),
+        (2, 3), (4, 5), (6, 7), (2, 4), (3, 5), (1, 4), (3, 6), (1, 2), (3, 4), (5, 6)),
+}
+
+# Ranges at least this big use Tukey's ninther instead of median-of-three
+NINTHER_THRESHOLD = 40
+
+# Natural merge sort: inputs shorter than this are one insertion-sorted run
+MIN_MERGE = 32
+
+# Natural merge sort: one side winning this many times in a row starts galloping
+MIN_GALLOP = 7
+
+# Parallel merge sort: smaller inputs are sorted serially (no pool startup)
+PARALLEL_THRESHOLD = 100_000
+
+# Parallel quick sort: partitions this small are sorted serially by one thread
+PARALLEL_GRAIN_SIZE = 10_000
+
+# Typed buffers: blocks this small are handed to NumPy's own sort
+VECTOR_LEAF_SIZE = 1024
+
+# Bytes one element of a list merge buffer takes (a pointer; the values
+# themselves are shared with the input)
+LIST_SLOT_BYTES = 8
+
+# Counting sort: largest value range (max - min + 1) it will allocate
+# counts for; radix_sort has no such limit
+COUNTING_SORT_MAX_RANGE = 1 << 20
+
+# Radix sort: bits per digit (one byte, 256 buckets per pass)
+RADIX_BITS = 8
+RADIX_MASK = (1 << RADIX_BITS) - 1
+
+# Dispatcher (sort): radix sort is used when its number of byte passes is
+# at most this fraction of log2(n), the depth of a comparison sort
+RADIX_PASS_RATIO = 0.5
+
+# Dispatcher (sort): inputs where fewer than this fraction of sampled
+# neighbours are out of order are treated as presorted
+PRESORTED_DESCENT_RATIO = 0.05
+
+# External sort: default memory budget and number of runs merged per pass
+EXTERNAL_MEMORY_BUDGET = 64 * 1024 * 1024
+EXTERNAL_FAN_IN = 16
+
+# How much the algorithms measure: 'none' (time only, hot loops run without
+# any counting), 'counters' (time and comparison/swap counts) or 'full'
+# (counts plus memory usage)
+METRICS_LEVELS = ('none', 'counters', 'full')
+
+# How memory is measured at metrics level 'full': 'rss' (cheap process RSS
+# delta, page granular), 'tracemalloc' (exact net and peak Python allocations)
+# or 'tracemalloc_levels' (tracemalloc plus the peak seen at each recursion
+# level or merge pass)
+MEMORY_MODES = ('rss', 'tracemalloc', 'tracemalloc_levels')
+
+# Thresholds a tuning profile (see autotune.py) may override
+TUNABLE_THRESHOLDS = ('INSERTION_SORT_THRESHOLD', 'NINTHER_THRESHOLD', 'MIN_MERGE',
+                      'PARALLEL_THRESHOLD', 'PARALLEL_GRAIN_SIZE', 'VECTOR_LEAF_SIZE',
+                      'RADIX_PASS_RATIO', 'EXTERNAL_MEMORY_BUDGET')
+
+# Where autotune.py saves tuning profiles and new sorters load them from
+# (SORTING_TUNING_PROFILE overrides it)
+TUNING_PROFILE_PATH = os.environ.get(
+    'SORTING_TUNING_PROFILE', os.path.join(os.path.expanduser('~'), '.sorting_profile.json'))
+
+
+class Thresholds:
+    """
+    Tunable cutoffs of one SortingAlgorithms instance
+    
+    Starts from the module constants above; a tuning profile or the caller
+    can override them. Every value is type-checked when it is set.
+    """
+    __slots__ = tuple(name.lower() for name in TUNABLE_THRESHOLDS)
+    
+    def __init__(self, **values):
+        """
+        Args:
+            values: Threshold name (any case) -> value, for the ones that
+                    shouldn't keep their default
+        """
+        for name in self.__slots__:
+            setattr(self, name, globals()[name.upper()])
+        self.update(values)
+    
+    def update(self, values: dict) -> dict:
+        """
+        Change some thresholds (e.g. {'insertion_sort_threshold': 24})
+        
+        Args:
+            values: Threshold name (any case) -> new value
+            
+        Returns:
+            The previous values of the thresholds that were changed
+            
+        Raises:
+            ValueError: For an unknown name or a value of the wrong type
+                        or out of range (nothing is changed then)
+        """
+        checked = {}
+        for name, value in values.items():
+            name = name.lower()
+            if name not in self.__slots__:
+                raise ValueError(f"Unknown threshold {name!r}")
+            if name == 'radix_pass_ratio':
+                valid = (isinstance(value, (int, float)) and not isinstance(value, bool)
+                         and value >= 0)
+            else:
+                # Every other threshold is a count of elements or bytes
+                minimum = 0 if name == 'parallel_threshold' else 1
+                valid = isinstance(value, int) and not isinstance(value, bool) and value >= minimum
+            if not valid:
+                raise ValueError(f"Invalid value for threshold {name!r}: {value!r}")
+            checked[name] = value
+        
+        previous = {name: getattr(self, name) for name in checked}
+        for name, value in checked.items():
+            setattr(self, name, value)
+        return previous
+    
+    def copy(self) -> 'Thresholds':
+        """An independent copy"""
+        return Thresholds(**self.to_dict())
+    
+    def to_dict(self) -> dict:
+        """Threshold name -> value"""
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __repr__(self):
+        values = ', '.join(f"{name}={value!r}" for name, value in self.to_dict().items())
+        return f"Thresholds({values})"
+
+
+def profile_key() -> str:
+    """Key of this machine's entry in a tuning profile: host and Python build"""
+    return (f"{platform.node()}/{platform.python_implementation()}-"
+            f"{sys.version_info.major}.{sys.version_info.minor}")
+
+
+def load_tuning_profile(path: str = None) -> Thresholds:
+    """
+    Read the thresholds tuned for this machine
+    
+    Every SortingAlgorithms created without thresholds uses the profile
+    at TUNING_PROFILE_PATH (see default_thresholds); call this to use
+    another file with SortingAlgorithms(thresholds=...).
+    
+    Args:
+        path: Profile file (default: TUNING_PROFILE_PATH)
+        
+    Returns:
+        Thresholds with this host and Python version's values applied
+        (the defaults when the file or the entry doesn't exist)
+        
+    Raises:
+        ValueError: If the file isn't valid JSON or holds invalid values
+    """
+    path = path or TUNING_PROFILE_PATH
+    try:
+        with open(path) as file:
+            profiles = json.load(file)
+    except FileNotFoundError:
+        return Thresholds()
+    except ValueError as error:
+        raise ValueError(f"Tuning profile {path} is not valid JSON: {error}") from None
+    
+    entry = profiles.get(profile_key(), {}) if isinstance(profiles, dict) else None
+    thresholds = entry.get('thresholds', {}) if isinstance(entry, dict) else None
+    if not isinstance(thresholds, dict):
+        raise ValueError(f"Tuning profile {path} has no valid entry for {profile_key()}")
+    try:
+        return Thresholds(**thresholds)
+    except ValueError as error:
+        raise ValueError(f"Tuning profile {path}, {profile_key()}: {error}") from None
+
+
+# Profile path -> thresholds read from it, so every file is read only once
+_profile_thresholds = {}
+
+
+def default_thresholds() -> Thresholds:
+    """
+    Thresholds for a SortingAlgorithms created without any
+    
+    Returns:
+        A new Thresholds with this machine's entry of the tuning profile
+        applied: the file named by SORTING_TUNING_PROFILE, or
+        TUNING_PROFILE_PATH (where autotune.py saves) when that isn't set.
+        The module defaults if the file or the entry doesn't exist.
+    """
+    path = os.environ.get('SORTING_TUNING_PROFILE') or TUNING_PROFILE_PATH
+    if path not in _profile_thresholds:
+        _profile_thresholds[path] = load_tuning_profile(path)
+    return _profile_thresholds[path].copy()
+
+
+def _split_balance(left: int, right: int) -> float:
+    """Smaller side / bigger side of a split (1.0 when both are equal)"""
+    bigger = max(left, right)
+    return min(left, right) / bigger if bigger else 1.0
+
+
+# Methods a RecursionTracer records as nodes: name -> (size of the call,
+# balance of its split from (result, *arguments) or None, whether it is a
+# recursion step rather than a partition or merge inside one)
+TRACED_METHODS = {
+    '_quick_sort_helper': (lambda arr, low, high, *rest, **options: high - low + 1, None, True),
+    '_classic_quick_sort_helper': (lambda arr, low, high, *rest, **options: high - low + 1,
+                                   None, True),
+    '_partition': (lambda arr, low, high, *rest, **options: high - low + 1,
+                   lambda equal, arr, low, high, *rest, **options:
+                   _split_balance(equal[0] - low, high - equal[1]), False),
+    '_lomuto_partition': (lambda arr, low, high: high - low + 1,
+                          lambda pivot, arr, low, high: _split_balance(pivot - low, high - pivot),
+                          False),
+    '_merge_sort_helper': (lambda arr: len(arr), None, True),
+    '_merge_runs': (lambda source, target, low, mid, high: high - low,
+                    lambda _, source, target, low, mid, high: _split_balance(mid - low, high - mid),
+                    False),
+    '_classic_merge_sort_helper': (lambda arr, *rest, **options: len(arr), None, True),
+    '_merge': (lambda left, right: len(left) + len(right),
+               lambda _, left, right: _split_balance(len(left), len(right)), False),
+}
+
+# psutil handle for this process, created on first use (psutil itself is
+# only imported then, so sorts that don't measure RSS start faster)
+_process = None
+
+
+def _current_process():
+    """Return a cached psutil.Process for this process (re-created after fork)"""
+    global _process
+    if _process is None or _process.pid != os.getpid():
+        import psutil
+        _process = psutil.Process(os.getpid())
+    return _process
+
 
 class SortingAlgorithms:
     """Quick Sort and Merge Sort algorithms with performance tracking"""
     
-    def __init__(self):
-        self.metrics = PerformanceMetrics()
+    def __init__(self, metrics_level: str = 'full', memory_mode: str = 'rss',
+                 tracer: RecursionTracer = None, thresholds: Thresholds = None):
+        """
+        Args:
+            metrics_level: One of METRICS_LEVELS
+            memory_mode: One of MEMORY_MODES
+            tracer: RecursionTracer to report every recursion node to
+            thresholds: Cutoffs the engines use (default: default_thresholds())
+        """
+        if metrics_level not in METRICS_LEVELS:
+            raise ValueError("Invalid metrics level. Use 'none', 'counters' or 'full'")
+        if memory_mode not in MEMORY_MODES:
+            raise ValueError("Invalid memory mode. Use 'rss', 'tracemalloc' or 'tracemalloc_levels'")
+        self.metrics = PerformanceMetrics()
+        self.metrics_level = metrics_level
+        self.memory_mode = memory_mode
+        # Traced memory at the start of the call, while recording per level
+        self._level_baseline = None
+        self.thresholds = thresholds if thresholds is not None else default_thresholds()
+        self.tracer = None
+        if tracer is not None:
+            self.set_tracer(tracer)
+    
+    def set_tracer(self, tracer: RecursionTracer = None):
+        """
+        Record every recursion node (and partition or merge) with a tracer
+        
+        The methods in TRACED_METHODS are replaced on this instance by
+        wrappers that report to the tracer. Passing None removes the
+        wrappers again, so without a tracer the sorts run the original
+        methods with no extra cost at all.
+        
+        Args:
+            tracer: RecursionTracer to report to, or None to stop tracing
+        """
+        for name in TRACED_METHODS:
+            self.__dict__.pop(name, None)
+        self.tracer = tracer
+        if tracer is None:
+            return
+        for name, (size_of, balance_of, recursive) in TRACED_METHODS.items():
+            setattr(self, name, tracer.wrap(name.strip('_'), getattr(self, name), size_of,
+                                            balance_of, recursive))
+    
+    def _start_tracking(self) -> tuple:
+        """
+        Reset the metrics and note where a sort call starts
+        
+        Returns:
+            Tracking state to hand to _stop_tracking
+        """
+        self.metrics.reset()
+        memory_at_start = None
+        started_tracemalloc = False
+        if self.metrics_level == 'full':
+            if self.memory_mode == 'rss':
+                # Check how much memory we're using at the start
+                memory_at_start = _current_process().memory_info().rss
+            else:
+                started_tracemalloc = not tracemalloc.is_tracing()
+                if started_tracemalloc:
+                    tracemalloc.start()
+                tracemalloc.reset_peak()
+                memory_at_start = tracemalloc.get_traced_memory()[0]
+                if self.memory_mode == 'tracemalloc_levels':
+                    self._level_baseline = memory_at_start
+        return time.perf_counter(), memory_at_start, started_tracemalloc
+    
+    def _stop_tracking(self, tracking: tuple):
+        """
+        Record how long the sort call took and how much memory it used
+        
+        Args:
+            tracking: State returned by _start_tracking
+        """
+        start_time, memory_at_start, started_tracemalloc = tracking
+        self.metrics.execution_time = time.perf_counter() - start_time
+        if memory_at_start is not None:
+            if self.memory_mode == 'rss':
+                memory_at_end = _current_process().memory_info().rss
+                self.metrics.memory_usage = memory_at_end - memory_at_start
+            else:
+                memory_at_end, memory_peak = tracemalloc.get_traced_memory()
+                self.metrics.memory_usage = memory_at_end - memory_at_start
+                self.metrics.memory_peak = memory_peak - memory_at_start
+                self._level_baseline = None
+                if started_tracemalloc:
+                    tracemalloc.stop()
+        if self.metrics_level == 'none':
+            # Rare paths (heap sort fallback, galloping) still count a little
+            self.metrics.comparisons = 0
+            self.metrics.swaps = 0
+    
+    def _record_level_memory(self, level: int):
+        """
+        Note the traced memory in use at a recursion level or merge pass
+        
+        Only does anything when memory_mode is 'tracemalloc_levels'.
+        
+        Args:
+            level: Recursion depth (or merge pass number)
+        """
+        if self._level_baseline is None:
+            return
+        in_use = tracemalloc.get_traced_memory()[0] - self._level_baseline
+        by_level = self.metrics.memory_by_level
+        if in_use > by_level.get(level, 0):
+            by_level[level] = in_use
+    
+    def _allocate_aux(self, elements: int):
+        """Record that an auxiliary buffer of this many elements was created"""
+        self.metrics.aux_allocated += elements
+        self.metrics.aux_live += elements
+        if self.metrics.aux_live > self.metrics.aux_peak:
+            self.metrics.aux_peak = self.metrics.aux_live
+    
+    def _release_aux(self, elements: int):
+        """Record that an auxiliary buffer of this many elements was freed"""
+        self.metrics.aux_live -= elements
+    
+    def sort(self, arr: List[int], inplace: bool = False) -> List[int]:
+        """
+        Sort with whichever engine suits the input best
+        
+        A sample of about sqrt(n) positions is checked for presortedness,
+        duplicates and value range, and an engine is picked from that, in
+        this order: natural merge sort for presorted data, counting sort for
+        integers with a narrow range, parallel merge sort for big integer
+        lists on multi-core machines, radix sort for other integers where
+        it needs few passes, and introsort otherwise.
+        The chosen engine, the reason and the sample statistics are stored
+        in metrics.engine, metrics.dispatch_reason and metrics.dispatch_stats.
+        
+        Args:
+            arr: List, array.array, memoryview or NumPy array of numbers
+            inplace: Sort arr itself instead of a copy
+            
+        Returns:
+            Sorted numbers (arr itself when inplace is True)
+        """
+        start_time = time.perf_counter()
+        stats = self._sample_input(arr)
+        engine, reason = self._choose_engine(stats, inplace)
+        sampling_time = time.perf_counter() - start_time
+        
+        if engine in ('counting_sort', 'radix_sort'):
+            try:
+                if engine == 'counting_sort':
+                    try:
+                        sorted_arr = self.counting_sort(arr, inplace=inplace)
+                    except ValueError:
+                        # The sample missed values far outside its range
+                        engine, reason = 'radix_sort', reason + "; full range too wide, radix sort"
+                        sorted_arr = self.radix_sort(arr, inplace=inplace)
+                else:
+                    sorted_arr = self.radix_sort(arr, inplace=inplace)
+            except TypeError:
+                # The sample missed values that aren't integers
+                engine, reason = 'introsort', reason + "; non-integer values found, introsort"
+                sorted_arr = self.quick_sort(arr, inplace=inplace)
+        elif engine == 'natural_merge_sort':
+            sorted_arr = self.merge_sort(arr, mode='natural', inplace=inplace)
+        elif engine == 'parallel_merge_sort':
+            try:
+                sorted_arr = self.parallel_merge_sort(arr)
+            except (TypeError, OverflowError):
+                # The sample missed values that aren't 64-bit integers
+                engine = 'introsort'
+                reason += "; values that aren't 64-bit integers found, introsort"
+                sorted_arr = self.quick_sort(arr, inplace=inplace)
+        else:
+            sorted_arr = self.quick_sort(arr, inplace=inplace)
+        
+        # The engine reset the metrics, so record the decision afterwards
+        self.metrics.execution_time += sampling_time
+        self.metrics.engine = engine
+        self.metrics.dispatch_reason = reason
+        self.metrics.dispatch_stats = stats
+        return sorted_arr
+    
+    def _sample_input(self, arr) -> dict:
+        """
+        Estimate the shape of the input from about sqrt(n) sampled positions
+        
+        Args:
+            arr: Numbers to look at
+            
+        Returns:
+            size, sample_size, descent_ratio (share of sampled neighbour
+            pairs that go down), estimated_runs, duplicate_ratio (share of
+            sampled values seen before in the sample), all_int, value_min,
+            value_max and value_range (of the sample)
+        """
+        n = len(arr)
+        stats = {'size': n, 'sample_size': 0, 'descent_ratio': 0.0, 'estimated_runs': 1,
+                 'duplicate_ratio': 0.0, 'all_int': True,
+                 'value_min': None, 'value_max': None, 'value_range': 0}
+        if n < 2:
+            return stats
+        
+        # Evenly spread positions, each checked against its right neighbour
+        sample_size = min(max(math.isqrt(n), 2), n - 1)
+        step = (n - 1) / sample_size
+        positions = [int(i * step) for i in range(sample_size)]
+        values = [arr[i] for i in positions]
+        descents = sum(1 for i in positions if arr[i + 1] < arr[i])
+        
+        descent_ratio = descents / sample_size
+        all_int = all(isinstance(value, int) for value in values)
+        if not all_int and all(hasattr(value, '__index__') for value in values):
+            # NumPy integer scalars
+            values = [int(value) for value in values]
+            all_int = True
+        
+        stats.update({
+            'sample_size': sample_size,
+            'descent_ratio': descent_ratio,
+            # One run starts at every descent (or ascent, for descending data)
+            'estimated_runs': max(1, round(min(descent_ratio, 1 - descent_ratio) * (n - 1))),
+            'duplicate_ratio': 1 - len(set(values)) / sample_size,
+            'all_int': all_int,
+            'value_min': min(values),
+            'value_max': max(values),
+        })
+        if all_int:
+            stats['value_range'] = stats['value_max'] - stats['value_min'] + 1
+        return stats
+    
+    def _choose_engine(self, stats: dict, inplace: bool) -> Tuple[str, str]:
+        """
+        Pick a sorting engine from the sampled statistics
+        
+        Args:
+            stats: Result of _sample_input
+            inplace: Whether the caller wants arr sorted in place
+            
+        Returns:
+            (engine name, human readable reason)
+        """
+        n = stats['size']
+        if n <= self.thresholds.insertion_sort_threshold:
+            return 'introsort', f"tiny input (n={n}): insertion sort inside introsort"
+        
+        ratio = stats['descent_ratio']
+        if ratio <= PRESORTED_DESCENT_RATIO or ratio >= 1 - PRESORTED_DESCENT_RATIO:
+            return ('natural_merge_sort',
+                    f"presorted: {ratio:.1%} of sampled neighbours descend, "
+                    f"about {stats['estimated_runs']} runs")
+        
+        if stats['all_int']:
+            value_range = stats['value_range']
+            if value_range <= min(n, COUNTING_SORT_MAX_RANGE):
+                return ('counting_sort',
+                        f"small integer range: about {value_range} values for n={n}")
+            # Checked before radix sort, which takes any int64 input this big:
+            # the parallel engine packs the values into int64 shared memory
+            if (n >= self.thresholds.parallel_threshold and not inplace and
+                    -2 ** 63 <= stats['value_min'] and stats['value_max'] < 2 ** 63 and
+                    (os.cpu_count() or 1) > 1):
+                return ('parallel_merge_sort',
+                        f"large integer input (n={n}) and {os.cpu_count()} CPUs")
+            # Radix sort takes one pass per byte of the range; comparison
+            # sorts take about log2(n), so radix wins once the byte count is
+            # a small enough fraction of that
+            radix_bytes = -(-value_range.bit_length() // RADIX_BITS)
+            if radix_bytes <= n.bit_length() * self.thresholds.radix_pass_ratio:
+                return ('radix_sort',
+                        f"integer keys: {radix_bytes} radix passes vs log2(n)={n.bit_length()}")
+        
+        if stats['duplicate_ratio'] > 0.5:
+            return ('introsort',
+                    f"{stats['duplicate_ratio']:.0%} duplicates in sample: "
+                    f"three-way partitioning groups equal keys")
+        return 'introsort', "unordered input: introsort"
+    
+    def sort_many(self, arrays: List[List[int]], inplace: bool = False,
+                  row_metrics: bool = False):
+        """
+        Sort many small arrays in one call
+        
+        Tracking (metrics reset, timer, memory reading) is set up once for
+        the whole batch instead of once per array. Rows of up to 8 values
+        go through a fixed sorting network, rows up to
+        thresholds.insertion_sort_threshold through insertion sort and longer rows
+        through introsort.
+        
+        Args:
+            arrays: Lists, array.array rows, memoryviews or NumPy arrays
+            inplace: Sort the rows themselves instead of copies
+            row_metrics: Also return the comparisons and swaps of every row
+            
+        Returns:
+            The sorted rows; with row_metrics, a (rows, metrics) tuple where
+            metrics holds one PerformanceMetrics per row. self.metrics
+            always has the totals for the batch.
+        """
+        tracking = self._start_tracking()
+        metrics = self.metrics
+        per_row = [] if row_metrics else None
+        sorted_rows = []
+        
+        for arr in arrays:
+            sorted_arr = arr if inplace else copy_buffer(arr)
+            items = self._python_items(sorted_arr)
+            comparisons, swaps = metrics.comparisons, metrics.swaps
+            self._sort_small(items)
+            store_values(sorted_arr, items)
+            sorted_rows.append(sorted_arr)
+            if row_metrics:
+                row = PerformanceMetrics()
+                row.comparisons = metrics.comparisons - comparisons
+                row.swaps = metrics.swaps - swaps
+                per_row.append(row)
+        
+        self._stop_tracking(tracking)
+        if row_metrics:
+            return sorted_rows, per_row
+        return sorted_rows
+    
+    def sort_rows(self, matrix, lengths: Iterable[int] = None, inplace: bool = False):
+        """
+        Sort every row of a 2-D buffer, optionally only its first lengths[i] values
+        
+        A 2-D NumPy array is sorted with one np.sort over all rows, or one
+        per distinct length when lengths are given; values past a row's
+        length are left where they are. Anything else (a list of rows, for example) is sorted row by row
+        like sort_many.
+        
+        Args:
+            matrix: 2-D NumPy array, or a sequence of mutable rows
+            lengths: Number of values in use in every row (default: all)
+            inplace: Sort matrix itself instead of a copy
+            
+        Returns:
+            The matrix with every row sorted (matrix itself when inplace is True)
+        """
+        tracking = self._start_tracking()
+        
+        if is_ndarray(matrix) and matrix.ndim == 2:
+            sorted_matrix = matrix if inplace else matrix.copy()
+            if lengths is None:
+                sorted_matrix.sort(axis=1)
+            else:
+                # Rows of equal length are sorted together; no sentinel values,
+                # which NaN (or real data equal to the sentinel) would break
+                lengths = np.asarray(lengths)
+                for length in np.unique(lengths):
+                    rows = np.flatnonzero(lengths == length)
+                    block = sorted_matrix[rows, :length]
+                    block.sort(axis=1)
+                    sorted_matrix[rows, :length] = block
+        else:
+            sorted_matrix = matrix if inplace else [copy_buffer(row) for row in matrix]
+            if lengths is None:
+                lengths = [len(row) for row in sorted_matrix]
+            for row, length in zip(sorted_matrix, lengths):
+                items = self._python_items(row)
+                prefix = items[:length]
+                self._sort_small(prefix)
+                items[:length] = prefix
+                store_values(row, items)
+        
+        self._stop_tracking(tracking)
+        return sorted_matrix
+    
+    def _sort_small(self, items: List[int]):
+        """
+        Sort a short list or array.array in place with the cheapest engine
+        
+        Args:
+            items: Values to sort
+        """
+        n = len(items)
+        network = SORTING_NETWORKS.get(n)
+        if network is not None:
+            swaps = 0
+            for i, j in network:
+                if items[j] < items[i]:
+                    items[i], items[j] = items[j], items[i]
+                    swaps += 1
+            if self.metrics_level != 'none':
+                self.metrics.comparisons += len(network)
+                self.metrics.swaps += swaps
+        elif n <= self.thresholds.insertion_sort_threshold:
+            self._insertion_sort(items, 0, n - 1)
+        else:
+            self._quick_sort_items(items, 'introsort')
+    
+    def quick_sort(self, arr: List[int], mode: str = 'introsort', inplace: bool = False,
+                   vectorized: bool = None, key: Callable[[Any], Any] = None,
+                   reverse: bool = False, stable: bool = False) -> List[int]:
+        """
+        Quick Sort algorithm with performance tracking
+        
+        Args:
+            arr: List, array.array, memoryview or NumPy array of numbers
+            mode: 'introsort' (default) uses median-of-three/ninther pivots,
+                  three-way partitioning and a heap sort fallback, so every
+                  input shape sorts in O(n log n) with O(log n) stack.
+                  'classic' is the textbook last-element pivot version.
+            inplace: Sort arr itself instead of a copy
+            vectorized: Use the NumPy engine for typed buffers (default: when
+                        NumPy is installed). Comparisons made inside NumPy's
+                        leaf sorts aren't counted; pass False for exact counts.
+            key: Function giving the value to sort each element by; it is
+                 called exactly once per element (see _keyed_sort)
+            reverse: Sort from largest to smallest
+            stable: Keep equal elements in their original order. Quick Sort
+                    isn't stable by itself, so this sorts (key, index) pairs
+                    instead; sorts with key or reverse are always stable.
+            
+        Returns:
+            Sorted values (arr itself when inplace is True)
+        """
+        if mode not in ('introsort', 'classic'):
+            raise ValueError("Invalid mode. Use 'introsort' or 'classic'")
+        
+        tracking = self._start_tracking()
+        
+        # Make a copy (unless asked not to) so we don't change the original
+        sorted_arr = arr if inplace else copy_buffer(arr)
+        
+        if key is not None or reverse or stable:
+            self._keyed_sort(sorted_arr, key, reverse, vectorized,
+                             lambda items: self._quick_sort_items(items, mode))
+        else:
+            view = self._vectorized_view(sorted_arr, mode == 'introsort', vectorized)
+            if view is not None:
+                self._vectorized_quick_sort_helper(view)
+            else:
+                items = self._python_items(sorted_arr)
+                store_values(sorted_arr, self._quick_sort_items(items, mode))
+        
+        # Calculate how long it took (and how much memory we used)
+        self._stop_tracking(tracking)
+        
+        return sorted_arr
+    
+    def _quick_sort_items(self, items: List[int], mode: str) -> List[int]:
+        """
+        Run the pure Python Quick Sort engine for a mode on a list
+        
+        Args:
+            items: List or array.array, sorted in place
+            mode: 'introsort' or 'classic'
+            
+        Returns:
+            items
+        """
+        if mode == 'introsort':
+            # Switch to heap sort once we go deeper than 2 * log2(n)
+            depth_limit = 2 * max(len(items), 1).bit_length()
+            self._quick_sort_helper(items, 0, len(items) - 1, depth_limit)
+        else:
+            self._classic_quick_sort_helper(items, 0, len(items) - 1)
+        return items
+    
+    def parallel_quick_sort(self, arr: List[int], workers: int = None,
+                            grain_size: int = None) -> List[int]:
+        """
+        Quick Sort (introsort) that sorts independent partitions on threads
+        
+        Both sides of every partition are independent, so one side is
+        queued as a task while the thread keeps going with the other. Tasks
+        are scheduled with per-thread work-stealing deques. Each thread
+        counts into its own metrics, which are added up at the end, so no
+        counts are lost. Threads only run at the same time on free-threaded
+        Python builds; with the GIL this gives the same result as quick_sort.
+        Typed buffers are partitioned with NumPy masks and their grain-sized
+        leaves sorted by ndarray.sort, which releases the GIL, so those
+        threads overlap on any build.
+        
+        Args:
+            arr: List, array.array, memoryview or NumPy array of numbers
+            workers: Number of threads (default: number of CPUs)
+            grain_size: Partitions this small are sorted without splitting
+                        (default: thresholds.parallel_grain_size)
+            
+        Returns:
+            Sorted copy of arr (see copy_buffer)
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        
+        if grain_size is None:
+            grain_size = self.thresholds.parallel_grain_size
+        
+        n = len(arr)
+        if n <= grain_size or workers == 1:
+            return self.quick_sort(arr)
+        
+        tracking = self._start_tracking()
+        
+        # Make a copy so we don't change the original
+        sorted_arr = copy_buffer(arr)
+        view = as_numpy_view(sorted_arr)
+        if view is not None:
+            items = self._move_nans_last(view)
+            n = len(items)
+        else:
+            items = self._python_items(sorted_arr)
+        
+        # One sorter (and so one set of counters) per thread, with our
+        # cutoffs and tracer
+        sorters = [SortingAlgorithms(self.metrics_level, tracer=self.tracer,
+                                     thresholds=self.thresholds.copy())
+                   for _ in range(workers)]
+        
+        def sort_task(worker_id, task, push):
+            low, high, depth_limit = task
+            sorter = sorters[worker_id]
+            while high - low + 1 > grain_size:
+                if depth_limit == 0:
+                    if view is not None:
+                        items[low:high + 1].sort(kind='heapsort')
+                    else:
+                        sorter._heap_sort(items, low, high)
+                    return
+                depth_limit -= 1
+                
+                if view is not None:
+                    less, greater = sorter._vectorized_partition(items[low:high + 1])
+                    equal_start, equal_end = low + less, high - greater
+                else:
+                    equal_start, equal_end = sorter._partition(items, low, high)
+                
+                # Queue the smaller side (other threads may steal it), keep the bigger
+                if equal_start - low < high - equal_end:
+                    push((low, equal_start - 1, depth_limit))
+                    low = equal_end + 1
+                else:
+                    push((equal_end + 1, high, depth_limit))
+                    high = equal_start - 1
+            if view is not None:
+                items[low:high + 1].sort()
+            else:
+                sorter._quick_sort_helper(items, low, high, depth_limit)
+        
+        depth_limit = 2 * n.bit_length()
+        WorkStealingPool(workers).run([(0, n - 1, depth_limit)], sort_task)
+        
+        for sorter in sorters:
+            self.metrics.add_counts(sorter.metrics)
+        if view is None:
+            store_values(sorted_arr, items)
+        
+        # Calculate how long it took (and how much memory we used)
+        self._stop_tracking(tracking)
+        
+        return sorted_arr
+    
+    def _quick_sort_helper(self, arr: List[int], low: int, high: int, depth_limit: int,
+                           depth: int = 0):
+        """
+        Helper function that does the actual Quick Sort (introsort) work
+        
+        Only the smaller side of each partition is sorted recursively; the
+        larger side is handled by the loop, so the stack stays O(log n).
+        
+        Args:
+            arr: List to sort
+            low: Starting position
+            high: Ending position
+            depth_limit: Partitions left before falling back to heap sort
+            depth: Recursion depth of this call
+        """
+        self._record_level_memory(depth)
+        while high - low + 1 > self.thresholds.insertion_sort_threshold:
+            if depth_limit == 0:
+                # Too many bad pivots in a row: heap sort is O(n log n) always
+                self._heap_sort(arr, low, high)
+                return
+            depth_limit -= 1
+            
+            # Split the array into < pivot, == pivot and > pivot parts
+            equal_start, equal_end = self._partition(arr, low, high)
+            
+            # Recurse into the smaller part, loop on the bigger one
+            if equal_start - low < high - equal_end:
+                self._quick_sort_helper(arr, low, equal_start - 1, depth_limit, depth + 1)
+                low = equal_end + 1
+            else:
+                self._quick_sort_helper(arr, equal_end + 1, high, depth_limit, depth + 1)
+                high = equal_start - 1
+        
+        # Small pieces are fastest with insertion sort
+        self._insertion_sort(arr, low, high)
+    
+    def _partition(self, arr: List[int], low: int, high: int, pivot: int = None) -> Tuple[int, int]:
+        """
+        Split the array three ways (Dutch national flag) around a pivot
+        
+        Args:
+            arr: List to split
+            low: Starting position
+            high: Ending position
+            pivot: Pivot value (default: picked with _choose_pivot)
+            
+        Returns:
+            (first, last) positions of the block of elements equal to the pivot
+        """
+        if pivot is None:
+            pivot = self._choose_pivot(arr, low, high)
+        if self.metrics_level == 'none':
+            return self._partition_uncounted(arr, low, high, pivot)
+        
+        # arr[low:less_end] < pivot, arr[less_end:i] == pivot,
+        # arr[greater_start+1:high+1] > pivot
+        less_end = low
+        i = low
+        greater_start = high
+        
+        # Count in local variables and add them to the metrics once at the end
+        comparisons = swaps = 0
+        while i <= greater_start:
+            comparisons += 1
+            if arr[i] < pivot:
+                arr[less_end], arr[i] = arr[i], arr[less_end]
+                swaps += 1
+                less_end += 1
+                i += 1
+            else:
+                comparisons += 1
+                if arr[i] > pivot:
+                    arr[i], arr[greater_start] = arr[greater_start], arr[i]
+                    swaps += 1
+                    greater_start -= 1
+                else:
+                    i += 1
+        
+        self.metrics.comparisons += comparisons
+        self.metrics.swaps += swaps
+        return less_end, greater_start
+    
+    def _partition_uncounted(self, arr: List[int], low: int, high: int, pivot: int) -> Tuple[int, int]:
+        """Same as _partition, without any counting (metrics level 'none')"""
+        less_end = low
+        i = low
+        greater_start = high
+        
+        while i <= greater_start:
+            value = arr[i]
+            if value < pivot:
+                arr[less_end], arr[i] = value, arr[less_end]
+                less_end += 1
+                i += 1
+            elif value > pivot:
+                arr[i], arr[greater_start] = arr[greater_start], value
+                greater_start -= 1
+            else:
+                i += 1
+        
+        return less_end, greater_start
+    
+    def _choose_pivot(self, arr: List[int], low: int, high: int) -> int:
+        """
+        Pick a pivot value: median-of-three, or Tukey's ninther for big ranges
+        
+        Args:
+            arr: List being sorted
+            low: Starting position
+            high: Ending position
+            
+        Returns:
+            The pivot value
+        """
+        mid = (low + high) // 2
+        if high - low + 1 < self.thresholds.ninther_threshold:
+            return self._median_of_three(arr[low], arr[mid], arr[high])
+        
+        # Median of the medians of three evenly spaced groups of three
+        step = (high - low + 1) // 8
+        first = self._median_of_three(arr[low], arr[low + step], arr[low + 2 * step])
+        middle = self._median_of_three(arr[mid - step], arr[mid], arr[mid + step])
+        last = self._median_of_three(arr[high - 2 * step], arr[high - step], arr[high])
+        return self._median_of_three(first, middle, last)
+    
+    def _median_of_three(self, a: int, b: int, c: int) -> int:
+        """Return the middle value of three numbers"""
+        self.metrics.comparisons += 2
+        if a <= b:
+            if b <= c:
+                return b
+            self.metrics.comparisons += 1
+            return c if a <= c else a
+        if a <= c:
+            return a
+        self.metrics.comparisons += 1
+        return c if b <= c else b
+    
+    def _insertion_sort(self, arr: List[int], low: int, high: int):
+        """
+        Sort a small part of the array in place with insertion sort
+        
+        Args:
+            arr: List to sort
+            low: Starting position
+            high: Ending position
+        """
+        if self.metrics_level == 'none':
+            self._insertion_sort_uncounted(arr, low, high)
+            return
+        
+        comparisons = swaps = 0
+        for i in range(low + 1, high + 1):
+            value = arr[i]
+            j = i - 1
+            while j >= low:
+                comparisons += 1
+                if arr[j] <= value:
+                    break
+                # Shift the bigger number one step to the right
+                arr[j + 1] = arr[j]
+                swaps += 1
+                j -= 1
+            arr[j + 1] = value
+        
+        self.metrics.comparisons += comparisons
+        self.metrics.swaps += swaps
+    
+    def _insertion_sort_uncounted(self, arr: List[int], low: int, high: int):
+        """Same as _insertion_sort, without any counting (metrics level 'none')"""
+        for i in range(low + 1, high + 1):
+            value = arr[i]
+            j = i - 1
+            while j >= low and value < arr[j]:
+                arr[j + 1] = arr[j]
+                j -= 1
+            arr[j + 1] = value
+    
+    def _heap_sort(self, arr: List[int], low: int, high: int):
+        """
+        Sort part of the array in place with heap sort (introsort fallback)
+        
+        Args:
+            arr: List to sort
+            low: Starting position
+            high: Ending position
+        """
+        size = high - low + 1
+        
+        # Build a max heap from the bottom up
+        for root in range(size // 2 - 1, -1, -1):
+            self._sift_down(arr, low, root, size)
+        
+        # Move the largest number to the end and shrink the heap
+        for end in range(size - 1, 0, -1):
+            arr[low], arr[low + end] = arr[low + end], arr[low]
+            self.metrics.swaps += 1
+            self._sift_down(arr, low, 0, end)
+    
+    def _sift_down(self, arr: List[int], offset: int, root: int, size: int):
+        """
+        Push arr[offset + root] down until the max heap property holds
+        
+        Args:
+            arr: List holding the heap
+            offset: Position of the heap's first element in arr
+            root: Heap index to start from
+            size: Number of elements in the heap
+        """
+        comparisons = swaps = 0
+        while True:
+            child = 2 * root + 1
+            if child >= size:
+                break
+            
+            # Pick the bigger of the two children
+            if child + 1 < size:
+                comparisons += 1
+                if arr[offset + child] < arr[offset + child + 1]:
+                    child += 1
+            
+            comparisons += 1
+            if arr[offset + root] >= arr[offset + child]:
+                break
+            
+            arr[offset + root], arr[offset + child] = arr[offset + child], arr[offset + root]
+            swaps += 1
+            root = child
+        
+        self.metrics.comparisons += comparisons
+        self.metrics.swaps += swaps
+    
+    def _classic_quick_sort_helper(self, arr: List[int], low: int, high: int, depth: int = 0):
+        """
+        Textbook Quick Sort recursion (last-element pivot, both sides recursive)
+        
+        Args:
+            arr: List to sort
+            low: Starting position
+            high: Ending position
+            depth: Recursion depth of this call
+        """
+        self._record_level_memory(depth)
+        if low < high:
+            # Split the array and get the position of the pivot
+            pivot_position = self._lomuto_partition(arr, low, high)
+            
+            # Sort the left and right parts separately
+            self._classic_quick_sort_helper(arr, low, pivot_position - 1, depth + 1)
+            self._classic_quick_sort_helper(arr, pivot_position + 1, high, depth + 1)
+    
+    def _lomuto_partition(self, arr: List[int], low: int, high: int) -> int:
+        """
+        Split the array around a pivot (chosen as the last element)
+        
+        Args:
+            arr: List to split
+            low: Starting position
+            high: Ending position
+            
+        Returns:
+            Position where the pivot ends up
+        """
+        # Choose the last element as our pivot
+        pivot = arr[high]
+        
+        # Keep track of where smaller elements should go
+        smaller_index = low - 1
+        swaps = 0
+        
+        for j in range(low, high):
+            # If current number is smaller than or equal to pivot
+            if arr[j] <= pivot:
+                smaller_index += 1
+                arr[smaller_index], arr[j] = arr[j], arr[smaller_index]
+                swaps += 1
+        
+        # Put pivot in its correct position
+        arr[smaller_index + 1], arr[high] = arr[high], arr[smaller_index + 1]
+        
+        # Every element except the pivot is compared exactly once
+        self.metrics.comparisons += high - low
+        self.metrics.swaps += swaps + 1
+        
+        return smaller_index + 1
+    
+    def select_kth(self, arr: List[int], k: int) -> int:
+        """
+        Find the k-th smallest number (k = 0 is the minimum) in O(n)
+        
+        Args:
+            arr: Numbers to search (not modified)
+            k: Rank to find, 0 <= k < len(arr)
+            
+        Returns:
+            The value that would be at position k after sorting
+        """
+        return self.nth_element(arr, k)[k]
+    
+    def nth_element(self, arr: List[int], k: int, inplace: bool = False) -> List[int]:
+        """
+        Put the k-th smallest number at position k, smaller ones before it
+        and bigger ones after it (neither side is sorted)
+        
+        Uses quickselect on the three-way _partition, switching to
+        median-of-medians pivots if the partitions keep coming out
+        unbalanced, so the worst case stays O(n).
+        
+        Args:
+            arr: List, array.array, memoryview or NumPy array of numbers
+            k: Position to fix, 0 <= k < len(arr)
+            inplace: Rearrange arr itself instead of a copy
+            
+        Returns:
+            The rearranged numbers (arr itself when inplace is True)
+        """
+        if not 0 <= k < len(arr):
+            raise IndexError("k out of range")
+        
+        tracking = self._start_tracking()
+        
+        # Make a copy (unless asked not to) so we don't change the original
+        selected = arr if inplace else copy_buffer(arr)
+        items = self._python_items(selected)
+        self._select(items, 0, len(items) - 1, k)
+        store_values(selected, items)
+        
+        # Calculate how long it took (and how much memory we used)
+        self._stop_tracking(tracking)
+        
+        return selected
+    
+    def partial_sort(self, arr: List[int], k: int, inplace: bool = False) -> List[int]:
+        """
+        Sort only the k smallest numbers into the first k positions
+        
+        Costs O(n + k log k) instead of O(n log n) for a full sort.
+        
+        Args:
+            arr: List, array.array, memoryview or NumPy array of numbers
+            k: How many of the smallest numbers to sort (at most len(arr))
+            inplace: Rearrange arr itself instead of a copy
+            
+        Returns:
+            Numbers whose first k positions are sorted and hold the k
+            smallest values; the rest are in no particular order
+        """
+        if not 0 <= k <= len(arr):
+            raise IndexError("k out of range")
+        
+        tracking = self._start_tracking()
+        
+        # Make a copy (unless asked not to) so we don't change the original
+        sorted_arr = arr if inplace else copy_buffer(arr)
+        items = self._python_items(sorted_arr)
+        if 0 < k < len(items):
+            self._select(items, 0, len(items) - 1, k - 1)
+        self._quick_sort_helper(items, 0, k - 1, 2 * max(k, 1).bit_length())
+        store_values(sorted_arr, items)
+        
+        # Calculate how long it took (and how much memory we used)
+        self._stop_tracking(tracking)
+        
+        return sorted_arr
+    
+    def top_k(self, values: Iterable[int], k: int, largest: bool = True) -> List[int]:
+        """
+        Find the k largest (or smallest) numbers of a stream in one pass
+        
+        Only a heap of k numbers is kept, so values can be a generator,
+        file or any other iterable that is too big to hold in memory.
+        Costs O(n log k).
+        
+        Args:
+            values: Numbers to look through (read once)
+            k: How many numbers to keep
+            largest: True for the k largest, False for the k smallest
+            
+        Returns:
+            The k numbers, largest first (or smallest first)
+        """
+        if k < 0:
+            raise ValueError("k must not be negative")
+        
+        tracking = self._start_tracking()
+        
+        # Min heap of the k largest so far (max heap for the k smallest):
+        # its root is the one to throw out when something better comes along
+        heap = []
+        if k > 0:
+            for value in values:
+                if len(heap) < k:
+                    heap.append(value)
+                    if len(heap) == k:
+                        for root in range(k // 2 - 1, -1, -1):
+                            self._sift_down_bounded(heap, root, largest)
+                    continue
+                self.metrics.comparisons += 1
+                if (value > heap[0]) if largest else (value < heap[0]):
+                    heap[0] = value
+                    self.metrics.swaps += 1
+                    self._sift_down_bounded(heap, 0, largest)
+        
+        self._heap_sort(heap, 0, len(heap) - 1)
+        if largest:
+            heap.reverse()
+        
+        # Calculate how long it took (and how much memory we used)
+        self._stop_tracking(tracking)
+        
+        return heap
+    
+    def merge_iter(self, *sorted_iterables: Iterable[int]) -> Iterator[int]:
+        """
+        Lazily merge any number of sorted inputs into one sorted stream
+        
+        Only the current element of each input is held in memory, so the
+        inputs can be generators, sockets or files (for example
+        external_sort.iter_values). Equal values come out in input order.
+        The metrics are complete once the stream is exhausted or closed.
+        
+        Args:
+            sorted_iterables: Sorted inputs
+            
+        Yields:
+            All values in sorted order
+        """
+        tracking = self._start_tracking()
+        try:
+            yield from self._kway_merge(sorted_iterables)
+        finally:
+            self._stop_tracking(tracking)
+    
+    def sorted_iter(self, arr: List[int]) -> Iterator[int]:
+        """
+        Yield the numbers of arr smallest first, sorting only as needed
+        
+        Incremental quicksort: only the leftmost unsorted part is ever
+        partitioned, so the first k values cost O(n + k log n) and reading
+        everything costs the same as a full quick sort. The metrics are
+        complete once the stream is exhausted or closed.
+        
+        Args:
+            arr: Numbers to sort (not modified)
+            
+        Yields:
+            The numbers in sorted order
+        """
+        tracking = self._start_tracking()
+        try:
+            items = list(arr)
+            n = len(items)
+            # Ends of the pending parts of items, the next one on top; each
+            # part is (end, already sorted?) and starts where the last ended
+            pending = [(n, False)]
+            # Every partition adds two entries, so this allows 2 * log2(n) levels
+            depth_limit = 4 * max(n, 1).bit_length()
+            low = 0
+            
+            while pending:
+                high, done = pending[-1]
+                if low == high:
+                    pending.pop()
+                    continue
+                
+                if not done:
+                    if high - low <= self.thresholds.insertion_sort_threshold:
+                        self._insertion_sort(items, low, high - 1)
+                        done = True
+                    elif len(pending) > depth_limit:
+                        # Too many bad pivots: sort this part in one go
+                        self._heap_sort(items, low, high - 1)
+                        done = True
+                
+                if done:
+                    pending.pop()
+                    yield from items[low:high]
+                    low = high
+                    continue
+                
+                # Split the leftmost part; the equal block is already in place
+                equal_start, equal_end = self._partition(items, low, high - 1)
+                pending.append((equal_end + 1, True))
+                pending.append((equal_start, False))
+        finally:
+            self._stop_tracking(tracking)
+    
+    def _sift_down_bounded(self, heap: List[int], root: int, min_heap: bool):
+        """
+        Restore the top_k heap below root
+        
+        Args:
+            heap: Heap of at most k numbers
+            root: Heap index to start from
+            min_heap: True for a min heap, False for a max heap
+        """
+        if not min_heap:
+            self._sift_down(heap, 0, root, len(heap))
+            return
+        
+        size = len(heap)
+        comparisons = swaps = 0
+        while True:
+            child = 2 * root + 1
+            if child >= size:
+                break
+            
+            # Pick the smaller of the two children
+            if child + 1 < size:
+                comparisons += 1
+                if heap[child + 1] < heap[child]:
+                    child += 1
+            
+            comparisons += 1
+            if heap[root] <= heap[child]:
+                break
+            
+            heap[root], heap[child] = heap[child], heap[root]
+            swaps += 1
+            root = child
+        
+        self.metrics.comparisons += comparisons
+        self.metrics.swaps += swaps
+    
+    def _select(self, arr: List[int], low: int, high: int, k: int):
+        """
+        Quickselect (introselect): move the k-th smallest of arr[low..high]
+        to position k, with smaller numbers before it and bigger ones after
+        
+        Args:
+            arr: List to rearrange
+            low: Starting position
+            high: Ending position
+            k: Target position, low <= k <= high
+        """
+        # After this many partitions, use pivots that guarantee O(n)
+        depth_limit = 2 * max(high - low + 1, 1).bit_length()
+        
+        while high - low + 1 > self.thresholds.insertion_sort_threshold:
+            if depth_limit > 0:
+                depth_limit -= 1
+                pivot = None
+            else:
+                pivot = self._median_of_medians(arr, low, high)
+            
+            equal_start, equal_end = self._partition(arr, low, high, pivot)
+            
+            # Keep only the part that holds position k
+            if k < equal_start:
+                high = equal_start - 1
+            elif k > equal_end:
+                low = equal_end + 1
+            else:
+                return
+        
+        self._insertion_sort(arr, low, high)
+    
+    def _median_of_medians(self, arr: List[int], low: int, high: int) -> int:
+        """
+        Pick a pivot that is guaranteed to have at least ~30% of the
+        elements on each side (medians of groups of five, then their median)
+        
+        Args:
+            arr: List being searched
+            low: Starting position
+            high: Ending position
+            
+        Returns:
+            The pivot value
+        """
+        medians = []
+        for group_start in range(low, high + 1, 5):
+            group_end = min(group_start + 4, high)
+            self._insertion_sort(arr, group_start, group_end)
+            medians.append(arr[(group_start + group_end) // 2])
+        self._allocate_aux(len(medians))
+        
+        middle = len(medians) // 2
+        self._select(medians, 0, len(medians) - 1, middle)
+        self._release_aux(len(medians))
+        return medians[middle]
+    
+    def merge_sort(self, arr: List[int], mode: str = 'bottom_up', inplace: bool = False,
+                   vectorized: bool = None, key: Callable[[Any], Any] = None,
+                   reverse: bool = False, max_aux_bytes: int = None) -> List[int]:
+        """
+        Merge Sort algorithm with performance tracking
+        
+        Args:
+            arr: List, array.array, memoryview or NumPy array of numbers
+            mode: 'bottom_up' (default) merges back and forth between the
+                  output list and a single auxiliary buffer, with insertion
+                  sort for small runs. 'natural' finds the runs already in
+                  the input and merges those, so presorted data costs O(n)
+                  and data made of k runs costs O(n log k). 'classic' is the
+                  textbook top-down version that slices and builds new
+                  lists at every level.
+            inplace: Sort arr itself instead of a copy
+            vectorized: Use the NumPy engine (np.searchsorted merges) for
+                        typed buffers in bottom_up mode (default: when NumPy
+                        is installed). Comparisons made inside NumPy's leaf
+                        sorts aren't counted; pass False for exact counts.
+            key: Function giving the value to sort each element by; it is
+                 called exactly once per element (see _keyed_sort)
+            reverse: Sort from largest to smallest
+            max_aux_bytes: Most memory the merge buffer may take. If the
+                           input doesn't fit, any mode switches to a
+                           buffer-limited engine that merges in place with
+                           rotations where the buffer is too small
+                           (see _budgeted_merge_sort_helper). Can't be
+                           combined with key or reverse.
+            
+        Merge Sort is stable in every mode: equal elements keep their
+        original order, also with key, reverse and max_aux_bytes.
+        metrics.aux_peak_bytes reports the merge buffer memory used.
+            
+        Returns:
+            Sorted values (arr itself when inplace is True)
+        """
+        if mode not in ('bottom_up', 'natural', 'classic'):
+            raise ValueError("Invalid mode. Use 'bottom_up', 'natural' or 'classic'")
+        if max_aux_bytes is not None and (key is not None or reverse):
+            raise ValueError("max_aux_bytes can't be combined with key or reverse")
+        
+        tracking = self._start_tracking()
+        
+        # Make a copy (unless asked not to) so we don't change the original
+        sorted_arr = arr if inplace else copy_buffer(arr)
+        item_bytes = getattr(sorted_arr, 'itemsize', LIST_SLOT_BYTES)
+        
+        if max_aux_bytes is not None and max_aux_bytes // item_bytes < len(sorted_arr):
+            # Sorts the container directly: converting it would cost O(n)
+            self._budgeted_merge_sort_helper(sorted_arr, max(max_aux_bytes // item_bytes, 0))
+        elif key is not None or reverse:
+            self._keyed_sort(sorted_arr, key, reverse, vectorized,
+                             lambda items: self._merge_sort_items(items, mode))
+        else:
+            view = self._vectorized_view(sorted_arr, mode == 'bottom_up', vectorized)
+            if view is not None:
+                self._vectorized_merge_sort_helper(view)
+            else:
+                items = self._python_items(sorted_arr)
+                store_values(sorted_arr, self._merge_sort_items(items, mode))
+        self.metrics.aux_peak_bytes = self.metrics.aux_peak * item_bytes
+        
+        # Calculate how long it took (and how much memory we used)
+        self._stop_tracking(tracking)
+        
+        return sorted_arr
+    
+    def _merge_sort_items(self, items: List[int], mode: str) -> List[int]:
+        """
+        Run the pure Python Merge Sort engine for a mode on a list
+        
+        Args:
+            items: List or array.array (may be reused as a merge buffer)
+            mode: 'bottom_up', 'natural' or 'classic'
+            
+        Returns:
+            Sorted list (items itself or a new list)
+        """
+        if mode == 'bottom_up':
+            return self._merge_sort_helper(items)
+        if mode == 'natural':
+            self._natural_merge_sort_helper(items)
+            return items
+        return self._classic_merge_sort_helper(items)
+    
+    def _budgeted_merge_sort_helper(self, arr: List[int], buffer_size: int):
+        """
+        Bottom-up Merge Sort that never uses more than buffer_size extra slots
+        
+        Small runs are sorted with insertion sort, then runs of doubling
+        width are merged in place by _buffered_merge. With a buffer of at
+        least half the input this is an ordinary merge sort; smaller
+        buffers (down to none at all) fall back to rotation-based merging,
+        which costs O(n log^2 n) in the worst case but stays stable.
+        
+        Args:
+            arr: List, array.array, memoryview or NumPy array to sort in place
+            buffer_size: Most elements the merge buffer may hold
+        """
+        n = len(arr)
+        
+        # Sort small runs in place first
+        run_length = self.thresholds.insertion_sort_threshold
+        for low in range(0, n, run_length):
+            self._insertion_sort(arr, low, min(low + run_length, n) - 1)
+        
+        # No merge needs more than half the input in the buffer
+        buffer_size = min(buffer_size, n // 2)
+        buffer = array(arr.typecode, bytes(buffer_size * arr.itemsize)) \
+            if isinstance(arr, array) else [None] * buffer_size
+        self._allocate_aux(buffer_size)
+        width = run_length
+        merge_pass = 0
+        
+        while width < n:
+            self._record_level_memory(merge_pass)
+            merge_pass += 1
+            for low in range(0, n - width, 2 * width):
+                mid = low + width
+                high = min(low + 2 * width, n)
+                
+                # Already in order: nothing to merge
+                self.metrics.comparisons += 1
+                if arr[mid] < arr[mid - 1]:
+                    self._buffered_merge(arr, low, mid, high, buffer)
+            width *= 2
+        
+        self._release_aux(buffer_size)
+    
+    def _buffered_merge(self, arr: List[int], low: int, mid: int, high: int, buffer: list):
+        """
+        Stable in-place merge of arr[low:mid] and arr[mid:high] using a small buffer
+        
+        If the shorter run fits in the buffer it is copied out and merged
+        back directly. Otherwise the longer run is cut in half, the matching
+        cut in the other run is found by binary search, and the middle two
+        pieces are rotated so that two smaller, independent merges are
+        left (the SymMerge / std::inplace_merge scheme).
+        
+        Args:
+            arr: Container holding the two sorted runs
+            low: Start of the left run
+            mid: Start of the right run (end of the left run)
+            high: End of the right run
+            buffer: Scratch space (may be empty)
+        """
+        left_length = mid - low
+        right_length = high - mid
+        if left_length == 0 or right_length == 0:
+            return
+        
+        if left_length <= len(buffer) and left_length <= right_length:
+            # Copy the left run out and merge forwards
+            buffer[:left_length] = arr[low:mid]
+            i, j, k = 0, mid, low
+            comparisons = 0
+            while i < left_length and j < high:
+                comparisons += 1
+                if arr[j] < buffer[i]:
+                    arr[k] = arr[j]
+                    j += 1
+                else:
+                    arr[k] = buffer[i]
+                    i += 1
+                k += 1
+            self.metrics.comparisons += comparisons
+            # Whatever is left of the right run is already in place
+            for i in range(i, left_length):
+                arr[k] = buffer[i]
+                k += 1
+            return
+        
+        if right_length <= len(buffer):
+            # Copy the right run out and merge backwards
+            buffer[:right_length] = arr[mid:high]
+            i, j, k = right_length - 1, mid - 1, high - 1
+            comparisons = 0
+            while i >= 0 and j >= low:
+                comparisons += 1
+                if buffer[i] < arr[j]:
+                    arr[k] = arr[j]
+                    j -= 1
+                else:
+                    arr[k] = buffer[i]
+                    i -= 1
+                k -= 1
+            self.metrics.comparisons += comparisons
+            # Whatever is left of the left run is already in place
+            for i in range(i, -1, -1):
+                arr[k] = buffer[i]
+                k -= 1
+            return
+        
+        if left_length == 1 and right_length == 1:
+            self.metrics.comparisons += 1
+            if arr[mid] < arr[low]:
+                arr[low], arr[mid] = arr[mid], arr[low]
+                self.metrics.swaps += 1
+            return
+        
+        # Neither run fits: split both at matching points and rotate
+        if left_length >= right_length:
+            left_cut = low + left_length // 2
+            right_cut = self._gallop(arr[left_cut], arr, mid, high, after_equal=False)
+        else:
+            right_cut = mid + right_length // 2
+            left_cut = self._gallop(arr[right_cut], arr, low, mid, after_equal=True)
+        new_mid = self._rotate(arr, left_cut, mid, right_cut, buffer)
+        
+        self._buffered_merge(arr, low, left_cut, new_mid, buffer)
+        self._buffered_merge(arr, new_mid, right_cut, high, buffer)
+    
+    def _rotate(self, arr: List[int], first: int, middle: int, last: int, buffer: list) -> int:
+        """
+        Swap the blocks arr[first:middle] and arr[middle:last] in place
+        
+        Goes through the buffer if the shorter block fits, otherwise uses
+        three reversals.
+        
+        Args:
+            arr: Container holding the two blocks
+            first: Start of the first block
+            middle: Start of the second block
+            last: End of the second block
+            buffer: Scratch space (may be empty)
+            
+        Returns:
+            New position of the boundary between the blocks
+        """
+        left_length = middle - first
+        right_length = last - middle
+        if left_length == 0 or right_length == 0:
+            return first + right_length
+        
+        if right_length <= len(buffer) and right_length <= left_length:
+            buffer[:right_length] = arr[middle:last]
+            for k in range(middle - 1, first - 1, -1):
+                arr[k + right_length] = arr[k]
+            for k in range(right_length):
+                arr[first + k] = buffer[k]
+        elif left_length <= len(buffer):
+            buffer[:left_length] = arr[first:middle]
+            for k in range(middle, last):
+                arr[k - left_length] = arr[k]
+            for k in range(left_length):
+                arr[last - left_length + k] = buffer[k]
+        else:
+            self._reverse(arr, first, middle - 1)
+            self._reverse(arr, middle, last - 1)
+            self._reverse(arr, first, last - 1)
+        return first + right_length
+    
+    def _keyed_sort(self, arr, key: Callable[[Any], Any], reverse: bool, vectorized: bool,
+                    sort_items: Callable[[list], list]):
+        """
+        Sort arr in place by key(element) with decorate-sort-undecorate
+        
+        Keys are computed once per element into one list. Instead of moving
+        the elements around while sorting, an index permutation is sorted
+        and applied to arr once at the end:
+        - Numeric keys with NumPy installed are put in a contiguous array
+          and ordered with a stable np.argsort (unless vectorized is False;
+          comparisons inside NumPy aren't counted)
+        - Otherwise (key, index) pairs are sorted with the given engine.
+          The index breaks ties, which makes any engine stable and means
+          elements themselves are never compared.
+        
+        Args:
+            arr: Container to sort in place
+            key: Key function, or None to sort by the elements themselves
+            reverse: Sort from largest to smallest (still stable)
+            vectorized: The caller's choice for the NumPy path (None means automatic)
+            sort_items: Engine that sorts a list of pairs and returns it
+        """
+        items = self._python_items(arr)
+        n = len(items)
+        if key is None:
+            keys = items
+        else:
+            keys = [key(item) for item in items]
+            self.metrics.key_evaluations += n
+        
+        order = None
+        if vectorized is not False:
+            order = self._argsort_keys(keys, reverse)
+            if order is None and vectorized:
+                raise ValueError("vectorized=True needs NumPy and numeric keys")
+        
+        if order is None:
+            self._allocate_aux(n)
+            if reverse:
+                # Sorting by (key, -index) and reading the result backwards
+                # gives descending keys with ties still in original order
+                pairs = sort_items([(keys[i], -i) for i in range(n)])
+                order = [-index for _, index in reversed(pairs)]
+            else:
+                pairs = sort_items([(keys[i], i) for i in range(n)])
+                order = [index for _, index in pairs]
+            self._release_aux(n)
+        
+        # Apply the permutation in one pass
+        store_values(arr, [items[i] for i in order])
+        self.metrics.moves += n
+    
+    def _argsort_keys(self, keys: list, reverse: bool):
+        """
+        Stable NumPy argsort of numeric keys
+        
+        Args:
+            keys: Key for every element
+            reverse: Order from largest to smallest key
+            
+        Returns:
+            Index permutation as a NumPy array, or None when NumPy isn't
+            installed or can't hold the keys exactly
+        """
+        if np is None:
+            return None
+        try:
+            key_array = np.asarray(keys)
+        except (TypeError, ValueError):
+            return None
+        if key_array.ndim != 1 or key_array.dtype.kind not in 'biuf':
+            return None
+        if key_array.dtype.kind == 'f' and not all(isinstance(key, (float, np.floating))
+                                                   for key in keys):
+            # Ints mixed with floats (or too big for int64) were rounded to
+            # float64, which can make distinct keys equal
+            return None
+        if not reverse:
+            return np.argsort(key_array, kind='stable')
+        # Stable sort of the reversed keys, read backwards, keeps equal
+        # keys in their original order
+        n = len(key_array)
+        return (n - 1 - np.argsort(key_array[::-1], kind='stable'))[::-1]
+    
+    def _merge_sort_helper(self, arr: List[int]) -> List[int]:
+        """
+        Helper function that does the actual (bottom-up) Merge Sort work
+        
+        Small runs are sorted with insertion sort, then runs of doubling
+        width are merged from one list into the other, swapping the roles
+        of the two lists after every pass.
+        
+        Args:
+            arr: List to sort (it is used as one of the two merge buffers)
+            
+        Returns:
+            Sorted list (either arr or the auxiliary buffer)
+        """
+        n = len(arr)
+        
+        # Sort small runs in place first
+        run_length = self.thresholds.insertion_sort_threshold
+        for low in range(0, n, run_length):
+            self._insertion_sort(arr, low, min(low + run_length, n) - 1)
+        
+        if n <= run_length:
+            return arr
+        
+        # The only extra memory: one buffer the same size as the input
+        source = arr
+        target = array(arr.typecode, arr) if isinstance(arr, array) else [None] * n
+        self._allocate_aux(n)
+        width = run_length
+        merge_pass = 0
+        
+        while width < n:
+            self._record_level_memory(merge_pass)
+            merge_pass += 1
+            for low in range(0, n, 2 * width):
+                mid = min(low + width, n)
+                high = min(low + 2 * width, n)
+                
+                if mid >= high:
+                    # No right half in this pass, just carry the run over
+                    target[low:high] = source[low:high]
+                    continue
+                
+                # Already in order: the two halves can be copied as they are
+                self.metrics.comparisons += 1
+                if source[mid - 1] <= source[mid]:
+                    target[low:high] = source[low:high]
+                else:
+                    self._merge_runs(source, target, low, mid, high)
+            
+            source, target = target, source
+            width *= 2
+        
+        self._release_aux(n)
+        return source
+    
+    def _merge_runs(self, source: List[int], target: List[int], low: int, mid: int, high: int):
+        """
+        Merge source[low:mid] and source[mid:high] into target[low:high]
+        
+        Args:
+            source: List holding the two sorted runs
+            target: List to write the merged run into
+            low: Start of the left run
+            mid: Start of the right run (end of the left run)
+            high: End of the right run
+        """
+        if self.metrics_level == 'none':
+            self._merge_runs_uncounted(source, target, low, mid, high)
+            return
+        
+        i = low
+        j = mid
+        k = low
+        
+        # Compare elements from both runs and write them in sorted order
+        while i < mid and j < high:
+            if source[i] <= source[j]:
+                target[k] = source[i]
+                i += 1
+            else:
+                target[k] = source[j]
+                j += 1
+            k += 1
+        
+        # One comparison was made for every element written so far
+        self.metrics.comparisons += k - low
+        
+        # Copy whatever is left of the run that didn't run out
+        if i < mid:
+            target[k:high] = source[i:mid]
+        else:
+            target[k:high] = source[j:high]
+    
+    def _merge_runs_uncounted(self, source: List[int], target: List[int],
+                              low: int, mid: int, high: int):
+        """Same as _merge_runs, without any counting (metrics level 'none')"""
+        if low == mid or mid == high:
+            target[low:high] = source[low:high]
+            return
+        
+        i = low
+        j = mid
+        k = low
+        left_value = source[i]
+        right_value = source[j]
+        
+        while True:
+            if left_value <= right_value:
+                target[k] = left_value
+                k += 1
+                i += 1
+                if i == mid:
+                    target[k:high] = source[j:high]
+                    return
+                left_value = source[i]
+            else:
+                target[k] = right_value
+                k += 1
+                j += 1
+                if j == high:
+                    target[k:high] = source[i:mid]
+                    return
+                right_value = source[j]
+    
+    def _natural_merge_sort_helper(self, arr: List[int]):
+        """
+        Helper function that does the natural (run-adaptive) Merge Sort work
+        
+        Existing ascending runs are used as they are, strictly descending
+        runs are reversed, and short runs are extended with insertion sort.
+        Runs are kept on a stack whose lengths grow roughly like Fibonacci
+        numbers, so every element takes part in O(log k) merges.
+        
+        Args:
+            arr: List to sort in place
+        """
+        n = len(arr)
+        if n < 2:
+            return
+        
+        min_run = self._compute_min_run(n)
+        runs = []  # (start, length) of the runs waiting to be merged
+        low = 0
+        
+        while low < n:
+            run_end = self._count_run(arr, low, n)
+            
+            # Make short runs at least min_run long
+            if run_end - low < min_run:
+                run_end = min(low + min_run, n)
+                self._insertion_sort(arr, low, run_end - 1)
+            
+            runs.append((low, run_end - low))
+            self._merge_collapse(arr, runs)
+            low = run_end
+        
+        # Merge everything that is left on the stack
+        while len(runs) > 1:
+            top = len(runs) - 2
+            if top > 0 and runs[top - 1][1] < runs[top + 1][1]:
+                top -= 1
+            self._merge_at(arr, runs, top)
+    
+    def _compute_min_run(self, n: int) -> int:
+        """
+        Pick a minimum run length between thresholds.min_merge / 2 and thresholds.min_merge
+        
+        The result makes n / min_run a power of two (or just under one),
+        which keeps the final merges balanced.
+        
+        Args:
+            n: Number of elements being sorted
+            
+        Returns:
+            Minimum run length
+        """
+        extra_bit = 0
+        while n >= self.thresholds.min_merge:
+            extra_bit |= n & 1
+            n >>= 1
+        return n + extra_bit
+    
+    def _count_run(self, arr: List[int], low: int, high: int) -> int:
+        """
+        Find the run starting at low, reversing it if it is descending
+        
+        Args:
+            arr: List being sorted
+            low: Start of the run
+            high: End of the list (exclusive)
+            
+        Returns:
+            End position (exclusive) of the run
+        """
+        run_end = low + 1
+        if run_end == high:
+            return high
+        
+        if arr[run_end] < arr[low]:
+            # Strictly descending (so reversing it keeps the sort stable)
+            run_end += 1
+            while run_end < high and arr[run_end] < arr[run_end - 1]:
+                run_end += 1
+            self._reverse(arr, low, run_end - 1)
+        else:
+            # Ascending (equal neighbours are allowed)
+            run_end += 1
+            while run_end < high and not arr[run_end] < arr[run_end - 1]:
+                run_end += 1
+        
+        # One comparison per neighbour pair checked, plus the failed one
+        self.metrics.comparisons += run_end - low - (1 if run_end == high else 0)
+        return run_end
+    
+    def _reverse(self, arr: List[int], low: int, high: int):
+        """Reverse arr[low..high] in place"""
+        self.metrics.swaps += (high - low + 1) // 2
+        while low < high:
+            arr[low], arr[high] = arr[high], arr[low]
+            low += 1
+            high -= 1
     
-    def quick_sort(self, arr: List[int]) -> List[int]:
+    def _merge_collapse(self, arr: List[int], runs: List[Tuple[int, int]]):
         """
-        Quick Sort algorithm with performance tracking
+        Merge runs on the stack until the run length invariants hold again
+        
+        For the top runs X, Y, Z (Z on top) the invariants are
+        len(X) > len(Y) + len(Z) and len(Y) > len(Z), checked one level
+        deeper as well so they hold for the whole stack.
         
         Args:
-            arr: List of numbers to sort
-            
-        Returns:
-            Sorted list of numbers
+            arr: List being sorted
+            runs: Stack of (start, length) runs
         """
-        self.metrics.reset()
-        start_time = time.perf_counter()
+        while len(runs) > 1:
+            top = len(runs) - 2
+            if ((top > 0 and runs[top - 1][1] <= runs[top][1] + runs[top + 1][1]) or
+                    (top > 1 and runs[top - 2][1] <= runs[top - 1][1] + runs[top][1])):
+                if runs[top - 1][1] < runs[top + 1][1]:
+                    top -= 1
+            elif runs[top][1] > runs[top + 1][1]:
+                break
+            self._merge_at(arr, runs, top)
+    
+    def _merge_at(self, arr: List[int], runs: List[Tuple[int, int]], index: int):
+        """
+        Merge the runs at positions index and index + 1 of the run stack
         
-        # Make a copy so we don't change the original list
-        sorted_arr = arr.copy()
+        Args:
+            arr: List being sorted
+            runs: Stack of (start, length) runs
+            index: Stack position of the left run
+        """
+        low, left_length = runs[index]
+        mid, right_length = runs[index + 1]
+        high = mid + right_length
+        runs[index] = (low, left_length + right_length)
+        del runs[index + 1]
         
-        # Check how much memory we're using at the start
-        process = psutil.Process(os.getpid())
-        memory_at_start = process.memory_info().rss
+        # Left elements <= the first right element are already in place
+        low = self._gallop(arr[mid], arr, low, mid, True)
+        if low == mid:
+            return
         
-        self._quick_sort_helper(sorted_arr, 0, len(sorted_arr) - 1)
+        # Right elements >= the last left element are already in place
+        high = self._gallop(arr[mid - 1], arr, mid, high, False)
         
-        # Calculate how long it took and how much memory we used
-        self.metrics.execution_time = time.perf_counter() - start_time
-        memory_at_end = process.memory_info().rss
-        self.metrics.memory_usage = memory_at_end - memory_at_start
+        self._gallop_merge(arr, low, mid, high)
+    
+    def _gallop(self, key: int, arr: List[int], low: int, high: int, after_equal: bool) -> int:
+        """
+        Find where key belongs in sorted arr[low:high] by exponential search
         
-        return sorted_arr
+        Probes low, low + 1, low + 3, low + 7, ... and then binary searches
+        the last gap, so finding position low + k costs O(log k) comparisons.
+        
+        Args:
+            key: Value to place
+            arr: List holding the sorted range
+            low: Start of the range
+            high: End of the range (exclusive)
+            after_equal: True to return the position after any elements
+                         equal to key, False for the position before them
+            
+        Returns:
+            Insertion position for key
+        """
+        # Exponential search for a gap [lower, upper) that holds the answer
+        lower = low
+        upper = high
+        offset = 0
+        step = 1
+        comparisons = 0
+        while low + offset < high:
+            comparisons += 1
+            value = arr[low + offset]
+            if value <= key if after_equal else value < key:
+                lower = low + offset + 1
+                offset += step
+                step *= 2
+            else:
+                upper = low + offset
+                break
+        
+        # Binary search inside the gap
+        while lower < upper:
+            middle = (lower + upper) // 2
+            comparisons += 1
+            value = arr[middle]
+            if value <= key if after_equal else value < key:
+                lower = middle + 1
+            else:
+                upper = middle
+        
+        self.metrics.comparisons += comparisons
+        return lower
     
-    def _quick_sort_helper(self, arr: List[int], low: int, high: int):
+    def _gallop_merge(self, arr: List[int], low: int, mid: int, high: int):
         """
-        Helper function that does the actual Quick Sort work
+        Merge arr[low:mid] and arr[mid:high] in place using galloping
+        
+        The left run is copied to a temporary list and merged forward into
+        arr. When one run keeps winning, whole blocks are found with
+        _gallop and copied at once instead of one comparison per element.
         
         Args:
-            arr: List to sort
-            low: Starting position
-            high: Ending position
+            arr: List holding both sorted runs
+            low: Start of the left run
+            mid: Start of the right run
+            high: End of the right run (exclusive)
         """
-        if low < high:
-            # Split the array and get the position of the pivot
-            pivot_position = self._partition(arr, low, high)
+        left = arr[low:mid]
+        left_length = len(left)
+        self._allocate_aux(left_length)
+        i = 0
+        j = mid
+        k = low
+        left_wins = right_wins = 0
+        comparisons = 0
+        
+        while i < left_length and j < high:
+            comparisons += 1
+            if arr[j] < left[i]:
+                arr[k] = arr[j]
+                j += 1
+                right_wins += 1
+                left_wins = 0
+            else:
+                arr[k] = left[i]
+                i += 1
+                left_wins += 1
+                right_wins = 0
+            k += 1
             
-            # Sort the left and right parts separately
-            self._quick_sort_helper(arr, low, pivot_position - 1)
-            self._quick_sort_helper(arr, pivot_position + 1, high)
+            if left_wins < MIN_GALLOP and right_wins < MIN_GALLOP:
+                continue
+            
+            # Galloping mode: copy blocks until they get short again
+            while i < left_length and j < high:
+                block_end = self._gallop(arr[j], left, i, left_length, True)
+                left_block = block_end - i
+                arr[k:k + left_block] = left[i:block_end]
+                k += left_block
+                i = block_end
+                if i == left_length:
+                    break
+                arr[k] = arr[j]
+                j += 1
+                k += 1
+                if j == high:
+                    break
+                
+                block_end = self._gallop(left[i], arr, j, high, False)
+                right_block = block_end - j
+                arr[k:k + right_block] = arr[j:block_end]
+                k += right_block
+                j = block_end
+                if j == high:
+                    break
+                arr[k] = left[i]
+                i += 1
+                k += 1
+                
+                if left_block < MIN_GALLOP and right_block < MIN_GALLOP:
+                    break
+            left_wins = right_wins = 0
+        
+        self.metrics.comparisons += comparisons
+        
+        # Whatever is left of the right run is already in place
+        if i < left_length:
+            arr[k:high] = left[i:]
+        self._release_aux(left_length)
     
-    def _partition(self, arr: List[int], low: int, high: int) -> int:
+    def _vectorized_view(self, arr, default_mode: bool, vectorized: bool):
         """
-        Split the array around a pivot (chosen as the last element)
+        Decide whether to use a NumPy engine, and get the NumPy view if so
         
         Args:
-            arr: List to split
-            low: Starting position
-            high: Ending position
+            arr: Container being sorted
+            default_mode: True if the requested mode has a NumPy engine
+            vectorized: The caller's choice (None means automatic)
             
         Returns:
-            Position where the pivot ends up
+            A NumPy array sharing arr's memory, or None for the Python engines
         """
-        # Choose the last element as our pivot
-        pivot = arr[high]
+        if vectorized is False or not default_mode:
+            return None
+        view = as_numpy_view(arr)
+        if view is None and vectorized:
+            raise ValueError("vectorized=True needs NumPy and a 1-D numeric buffer")
+        return view
+    
+    def _python_items(self, arr):
+        """
+        Get something the pure Python engines can index and slice quickly
         
-        # Keep track of where smaller elements should go
-        smaller_index = low - 1
+        Lists and array.array are used directly. NumPy arrays and
+        memoryviews are converted to a list (their element access is slow,
+        and their slices are views rather than copies).
+        """
+        if isinstance(arr, (list, array)):
+            return arr
+        return arr.tolist()
+    
+    def _vectorized_quick_sort_helper(self, view):
+        """
+        Introsort on a NumPy array with vectorized three-way partitioning
         
-        for j in range(low, high):
-            self.metrics.comparisons += 1
-            # If current number is smaller than or equal to pivot
-            if arr[j] <= pivot:
-                smaller_index += 1
-                arr[smaller_index], arr[j] = arr[j], arr[smaller_index]
-                self.metrics.swaps += 1
+        Big blocks are partitioned with boolean masks (two comparisons per
+        element, counted in bulk); blocks of thresholds.vector_leaf_size or
+        fewer are sorted by NumPy directly. An explicit stack of the bigger sides
+        keeps the bookkeeping O(log n).
         
-        # Put pivot in its correct position
-        arr[smaller_index + 1], arr[high] = arr[high], arr[smaller_index + 1]
-        self.metrics.swaps += 1
+        Args:
+            view: 1-D NumPy array to sort in place
+        """
+        view = self._move_nans_last(view)
+        n = len(view)
+        pending = [(0, n, 2 * max(n, 1).bit_length())]
         
-        return smaller_index + 1
+        while pending:
+            low, high, depth_limit = pending.pop()
+            while high - low > self.thresholds.vector_leaf_size:
+                block = view[low:high]
+                if depth_limit == 0:
+                    block.sort(kind='heapsort')
+                    break
+                depth_limit -= 1
+                
+                less, greater = self._vectorized_partition(block)
+                equal_start = low + less
+                equal_end = high - greater
+                
+                # Save the bigger side for later, keep going with the smaller
+                if equal_start - low < high - equal_end:
+                    pending.append((equal_end, high, depth_limit))
+                    high = equal_start
+                else:
+                    pending.append((low, equal_start, depth_limit))
+                    low = equal_end
+            else:
+                view[low:high].sort()
     
-    def merge_sort(self, arr: List[int]) -> List[int]:
+    def _move_nans_last(self, view):
         """
-        Merge Sort algorithm with performance tracking
+        Move the NaNs of a float NumPy array to its end
+        
+        NaN is neither less nor greater than any pivot, so the vectorized
+        partitions would lose track of it; ndarray.sort puts NaNs last too.
         
         Args:
-            arr: List of numbers to sort
+            view: 1-D NumPy array, changed in place
             
         Returns:
-            Sorted list of numbers
+            The part of view before the NaNs (all of it for other dtypes)
         """
-        self.metrics.reset()
-        start_time = time.perf_counter()
+        if view.dtype.kind not in 'fc':
+            return view
+        nan_mask = np.isnan(view)
+        nan_count = int(np.count_nonzero(nan_mask))
+        if not nan_count:
+            return view
+        n = len(view)
+        nans = view[nan_mask]
+        view[:n - nan_count] = view[~nan_mask]
+        view[n - nan_count:] = nans
+        return view[:n - nan_count]
+    
+    def _vectorized_partition(self, block) -> Tuple[int, int]:
+        """
+        Three-way partition a NumPy block in place with boolean masks
+        
+        Args:
+            block: 1-D NumPy array without NaNs
+            
+        Returns:
+            (number of values < pivot, number of values > pivot); the
+            values equal to the pivot are between the two groups
+        """
+        pivot = self._choose_pivot(block, 0, len(block) - 1)
+        less_mask = block < pivot
+        greater_mask = block > pivot
+        less = block[less_mask]
+        greater = block[greater_mask]
+        # The actual elements, not copies of the pivot (e.g. -0.0 and 0.0)
+        equal = block[~(less_mask | greater_mask)]
+        self.metrics.comparisons += 2 * len(block)
+        self._allocate_aux(len(block))
         
-        # Check how much memory we're using at the start
-        process = psutil.Process(os.getpid())
-        memory_at_start = process.memory_info().rss
+        block[:len(less)] = less
+        block[len(less):len(block) - len(greater)] = equal
+        block[len(block) - len(greater):] = greater
+        self._release_aux(len(block))
+        return len(less), len(greater)
+    
+    def _vectorized_merge_sort_helper(self, view):
+        """
+        Bottom-up Merge Sort on a NumPy array using np.searchsorted merges
         
-        sorted_arr = self._merge_sort_helper(arr)
+        Args:
+            view: 1-D NumPy array to sort in place
+        """
+        n = len(view)
+        leaf_size = self.thresholds.vector_leaf_size
+        for low in range(0, n, leaf_size):
+            view[low:low + leaf_size].sort(kind='stable')
         
-        # Calculate how long it took and how much memory we used
-        self.metrics.execution_time = time.perf_counter() - start_time
-        memory_at_end = process.memory_info().rss
-        self.metrics.memory_usage = memory_at_end - memory_at_start
+        # One auxiliary buffer, swapping roles with the input after every pass
+        source = view
+        target = np.empty_like(view)
+        self._allocate_aux(n)
+        width = leaf_size
+        merge_pass = 0
         
-        return sorted_arr
+        while width < n:
+            self._record_level_memory(merge_pass)
+            merge_pass += 1
+            for low in range(0, n, 2 * width):
+                mid = min(low + width, n)
+                high = min(low + 2 * width, n)
+                
+                if mid >= high:
+                    # No right half in this pass, just carry the run over
+                    target[low:high] = source[low:high]
+                    continue
+                
+                # Already in order: the two halves can be copied as they are
+                self.metrics.comparisons += 1
+                if source[mid - 1] <= source[mid]:
+                    target[low:high] = source[low:high]
+                else:
+                    self._searchsorted_merge(source[low:mid], source[mid:high], target[low:high])
+            
+            source, target = target, source
+            width *= 2
+        
+        if source is not view:
+            view[:] = source
+        self._release_aux(n)
     
-    def _merge_sort_helper(self, arr: List[int]) -> List[int]:
+    def _searchsorted_merge(self, left, right, out):
+        """
+        Merge two sorted NumPy arrays into out without a Python loop
+        
+        Each element's final position is its own index plus the number of
+        elements from the other run that go before it. Equal values from
+        left go first, so the merge is stable.
+        
+        Args:
+            left: Sorted left run
+            right: Sorted right run
+            out: Array of len(left) + len(right) to write the result to
         """
-        Helper function that does the actual Merge Sort work
+        # The two position arrays are the only temporary buffers
+        self._allocate_aux(len(left) + len(right))
+        left_positions = np.arange(len(left)) + np.searchsorted(right, left, side='left')
+        right_positions = np.arange(len(right)) + np.searchsorted(left, right, side='right')
+        out[left_positions] = left
+        out[right_positions] = right
+        self._release_aux(len(left) + len(right))
+        
+        # Each binary search costs about log2 of the other run's length
+        self.metrics.comparisons += (len(left) * len(right).bit_length() +
+                                     len(right) * len(left).bit_length())
+    
+    def _classic_merge_sort_helper(self, arr: List[int], depth: int = 0) -> List[int]:
+        """
+        Textbook top-down Merge Sort recursion
         
         Args:
             arr: List to sort
+            depth: Recursion depth of this call
             
         Returns:
             Sorted list
         """
+        self._record_level_memory(depth)
+        
         # Base case: array with one or zero elements is already sorted
         if len(arr) <= 1:
             return arr
@@ -137,13 +2358,22 @@ class SortingAlgorithms:
         mid = len(arr) // 2
         left_half = arr[:mid]
         right_half = arr[mid:]
+        self._allocate_aux(len(arr))
         
         # Sort both halves separately
-        left_sorted = self._merge_sort_helper(left_half)
-        right_sorted = self._merge_sort_helper(right_half)
+        left_sorted = self._classic_merge_sort_helper(left_half, depth + 1)
+        right_sorted = self._classic_merge_sort_helper(right_half, depth + 1)
         
         # Combine the sorted halves
-        return self._merge(left_sorted, right_sorted)
+        merged = self._merge(left_sorted, right_sorted)
+        
+        # The halves (and the lists the recursive calls merged into) are garbage now
+        self._release_aux(len(arr))
+        if left_sorted is not left_half:
+            self._release_aux(len(left_sorted))
+        if right_sorted is not right_half:
+            self._release_aux(len(right_sorted))
+        return merged
     
     def _merge(self, left: List[int], right: List[int]) -> List[int]:
         """
@@ -157,11 +2387,11 @@ class SortingAlgorithms:
             Combined sorted array
         """
         merged = []
+        self._allocate_aux(len(left) + len(right))
         i = j = 0
         
         # Compare elements from both arrays and merge in sorted order
         while i < len(left) and j < len(right):
-            self.metrics.comparisons += 1
             if left[i] <= right[j]:
                 merged.append(left[i])
                 i += 1
@@ -169,6 +2399,10 @@ class SortingAlgorithms:
                 merged.append(right[j])
                 j += 1
         
+        # One comparison was made for every element merged so far
+        if self.metrics_level != 'none':
+            self.metrics.comparisons += i + j
+        
         # Add remaining elements from left array
         while i < len(left):
             merged.append(left[i])
@@ -181,6 +2415,621 @@ class SortingAlgorithms:
         
         return merged
     
+    def counting_sort(self, arr: List[int], inplace: bool = False) -> List[int]:
+        """
+        Counting Sort for integers with a small value range
+        
+        Counts how often each value occurs and writes the values back in
+        order, so it costs O(n + range) and makes no comparisons. Progress
+        is reported as metrics.passes (passes over the data) and
+        metrics.moves (elements written).
+        
+        Args:
+            arr: List, array.array, memoryview or NumPy array of integers
+            inplace: Sort arr itself instead of a copy
+            
+        Returns:
+            Sorted numbers (arr itself when inplace is True)
+            
+        Raises:
+            ValueError: max(arr) - min(arr) + 1 is over COUNTING_SORT_MAX_RANGE
+            TypeError: arr holds numbers that aren't integers
+        """
+        tracking = self._start_tracking()
+        try:
+            # Make a copy (unless asked not to) so we don't change the original
+            sorted_arr = arr if inplace else copy_buffer(arr)
+            
+            view = self._integer_view(sorted_arr)
+            if view is not None:
+                self._vectorized_counting_sort_helper(view)
+            else:
+                items = self._python_items(sorted_arr)
+                self._counting_sort_helper(items)
+                store_values(sorted_arr, items)
+        finally:
+            # Also on errors, so tracemalloc doesn't stay switched on
+            self._stop_tracking(tracking)
+        return sorted_arr
+    
+    def radix_sort(self, arr: List[int], inplace: bool = False) -> List[int]:
+        """
+        LSD Radix Sort for integers of any size, negative numbers included
+        
+        Values are shifted by the minimum so every key is non-negative,
+        then sorted one byte at a time from the lowest byte up with a
+        stable histogram-and-scatter pass. Only as many bytes as
+        max - min needs are processed, and bytes where every key has the
+        same digit are skipped. Progress is reported as metrics.passes
+        and metrics.moves instead of comparisons.
+        
+        Args:
+            arr: List, array.array, memoryview or NumPy array of integers
+            inplace: Sort arr itself instead of a copy
+            
+        Returns:
+            Sorted numbers (arr itself when inplace is True)
+            
+        Raises:
+            TypeError: arr holds numbers that aren't integers
+        """
+        tracking = self._start_tracking()
+        try:
+            # Make a copy (unless asked not to) so we don't change the original
+            sorted_arr = arr if inplace else copy_buffer(arr)
+            
+            view = self._integer_view(sorted_arr)
+            if view is not None:
+                self._vectorized_radix_sort_helper(view)
+            else:
+                items = self._python_items(sorted_arr)
+                store_values(sorted_arr, self._radix_sort_helper(items))
+        finally:
+            # Also on errors, so tracemalloc doesn't stay switched on
+            self._stop_tracking(tracking)
+        return sorted_arr
+    
+    def _integer_view(self, arr):
+        """
+        Get a NumPy view for the vectorized integer engines
+        
+        Args:
+            arr: Container being sorted
+            
+        Returns:
+            A NumPy integer array sharing arr's memory, or None for the
+            Python engines
+            
+        Raises:
+            TypeError: arr is a floating point buffer
+        """
+        view = as_numpy_view(arr)
+        if view is not None and view.dtype.kind == 'f':
+            raise TypeError("counting and radix sort need integer values")
+        return view
+    
+    def _counting_sort_helper(self, arr: List[int]):
+        """
+        Counting Sort on a list or array.array, in place
+        
+        Args:
+            arr: Integers to sort
+        """
+        n = len(arr)
+        if n < 2:
+            return
+        low = min(arr)
+        value_range = max(arr) - low + 1
+        if value_range > COUNTING_SORT_MAX_RANGE:
+            raise ValueError(f"value range {value_range} is too large for counting sort, "
+                             f"use radix_sort")
+        
+        # Histogram pass (a non-integer value fails here, before any writes)
+        counts = [0] * value_range
+        self._allocate_aux(value_range)
+        for value in arr:
+            counts[value - low] += 1
+        
+        # Write each value back as many times as it was seen
+        position = 0
+        for offset, count in enumerate(counts):
+            if count:
+                run = [low + offset] * count
+                arr[position:position + count] = run if isinstance(arr, list) else array(arr.typecode, run)
+                position += count
+        self._release_aux(value_range)
+        
+        # Min/max scan, histogram and write back
+        self.metrics.passes += 3
+        self.metrics.moves += n
+    
+    def _radix_sort_helper(self, arr: List[int]) -> List[int]:
+        """
+        LSD Radix Sort on a list or array.array
+        
+        Args:
+            arr: Integers to sort
+            
+        Returns:
+            Whichever of arr and the auxiliary buffer holds the sorted values
+        """
+        n = len(arr)
+        if n < 2:
+            return arr
+        low = min(arr)
+        span = max(arr) - low
+        self.metrics.passes += 1
+        
+        # One auxiliary buffer, swapping roles with the input after every pass
+        source = arr
+        target = array(arr.typecode, arr) if isinstance(arr, array) else [0] * n
+        self._allocate_aux(n)
+        
+        shift = 0
+        while span >> shift:
+            # Histogram of this byte (a non-integer value fails here)
+            counts = [0] * (RADIX_MASK + 1)
+            for value in source:
+                counts[(value - low) >> shift & RADIX_MASK] += 1
+            self.metrics.passes += 1
+            
+            if max(counts) < n:
+                # Turn the counts into the first output slot of each digit
+                total = 0
+                for digit, count in enumerate(counts):
+                    counts[digit] = total
+                    total += count
+                
+                # Stable scatter into the other buffer
+                for value in source:
+                    digit = (value - low) >> shift & RADIX_MASK
+                    target[counts[digit]] = value
+                    counts[digit] += 1
+                self.metrics.passes += 1
+                self.metrics.moves += n
+                source, target = target, source
+            shift += RADIX_BITS
+        
+        self._release_aux(n)
+        return source
+    
+    def _vectorized_counting_sort_helper(self, view):
+        """
+        Counting Sort on a NumPy integer array with np.bincount
+        
+        Args:
+            view: 1-D NumPy integer array to sort in place
+        """
+        n = len(view)
+        if n < 2:
+            return
+        # Unsigned arithmetic wraps, so value - min is exact for any dtype
+        unsigned = view.view(np.dtype(f'u{view.itemsize}'))
+        low = unsigned[view.argmin()]
+        offsets = unsigned - low
+        value_range = int(offsets.max()) + 1
+        if value_range > COUNTING_SORT_MAX_RANGE:
+            raise ValueError(f"value range {value_range} is too large for counting sort, "
+                             f"use radix_sort")
+        
+        counts = np.bincount(offsets, minlength=value_range)
+        self._allocate_aux(value_range)
+        values = np.arange(value_range, dtype=unsigned.dtype) + low
+        unsigned[:] = np.repeat(values, counts)
+        self._release_aux(value_range)
+        
+        self.metrics.passes += 3
+        self.metrics.moves += n
+    
+    def _vectorized_radix_sort_helper(self, view):
+        """
+        LSD Radix Sort on a NumPy integer array
+        
+        Each pass takes a byte of every key at once, histograms it with
+        np.bincount and scatters with a stable argsort of the byte (which
+        NumPy itself does as a counting sort for 8-bit keys).
+        
+        Args:
+            view: 1-D NumPy integer array to sort in place
+        """
+        n = len(view)
+        if n < 2:
+            return
+        unsigned_type = np.dtype(f'u{view.itemsize}')
+        keys = view.view(unsigned_type).copy()
+        self._allocate_aux(n)
+        if view.dtype.kind == 'i':
+            # Flipping the sign bit makes unsigned order match signed order
+            sign_bit = unsigned_type.type(1 << (8 * view.itemsize - 1))
+            keys ^= sign_bit
+        low = keys.min()
+        keys -= low
+        span = int(keys.max())
+        self.metrics.passes += 2
+        
+        shift = 0
+        while span >> shift:
+            digits = (keys >> unsigned_type.type(shift)).astype(np.uint8)
+            counts = np.bincount(digits, minlength=RADIX_MASK + 1)
+            self.metrics.passes += 1
+            if counts.max() < n:
+                keys = keys[np.argsort(digits, kind='stable')]
+                self.metrics.passes += 1
+                self.metrics.moves += n
+            shift += RADIX_BITS
+        
+        keys += low
+        if view.dtype.kind == 'i':
+            keys ^= sign_bit
+        view[:] = keys.view(view.dtype)
+        self._release_aux(n)
+    
+    def string_sort(self, arr: List[str], inplace: bool = False) -> List[str]:
+        """
+        Multikey Quick Sort (Bentley-Sedgewick) for str or bytes keys
+        
+        Partitions on one character position at a time into less, equal
+        and greater parts; only the equal part moves on to the next
+        position. A shared prefix is therefore read once per element
+        instead of once per comparison, which is what makes URLs and IDs
+        with long common prefixes expensive for the comparison sorts.
+        Ranges of thresholds.insertion_sort_threshold or fewer are finished with
+        insertion sort.
+        
+        metrics.char_inspections counts characters read while
+        partitioning; metrics.comparisons counts the pivot choices and the
+        whole-key comparisons made by insertion sort.
+        
+        Args:
+            arr: List of str (or list of bytes)
+            inplace: Sort arr itself instead of a copy
+            
+        Returns:
+            Sorted strings (arr itself when inplace is True)
+        """
+        tracking = self._start_tracking()
+        
+        # Make a copy (unless asked not to) so we don't change the original
+        sorted_arr = arr if inplace else copy_buffer(arr)
+        self._multikey_quick_sort_helper(sorted_arr)
+        
+        self._stop_tracking(tracking)
+        return sorted_arr
+    
+    def _multikey_quick_sort_helper(self, arr: List[str]):
+        """
+        Helper function that does the actual Multikey Quick Sort work
+        
+        The character at position d of s is s[d:d + 1], which is empty once
+        s is shorter than d + 1 and so sorts before every real character.
+        While partitioning, the prefix shared by the strings in the equal
+        band is tracked (one startswith check each, counted as a
+        comparison), so that band skips the whole prefix instead of moving
+        on one character. An explicit stack of (low, high, d) keeps long
+        keys from hitting Python's recursion limit.
+        
+        Args:
+            arr: List of str or bytes to sort in place
+        """
+        inspections = swaps = comparisons = 0
+        pending = [(0, len(arr) - 1, 0)]
+        
+        while pending:
+            low, high, d = pending.pop()
+            if high - low < self.thresholds.insertion_sort_threshold:
+                self._insertion_sort(arr, low, high)
+                continue
+            
+            # Median of three characters at this position
+            pivot = self._median_of_three(arr[low][d:d + 1], arr[(low + high) // 2][d:d + 1],
+                                          arr[high][d:d + 1])
+            
+            # Three-way partition on the character at position d
+            lt, i, gt = low, low, high
+            shared = None
+            while i <= gt:
+                char = arr[i][d:d + 1]
+                inspections += 1
+                if char < pivot:
+                    arr[lt], arr[i] = arr[i], arr[lt]
+                    lt += 1
+                    i += 1
+                    swaps += 1
+                elif char > pivot:
+                    arr[i], arr[gt] = arr[gt], arr[i]
+                    gt -= 1
+                    swaps += 1
+                else:
+                    # Prefix the equal band shares (only shrinks, rarely)
+                    if shared is None:
+                        shared = arr[i]
+                    else:
+                        comparisons += 1
+                        if not arr[i].startswith(shared):
+                            shared = os.path.commonprefix([shared, arr[i]])
+                    i += 1
+            
+            pending.append((low, lt - 1, d))
+            pending.append((gt + 1, high, d))
+            if pivot:
+                # Strings that ended here are all equal; the rest skip the
+                # prefix they share (at least the character at d)
+                pending.append((lt, gt, len(shared)))
+        
+        if self.metrics_level != 'none':
+            self.metrics.char_inspections += inspections
+            self.metrics.comparisons += comparisons
+            self.metrics.swaps += swaps
+    
+    def parallel_merge_sort(self, arr: List[int], workers: int = None,
+                            threshold: int = None) -> List[int]:
+        """
+        Merge Sort that sorts chunks on several CPU cores at once
+        
+        The input is copied once into shared memory as int64 values. Each
+        worker process sorts its own slice of that buffer in place, so no
+        lists are pickled between processes. The sorted chunks are then
+        combined with a k-way heap merge.
+        
+        Args:
+            arr: List of integers (each must fit in 64 bits) to sort
+            workers: Number of worker processes (default: number of CPUs)
+            threshold: Inputs smaller than this use the serial merge_sort
+                       (default: thresholds.parallel_threshold)
+            
+        Returns:
+            Sorted list of numbers
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        
+        if threshold is None:
+            threshold = self.thresholds.parallel_threshold
+        
+        n = len(arr)
+        if n < threshold or workers == 1:
+            return self.merge_sort(arr)
+        
+        # Imported here: multiprocessing is slow to import and rarely needed
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+        
+        tracking = self._start_tracking()
+        
+        # Clean-ups run in reverse order, also on errors: every view is
+        # released before the block is closed (otherwise close() raises
+        # BufferError and hides the real error), and tracking stops last
+        with ExitStack() as cleanup:
+            cleanup.callback(self._stop_tracking, tracking)
+            # The block may be rounded up to a whole page, so only use n values
+            shared = shared_memory.SharedMemory(create=True, size=max(n, 1) * 8)
+            cleanup.callback(shared.unlink)
+            cleanup.callback(shared.close)
+            buffer = shared.buf.cast('q')
+            cleanup.callback(buffer.release)
+            values = buffer[:n]
+            cleanup.callback(values.release)
+            
+            values[:] = array('q', arr)
+            
+            # One chunk per worker; each worker sorts values[start:end] in place
+            bounds = [(n * w // workers, n * (w + 1) // workers) for w in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_sort_shared_chunk, shared.name, n, start, end,
+                                       self.metrics_level, self.thresholds.to_dict())
+                           for start, end in bounds]
+                for future in futures:
+                    comparisons, swaps = future.result()
+                    self.metrics.comparisons += comparisons
+                    self.metrics.swaps += swaps
+            
+            # Combine the sorted chunks straight out of shared memory
+            chunks = []
+            for start, end in bounds:
+                chunk = values[start:end]
+                cleanup.callback(chunk.release)
+                chunks.append(chunk)
+            sorted_arr = list(self._kway_merge(chunks))
+        
+        return sorted_arr
+    
+    def external_sort(self, input_path: str, output_path: str, file_format: str = 'binary',
+                      memory_budget: int = None, fan_in: int = EXTERNAL_FAN_IN,
+                      temp_dir: str = None):
+        """
+        External Merge Sort for files that are too big to fit in memory
+        
+        The input is read in chunks that fit the memory budget, each chunk
+        is sorted and written to a binary run file, and the runs are then
+        merged fan_in at a time with a k-way heap merge until one is left.
+        Bytes read and written and the number of merge passes are recorded
+        in the metrics.
+        
+        Args:
+            input_path: File of integers to sort
+            output_path: File to write the sorted integers to
+            file_format: 'binary' (native int64) or 'text' (one integer per
+                         line), used for both input and output
+            memory_budget: Roughly how many bytes of memory to use, at least
+                           8 * (fan_in + 1)
+                           (default: thresholds.external_memory_budget)
+            fan_in: How many runs to merge at once (at least 2)
+            temp_dir: Where to put run files (default: system temp directory)
+        """
+        if file_format not in ('binary', 'text'):
+            raise ValueError("Invalid file format. Use 'binary' or 'text'")
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        if memory_budget is None:
+            memory_budget = self.thresholds.external_memory_budget
+        if memory_budget < (fan_in + 1) * INT64_BYTES:
+            raise ValueError(f"memory_budget must be at least {(fan_in + 1) * INT64_BYTES} bytes "
+                             f"(one int64 buffer per run and one for the output)")
+        
+        tracking = self._start_tracking()
+        
+        # Clean-ups run in reverse order, also on errors: the run files are
+        # deleted, then tracking stops (and tracemalloc with it)
+        with ExitStack() as cleanup:
+            cleanup.callback(self._stop_tracking, tracking)
+            
+            chunk_size = max(memory_budget // BYTES_PER_LIST_ELEMENT, 1)
+            # During a merge every input run and the output share the budget, so
+            # small budgets get small buffers rather than going over the budget
+            buffer_bytes = memory_budget // (fan_in + 1)
+            run_dir = tempfile.mkdtemp(prefix='external_sort_', dir=temp_dir)
+            cleanup.callback(shutil.rmtree, run_dir, ignore_errors=True)
+            
+            # Pass 0: sorted runs that each fit in memory
+            runs = []
+            for chunk in read_chunks(input_path, file_format, chunk_size, self.metrics):
+                run_path = os.path.join(run_dir, f"run_{len(runs)}.bin")
+                write_values(run_path, self._merge_sort_helper(chunk), 'binary',
+                             buffer_bytes, self.metrics)
+                runs.append(run_path)
+            
+            # Merge passes: fan_in runs become one until a single pass is enough
+            while len(runs) > fan_in:
+                merged_runs = []
+                for group_start in range(0, len(runs), fan_in):
+                    group = runs[group_start:group_start + fan_in]
+                    run_path = os.path.join(run_dir, f"run_{self.metrics.merge_passes}_{len(merged_runs)}.bin")
+                    self._merge_run_files(group, run_path, 'binary', buffer_bytes)
+                    merged_runs.append(run_path)
+                runs = merged_runs
+                self.metrics.merge_passes += 1
+            
+            # Final pass straight into the output file
+            self._merge_run_files(runs, output_path, file_format, buffer_bytes)
+            self.metrics.merge_passes += 1
+    
+    def _merge_run_files(self, run_paths: List[str], output_path: str,
+                         file_format: str, buffer_bytes: int):
+        """
+        k-way merge binary run files into one output file, then delete them
+        
+        Args:
+            run_paths: Sorted binary run files
+            output_path: File to write the merged values to
+            file_format: Format of the output file ('binary' or 'text')
+            buffer_bytes: Read/write buffer size per file
+        """
+        runs = [iter_values(path, 'binary', buffer_bytes, self.metrics) for path in run_paths]
+        write_values(output_path, self._kway_merge(runs), file_format,
+                     buffer_bytes, self.metrics)
+        for path in run_paths:
+            os.remove(path)
+    
+    def _kway_merge(self, runs: List[Iterable[int]]) -> Iterator[int]:
+        """
+        Merge any number of sorted runs with a min heap
+        
+        Each run is only read forward, one element at a time, so runs can be
+        lists, buffers, files or generators. Equal values come out in run
+        order, which keeps the merge stable.
+        
+        Args:
+            runs: Sorted runs to merge
+            
+        Yields:
+            Values of all runs in sorted order
+        """
+        # Heap entries are (current value, run number, rest of the run)
+        heap = []
+        for run_number, run in enumerate(runs):
+            iterator = iter(run)
+            for first in iterator:
+                heap.append((first, run_number, iterator))
+                break
+        
+        for root in range(len(heap) // 2 - 1, -1, -1):
+            self._sift_down_runs(heap, root)
+        
+        while heap:
+            value, run_number, iterator = heap[0]
+            yield value
+            
+            # Replace the smallest entry with the next value of its run
+            for following in iterator:
+                heap[0] = (following, run_number, iterator)
+                break
+            else:
+                last = heap.pop()
+                if not heap:
+                    return
+                heap[0] = last
+            self._sift_down_runs(heap, 0)
+    
+    def _sift_down_runs(self, heap: list, root: int):
+        """
+        Push heap[root] down until the k-way merge min heap property holds
+        
+        Args:
+            heap: List of (value, run number, iterator) entries
+            root: Heap index to start from
+        """
+        size = len(heap)
+        while True:
+            child = 2 * root + 1
+            if child >= size:
+                return
+            
+            # Pick the smaller of the two children
+            if child + 1 < size and self._run_entry_less(heap[child + 1], heap[child]):
+                child += 1
+            
+            if not self._run_entry_less(heap[child], heap[root]):
+                return
+            
+            heap[root], heap[child] = heap[child], heap[root]
+            root = child
+    
+    def _run_entry_less(self, a: tuple, b: tuple) -> bool:
+        """Compare two k-way merge heap entries (ties go to the earlier run)"""
+        self.metrics.comparisons += 1
+        if a[0] < b[0]:
+            return True
+        self.metrics.comparisons += 1
+        if b[0] < a[0]:
+            return False
+        return a[1] < b[1]
+    
     def get_metrics(self) -> PerformanceMetrics:
         """Return current performance metrics"""
-        return self.metrics
\ No newline at end of file
+        return self.metrics
+
+
+def _sort_shared_chunk(shared_name: str, length: int, start: int, end: int,
+                       metrics_level: str, thresholds: dict) -> Tuple[int, int]:
+    """
+    Worker process job for parallel_merge_sort
+    
+    Sorts values[start:end] of the shared int64 buffer in place.
+    
+    Args:
+        shared_name: Name of the shared memory block
+        length: Number of int64 values in the block
+        start: Start of this worker's chunk
+        end: End of this worker's chunk (exclusive)
+        metrics_level: Metrics level of the parent sorter
+        thresholds: Thresholds of the parent sorter, as a dictionary
+        
+    Returns:
+        (comparisons, swaps) made while sorting the chunk
+    """
+    from multiprocessing import shared_memory
+    
+    shared = shared_memory.SharedMemory(name=shared_name)
+    buffer = shared.buf.cast('q')
+    values = buffer[:length]
+    try:
+        sorter = SortingAlgorithms(metrics_level, thresholds=Thresholds(**thresholds))
+        sorted_chunk = sorter.merge_sort(values[start:end].tolist())
+        values[start:end] = array('q', sorted_chunk)
+        return sorter.metrics.comparisons, sorter.metrics.swaps
+    finally:
+        values.release()
+        buffer.release()
+        shared.close()
@@ -0,0 +1,71 @@
+"""
+Shared test fixtures
+The modules live at the repository root, so it is put on sys.path here
+"""
+
+import os
+import random
+import sys
+from array import array
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sorting_algorithms
+from typed_buffers import np
+
+# Input shapes every engine is checked against sorted() on
+SHAPES = ('empty', 'single', 'random', 'sorted', 'reversed', 'duplicates', 'negative')
+
+
+def make_values(shape: str, size: int = 300, seed: int = 0) -> list:
+    """Integers of one SHAPES kind"""
+    rng = random.Random(seed)
+    if shape == 'empty':
+        return []
+    if shape == 'single':
+        return [rng.randrange(100)]
+    values = [rng.randrange(-10 ** 6, 10 ** 6) for _ in range(size)]
+    if shape == 'sorted':
+        values.sort()
+    elif shape == 'reversed':
+        values.sort(reverse=True)
+    elif shape == 'duplicates':
+        values = [value % 5 for value in values]
+    elif shape == 'negative':
+        values = [-abs(value) for value in values]
+    return values
+
+
+def as_container(values: list, container: str):
+    """values as a list, array('q') or int64 NumPy array"""
+    if container == 'list':
+        return list(values)
+    if container == 'array':
+        return array('q', values)
+    if np is None:
+        pytest.skip("NumPy is not installed")
+    return np.array(values, dtype=np.int64)
+
+
+def as_list(values) -> list:
+    """Any sorted result as a plain list"""
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+
+@pytest.fixture(autouse=True)
+def no_tuning_profile(tmp_path, monkeypatch):
+    """Keep a tuning profile on this machine out of the tests"""
+    monkeypatch.setenv('SORTING_TUNING_PROFILE', str(tmp_path / 'no_profile.json'))
+    monkeypatch.setattr(sorting_algorithms, '_profile_thresholds', {})
+
+
+@pytest.fixture(params=SHAPES)
+def shape(request):
+    return request.param
+
+
+@pytest.fixture(params=('list', 'array', 'ndarray'))
+def container(request):
+    return request.param
@@ -0,0 +1,44 @@
+"""
+Batch Sort Tests
+sort_many() and sort_rows()
+"""
+
+import pytest
+
+from conftest import make_values
+from sorting_algorithms import SortingAlgorithms
+from typed_buffers import np
+
+
+def test_sort_many():
+    arrays = [make_values('random', size, size) for size in range(0, 40)]
+    assert SortingAlgorithms().sort_many(arrays) == [sorted(values) for values in arrays]
+
+
+def test_sort_rows_with_lengths_on_lists():
+    rows = [make_values('random', 10, seed) for seed in range(5)]
+    lengths = [10, 0, 3, 7, 1]
+    result = SortingAlgorithms().sort_rows(rows, lengths)
+    for row, sorted_row, length in zip(rows, result, lengths):
+        assert sorted_row == sorted(row[:length]) + row[length:]
+
+
+@pytest.mark.skipif(np is None, reason="NumPy is not installed")
+def test_sort_rows_with_lengths_and_nan():
+    rng = np.random.default_rng(6)
+    matrix = rng.normal(size=(6, 8))
+    matrix[0, 1] = matrix[3, 6] = np.nan
+    # Real data equal to the largest float must not be mistaken for padding
+    matrix[2, 0] = np.finfo(matrix.dtype).max
+    lengths = [5, 8, 3, 7, 0, 8]
+    result = SortingAlgorithms().sort_rows(matrix, lengths)
+    for row, sorted_row, length in zip(matrix, result, lengths):
+        np.testing.assert_array_equal(sorted_row[:length], np.sort(row[:length]))
+        np.testing.assert_array_equal(sorted_row[length:], row[length:])
+
+
+@pytest.mark.skipif(np is None, reason="NumPy is not installed")
+def test_sort_rows_inplace():
+    matrix = np.array([[3, 1, 2], [9, 8, 7]])
+    assert SortingAlgorithms().sort_rows(matrix, inplace=True) is matrix
+    assert matrix.tolist() == [[1, 2, 3], [7, 8, 9]]
@@ -0,0 +1,103 @@
+"""
+Benchmark Suite Tests
+Statistics, the Mann-Whitney test, saved results and regression checks
+"""
+
+import json
+import random
+
+import pytest
+
+import benchmark
+from benchmark import BenchmarkSuite, compare_results, mann_whitney_p_value, summarize
+
+
+def test_summarize():
+    summary = summarize([1.0, 2.0, 3.0, 4.0, 5.0])
+    assert summary['median'] == 3.0
+    assert summary['min'] == 1.0
+    assert summary['mean'] == 3.0
+    assert summary['iqr'] > 0
+    assert summary['relative_ci'] > 0
+    assert summarize([2.0])['relative_ci'] == 0.0
+
+
+def test_mann_whitney():
+    rng = random.Random(11)
+    same = [rng.gauss(1.0, 0.01) for _ in range(30)]
+    also_same = [rng.gauss(1.0, 0.01) for _ in range(30)]
+    slower = [value + 0.1 for value in also_same]
+    assert mann_whitney_p_value(same, also_same) > 0.01
+    assert mann_whitney_p_value(same, slower) < 1e-6
+    assert mann_whitney_p_value(same, slower) == pytest.approx(mann_whitney_p_value(slower, same))
+    assert mann_whitney_p_value([], same) == 1.0
+    assert mann_whitney_p_value([1.0, 1.0], [1.0, 1.0]) == 1.0
+
+
+def result(median, samples, engine='quick_sort'):
+    return {'engine': engine, 'distribution': 'random', 'size': 100,
+            'median': median, 'samples': samples}
+
+
+def test_compare_flags_only_significant_slowdowns():
+    rng = random.Random(12)
+    base = [rng.gauss(1.0, 0.01) for _ in range(30)]
+    baseline = {'results': [result(1.0, base), result(1.0, base, 'merge_sort')]}
+    current = {'results': [
+        # 20% slower: a regression
+        result(1.2, [value * 1.2 for value in base]),
+        # Slower, but by less than the threshold
+        result(1.001, [value + 0.001 for value in base], 'merge_sort'),
+        # Not in the baseline, so not compared
+        result(1.0, base, 'natural_merge_sort'),
+    ]}
+    comparisons = {entry['engine']: entry for entry in compare_results(baseline, current)}
+    assert set(comparisons) == {'quick_sort', 'merge_sort'}
+    assert comparisons['quick_sort']['regression']
+    assert comparisons['quick_sort']['change'] == pytest.approx(0.2)
+    assert not comparisons['merge_sort']['regression']
+
+
+def test_suite_run_and_save(tmp_path):
+    suite = BenchmarkSuite(warmup=0, min_repeats=2, max_repeats=3, max_seconds=5)
+    results = suite.run([50, 100], ['random', 'sorted'], seed=1)
+    assert len(results) == 2 * 2 * len(benchmark.ENGINES)
+    for entry in results:
+        assert 2 <= entry['repeats'] == len(entry['samples']) <= 3
+        assert entry['median'] > 0
+    
+    suite.save_json(str(tmp_path / 'results.json'))
+    suite.save_csv(str(tmp_path / 'results.csv'))
+    loaded = benchmark.load_results(str(tmp_path / 'results.json'))
+    assert loaded['metadata']['cpu_count'] == suite.metadata['cpu_count']
+    assert len(loaded['results']) == len(results)
+    csv_lines = (tmp_path / 'results.csv').read_text().splitlines()
+    assert csv_lines[0].startswith('# ')
+    assert len([line for line in csv_lines if not line.startswith('#')]) == len(results) + 1
+
+
+def test_same_seed_gives_same_data():
+    first = BenchmarkSuite(warmup=0, min_repeats=2, max_repeats=2)
+    second = BenchmarkSuite(warmup=0, min_repeats=2, max_repeats=2)
+    inputs = []
+    
+    def record(sorter, data):
+        inputs.append(list(data))
+        return sorter.quick_sort(data)
+    
+    for suite in (first, second):
+        suite.engines = {'record': record}
+        suite.run([200], ['random'], seed=3)
+    assert inputs[0] == inputs[-1]
+
+
+def test_compare_command_exit_code(tmp_path, capsys):
+    base = [1.0 + index / 1000 for index in range(20)]
+    paths = {}
+    for name, factor in (('baseline', 1.0), ('same', 1.0), ('slower', 1.5)):
+        paths[name] = tmp_path / f"{name}.json"
+        paths[name].write_text(json.dumps({'results': [
+            result(1.0 * factor, [value * factor for value in base])]}))
+    assert benchmark.main(['compare', str(paths['baseline']), str(paths['same'])]) == 0
+    assert benchmark.main(['compare', str(paths['baseline']), str(paths['slower'])]) == 1
+    assert 'REGRESSION' in capsys.readouterr().out
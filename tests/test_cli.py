@@ -0,0 +1,93 @@
+"""
+Command Line Tests
+"""
+
+import io
+import sys
+
+import pytest
+
+import cli
+from conftest import make_values
+
+
+def run(monkeypatch, capsys, argv, text):
+    stdin = io.StringIO(text)
+    monkeypatch.setattr(sys, 'stdin', stdin)
+    code = cli.main(argv)
+    # Reading stdin through the with block must not close it
+    assert not stdin.closed
+    return code, capsys.readouterr()
+
+
+@pytest.mark.parametrize('engine', sorted(set(cli.SORT_ENGINES) - {'string', 'counting'}))
+def test_sort_engines(monkeypatch, capsys, engine):
+    values = make_values('random', size=200)
+    code, output = run(monkeypatch, capsys, ['sort', '--engine', engine],
+                       ' '.join(map(str, values)))
+    assert code == 0
+    assert [int(line) for line in output.out.split()] == sorted(values)
+
+
+def test_sort_reverse_floats(monkeypatch, capsys):
+    code, output = run(monkeypatch, capsys, ['sort', '--reverse'], "1.5 -2\n3 0.25\n")
+    assert code == 0
+    assert output.out.split() == ['3', '1.5', '0.25', '-2']
+
+
+def test_sort_strings(monkeypatch, capsys):
+    code, output = run(monkeypatch, capsys, ['sort', '--strings'], "pear\napple\nfig\n")
+    assert code == 0
+    assert output.out.splitlines() == ['apple', 'fig', 'pear']
+
+
+@pytest.mark.parametrize('token', ['nan', 'inf', '-Infinity', 'twelve'])
+def test_sort_rejects_non_finite_and_invalid_numbers(monkeypatch, capsys, token):
+    code, output = run(monkeypatch, capsys, ['sort'], f"3 {token} 1")
+    assert code == 1
+    assert output.out == ''
+    assert 'sort:' in output.err
+
+
+def test_sort_external(monkeypatch, capsys):
+    values = make_values('random', size=500)
+    code, output = run(monkeypatch, capsys, ['sort', '--external', '--memory-budget', '1000'],
+                       '\n'.join(map(str, values)))
+    assert code == 0
+    assert [int(line) for line in output.out.split()] == sorted(values)
+
+
+def test_sort_external_budget_too_small(monkeypatch, capsys):
+    code, output = run(monkeypatch, capsys, ['sort', '--external', '--memory-budget', '10'], "2 1")
+    assert code == 1
+    assert 'memory_budget' in output.err
+
+
+def test_sort_file(tmp_path, capsys):
+    path = tmp_path / 'numbers.txt'
+    path.write_text("3\n1\n2\n")
+    assert cli.main(['sort', '--metrics', str(path)]) == 0
+    output = capsys.readouterr()
+    assert output.out.split() == ['1', '2', '3']
+    assert output.err
+
+
+@pytest.mark.parametrize('token', ['1.5', 'x', 'nan'])
+def test_sort_external_rejects_non_integers(monkeypatch, capsys, token):
+    code, output = run(monkeypatch, capsys, ['sort', '--external'], f"3 {token} 1")
+    assert code == 1
+    assert output.out == ''
+    assert 'integers only' in output.err
+
+
+@pytest.mark.parametrize('argv, text', [
+    (['sort', '--engine', 'radix'], "3 1.5 1"),
+    (['sort', '--engine', 'counting'], "3 1.5 1"),
+    (['sort', '--engine', 'counting'], "1 1000000000"),
+    (['sort', '--strings', '--engine', 'radix'], "b\na\n"),
+])
+def test_sort_engine_that_cant_take_the_input(monkeypatch, capsys, argv, text):
+    code, output = run(monkeypatch, capsys, argv, text)
+    assert code == 1
+    assert output.out == ''
+    assert "engine can't sort this input" in output.err
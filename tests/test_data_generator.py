@@ -0,0 +1,38 @@
+"""
+Data Generator Tests
+"""
+
+import pytest
+
+from data_generator import DISTRIBUTIONS, GENERATION_BLOCK, DataGenerator
+from typed_buffers import NUMPY_AVAILABLE
+
+
+@pytest.fixture(params=[False, True] if NUMPY_AVAILABLE else [False])
+def generator(request):
+    return DataGenerator(use_numpy=request.param)
+
+
+@pytest.mark.parametrize('distribution', DISTRIBUTIONS)
+def test_generate_is_reproducible(generator, distribution):
+    values = generator.generate(500, distribution, seed=7)
+    assert len(values) == 500
+    assert values == generator.generate(500, distribution, seed=7)
+    assert list(generator.generate_array(500, distribution, seed=7)) == values
+
+
+@pytest.mark.parametrize('chunk_size', [1, 999, GENERATION_BLOCK, GENERATION_BLOCK + 1, 10 ** 6])
+def test_iter_chunks_concatenate_to_generate(generator, chunk_size):
+    size = 2 * GENERATION_BLOCK + 123
+    chunks = list(generator.iter_chunks(size, 'random', chunk_size, seed=8))
+    assert all(len(chunk) == chunk_size for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= chunk_size
+    values = [int(value) for chunk in chunks for value in chunk]
+    assert values == generator.generate(size, 'random', seed=8)
+
+
+def test_iter_chunks_invalid_arguments(generator):
+    with pytest.raises(ValueError):
+        list(generator.iter_chunks(10, 'bogus', 5))
+    with pytest.raises(ValueError):
+        list(generator.iter_chunks(10, 'random', 0))
@@ -0,0 +1,49 @@
+"""
+Dataset Cache Tests
+"""
+
+import os
+
+import pytest
+
+from data_generator import DataGenerator
+from dataset_cache import DatasetCache
+
+
+def test_cache_returns_data_and_sorted_copy(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    values = cache.load('random', 1000, 1)
+    assert values == DataGenerator().generate(1000, 'random', seed=1)
+    assert list(cache.get_sorted('random', 1000, 1)) == sorted(values)
+    assert cache.matches_reference(sorted(values), 'random', 1000, 1)
+    assert not cache.matches_reference(values, 'random', 1000, 1)
+
+
+def test_cache_needs_a_seed(tmp_path):
+    with pytest.raises(ValueError):
+        DatasetCache(str(tmp_path)).get('random', 10, None)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    # Room for two datasets of 100 values (plus their sorted copies)
+    cache = DatasetCache(str(tmp_path), max_bytes=2 * 16 * 100)
+    for seed in range(3):
+        cache.get('random', 100, seed)
+    assert not os.path.exists(cache.path_for('random', 100, 0))
+    for seed in (1, 2):
+        assert os.path.exists(cache.path_for('random', 100, seed))
+        assert os.path.exists(cache.path_for('random', 100, seed, sorted_copy=True))
+
+
+def test_cache_keeps_the_dataset_it_creates(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=16 * 100)
+    cache.get('random', 100, 0)
+    assert len(cache.get('random', 100, 1)) == 100
+    assert os.path.exists(cache.path_for('random', 100, 1))
+
+
+def test_cache_rejects_datasets_bigger_than_the_cache(tmp_path):
+    cache = DatasetCache(str(tmp_path), max_bytes=1000)
+    with pytest.raises(ValueError):
+        cache.get('random', 1000, 0)
+    assert not os.listdir(str(tmp_path))
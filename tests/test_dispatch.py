@@ -0,0 +1,58 @@
+"""
+Dispatcher Tests
+sort() picking an engine from a sample of the input
+"""
+
+import random
+
+import pytest
+
+import sorting_algorithms
+from conftest import as_container, as_list, make_values
+from sorting_algorithms import SortingAlgorithms, Thresholds
+
+
+def test_matches_sorted(shape, container):
+    values = make_values(shape, size=3000)
+    sorter = SortingAlgorithms()
+    assert as_list(sorter.sort(as_container(values, container))) == sorted(values)
+    assert sorter.metrics.engine
+    assert sorter.metrics.dispatch_reason
+
+
+@pytest.mark.parametrize('values, engine', [
+    (list(range(2000)), 'natural_merge_sort'),
+    ([value % 50 for value in make_values('random', 2000)], 'counting_sort'),
+])
+def test_picks_engine(values, engine):
+    sorter = SortingAlgorithms()
+    assert sorter.sort(values) == sorted(values)
+    assert sorter.metrics.engine == engine
+
+
+def test_floats_and_mixed_numbers():
+    rng = random.Random(4)
+    values = [rng.uniform(-5, 5) for _ in range(1000)] + list(range(-500, 500))
+    assert SortingAlgorithms().sort(values) == sorted(values)
+
+
+@pytest.mark.parametrize('huge', [[2 ** 64], [2 ** 64 + index for index in range(3000)]])
+def test_ints_beyond_int64_with_parallel_engine(monkeypatch, huge):
+    # Pretend to have several cores so the parallel engine is a candidate
+    monkeypatch.setattr(sorting_algorithms.os, 'cpu_count', lambda: 2)
+    rng = random.Random(5)
+    values = [rng.randrange(-2 ** 62, 2 ** 62) for _ in range(6000)] + huge
+    rng.shuffle(values)
+    sorter = SortingAlgorithms(thresholds=Thresholds(parallel_threshold=1000))
+    assert sorter.sort(values) == sorted(values)
+
+
+@pytest.mark.parametrize('cpus, engine', [(1, 'radix_sort'), (2, 'parallel_merge_sort')])
+def test_big_int64_input_goes_parallel_on_several_cores(monkeypatch, cpus, engine):
+    monkeypatch.setattr(sorting_algorithms.os, 'cpu_count', lambda: cpus)
+    rng = random.Random(15)
+    # Wide enough that counting sort is out, big enough that radix sort qualifies
+    values = [rng.randrange(-2 ** 62, 2 ** 62) for _ in range(40000)]
+    sorter = SortingAlgorithms(thresholds=Thresholds(parallel_threshold=20000))
+    assert sorter.sort(values) == sorted(values)
+    assert sorter.metrics.engine == engine
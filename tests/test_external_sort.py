@@ -0,0 +1,120 @@
+"""
+External Sort Tests
+File helpers and the out-of-core merge sort
+"""
+
+import os
+import threading
+import tracemalloc
+from array import array
+
+import pytest
+
+from conftest import make_values
+from external_sort import iter_values, read_chunks, write_values
+from performance_metrics import PerformanceMetrics
+from sorting_algorithms import SortingAlgorithms
+
+
+def write_binary(path, values):
+    with open(path, 'wb') as file:
+        file.write(array('q', values).tobytes())
+
+
+def read_binary(path) -> list:
+    with open(path, 'rb') as file:
+        return array('q', file.read()).tolist()
+
+
+@pytest.mark.parametrize('memory_budget, fan_in', [(1 << 20, 16), (2000, 4), (200, 2)])
+def test_binary(tmp_path, shape, memory_budget, fan_in):
+    values = make_values(shape, size=3000)
+    write_binary(tmp_path / 'input.bin', values)
+    sorter = SortingAlgorithms()
+    sorter.external_sort(str(tmp_path / 'input.bin'), str(tmp_path / 'output.bin'),
+                         memory_budget=memory_budget, fan_in=fan_in)
+    assert read_binary(tmp_path / 'output.bin') == sorted(values)
+    assert sorter.metrics.merge_passes >= 1
+
+
+def test_text(tmp_path):
+    values = make_values('random', size=2000)
+    (tmp_path / 'input.txt').write_text(''.join(f"{value}\n" for value in values))
+    SortingAlgorithms().external_sort(str(tmp_path / 'input.txt'), str(tmp_path / 'output.txt'),
+                                      file_format='text', memory_budget=4096, fan_in=3)
+    assert [int(line) for line in (tmp_path / 'output.txt').read_text().split()] == sorted(values)
+
+
+@pytest.mark.parametrize('memory_budget, fan_in', [(39, 4), (0, 2)])
+def test_budget_too_small_for_the_buffers(tmp_path, memory_budget, fan_in):
+    write_binary(tmp_path / 'input.bin', [3, 1, 2])
+    with pytest.raises(ValueError):
+        SortingAlgorithms().external_sort(str(tmp_path / 'input.bin'), str(tmp_path / 'out.bin'),
+                                          memory_budget=memory_budget, fan_in=fan_in)
+
+
+def test_invalid_arguments(tmp_path):
+    sorter = SortingAlgorithms()
+    with pytest.raises(ValueError):
+        sorter.external_sort('in', 'out', file_format='csv')
+    with pytest.raises(ValueError):
+        sorter.external_sort('in', 'out', fan_in=1)
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="needs named pipes")
+def test_iter_values_joins_values_split_across_reads(tmp_path):
+    # A pipe hands out whatever has been written so far, so raw reads stop
+    # in the middle of values
+    values = list(range(-100, 100))
+    data = array('q', values).tobytes()
+    path = str(tmp_path / 'pipe')
+    os.mkfifo(path)
+    
+    def writer():
+        with open(path, 'wb', buffering=0) as pipe:
+            for start in range(0, len(data), 13):
+                pipe.write(data[start:start + 13])
+    
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        assert list(iter_values(path, 'binary', 64, PerformanceMetrics())) == values
+    finally:
+        thread.join()
+
+
+def test_iter_values_rejects_partial_value(tmp_path):
+    path = tmp_path / 'values.bin'
+    path.write_bytes(array('q', [1, 2]).tobytes() + b'\x00')
+    with pytest.raises(ValueError):
+        list(iter_values(str(path), 'binary', 64, PerformanceMetrics()))
+    with pytest.raises(ValueError):
+        list(read_chunks(str(path), 'binary', 4, PerformanceMetrics()))
+
+
+@pytest.mark.parametrize('file_format', ['binary', 'text'])
+@pytest.mark.parametrize('buffer_bytes', [1, 8, 100, 1 << 16])
+def test_write_then_read(tmp_path, file_format, buffer_bytes):
+    values = make_values('random', size=500)
+    path = str(tmp_path / 'values')
+    metrics = PerformanceMetrics()
+    write_values(path, iter(values), file_format, buffer_bytes, metrics)
+    assert list(iter_values(path, file_format, buffer_bytes, metrics)) == values
+    assert [value for chunk in read_chunks(path, file_format, 37, metrics)
+            for value in chunk] == values
+    assert metrics.io_bytes_written == os.path.getsize(path)
+
+
+def test_errors_stop_tracking_and_remove_the_runs(tmp_path):
+    # Fails while the runs are being written: the second chunk isn't a number
+    (tmp_path / 'input.txt').write_text("3\n1\n2\nnot a number\n")
+    runs_dir = tmp_path / 'runs'
+    runs_dir.mkdir()
+    sorter = SortingAlgorithms(memory_mode='tracemalloc')
+    with pytest.raises(ValueError):
+        sorter.external_sort(str(tmp_path / 'input.txt'), str(tmp_path / 'output.txt'),
+                             file_format='text', memory_budget=200, fan_in=2,
+                             temp_dir=str(runs_dir))
+    assert not tracemalloc.is_tracing()
+    assert sorter.metrics.execution_time > 0
+    assert not list(runs_dir.iterdir())
@@ -0,0 +1,31 @@
+"""
+Counting and Radix Sort Tests
+"""
+
+import pytest
+
+from conftest import as_container, as_list, make_values
+from sorting_algorithms import COUNTING_SORT_MAX_RANGE, SortingAlgorithms
+
+
+@pytest.mark.parametrize('engine', ['counting_sort', 'radix_sort'])
+def test_matches_sorted(engine, shape, container):
+    # Within COUNTING_SORT_MAX_RANGE, so both engines take every shape
+    values = [value // 4 for value in make_values(shape)]
+    result = getattr(SortingAlgorithms(), engine)(as_container(values, container))
+    assert as_list(result) == sorted(values)
+
+
+def test_counting_sort_rejects_wide_ranges():
+    with pytest.raises(ValueError):
+        SortingAlgorithms().counting_sort([0, COUNTING_SORT_MAX_RANGE])
+
+
+def test_radix_sort_beyond_int64():
+    values = [2 ** 70, -(2 ** 65), 0, 2 ** 63, -1, 2 ** 63 - 1]
+    assert SortingAlgorithms().radix_sort(values) == sorted(values)
+
+
+def test_radix_sort_int64_extremes(container):
+    values = [2 ** 63 - 1, -(2 ** 63), 0, -1, 1]
+    assert as_list(SortingAlgorithms().radix_sort(as_container(values, container))) == sorted(values)
@@ -0,0 +1,71 @@
+"""
+Keyed Sort Tests
+key=, reverse= and stable= on quick_sort and merge_sort
+"""
+
+import random
+
+import pytest
+
+from sorting_algorithms import SortingAlgorithms
+from typed_buffers import np
+
+SORTS = ('quick_sort', 'merge_sort')
+
+
+def records(count: int = 300, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [{'group': rng.randrange(10), 'id': index} for index in range(count)]
+
+
+@pytest.mark.parametrize('sort', SORTS)
+@pytest.mark.parametrize('reverse', [False, True])
+def test_key_is_stable(sort, reverse):
+    values = records()
+    result = getattr(SortingAlgorithms(), sort)(values, key=lambda record: record['group'],
+                                                 reverse=reverse)
+    assert result == sorted(values, key=lambda record: record['group'], reverse=reverse)
+
+
+@pytest.mark.parametrize('sort', SORTS)
+def test_key_called_once_per_element(sort):
+    calls = []
+    
+    def key(value):
+        calls.append(value)
+        return -value
+    
+    values = list(range(200))
+    sorter = SortingAlgorithms(metrics_level='counters')
+    assert getattr(sorter, sort)(values, key=key) == values[::-1]
+    assert len(calls) == len(values)
+    assert sorter.metrics.key_evaluations == len(values)
+
+
+def test_quick_sort_stable_without_key():
+    # 1 == 1.0 == True, so the types show the original order
+    values = [1.0, 0, 1, True, 0.0, 1]
+    result = SortingAlgorithms().quick_sort(values, stable=True)
+    assert [type(value) for value in result] == [type(value) for value in sorted(values)]
+
+
+@pytest.mark.parametrize('sort', SORTS)
+def test_reverse_numbers(sort):
+    values = [5, 3, 9, 1, 3]
+    assert getattr(SortingAlgorithms(), sort)(values, reverse=True) == [9, 5, 3, 3, 1]
+
+
+@pytest.mark.parametrize('sort', SORTS)
+def test_key_keeps_int_precision(sort):
+    # Keys that differ only past float64's 53 bits of mantissa
+    base = 2 ** 60
+    values = [base + 3, base + 1, 0.5, base + 2, 2 ** 70]
+    assert getattr(SortingAlgorithms(), sort)(values, key=lambda value: value) == sorted(values)
+
+
+@pytest.mark.skipif(np is None, reason="NumPy is not installed")
+def test_numpy_float_keys():
+    values = list(np.random.default_rng(13).normal(size=500))
+    result = SortingAlgorithms().merge_sort(values, key=lambda value: value, reverse=True)
+    assert result == sorted(values, reverse=True)
+
@@ -0,0 +1,46 @@
+"""
+Lazy Merge Tests
+merge_iter and sorted_iter
+"""
+
+import itertools
+
+from conftest import make_values
+from sorting_algorithms import SortingAlgorithms
+
+
+def test_merge_iter_matches_sorted():
+    runs = [sorted(make_values('random', size, size)) for size in (0, 1, 50, 200)]
+    merged = SortingAlgorithms().merge_iter(*(iter(run) for run in runs))
+    assert list(merged) == sorted(value for run in runs for value in run)
+
+
+def test_merge_iter_is_lazy():
+    evens = itertools.count(0, 2)
+    odds = itertools.count(1, 2)
+    merged = SortingAlgorithms().merge_iter(evens, odds)
+    assert list(itertools.islice(merged, 10)) == list(range(10))
+
+
+def test_merge_iter_is_stable():
+    # 1 == 1.0, so the types show which input each value came from
+    merged = list(SortingAlgorithms().merge_iter([1, 2], [1.0, 2.0]))
+    assert [type(value) for value in merged] == [int, float, int, float]
+
+
+def test_sorted_iter(shape):
+    values = make_values(shape)
+    original = list(values)
+    assert list(SortingAlgorithms().sorted_iter(values)) == sorted(values)
+    assert values == original
+
+
+def test_sorted_iter_first_values_are_cheap():
+    values = make_values('random', size=5000)
+    partial = SortingAlgorithms(metrics_level='counters')
+    stream = partial.sorted_iter(values)
+    assert list(itertools.islice(stream, 5)) == sorted(values)[:5]
+    stream.close()
+    full = SortingAlgorithms(metrics_level='counters')
+    list(full.sorted_iter(values))
+    assert partial.metrics.comparisons < full.metrics.comparisons / 2
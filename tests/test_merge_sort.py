@@ -0,0 +1,68 @@
+"""
+Merge Sort Tests
+Bottom-up, natural, classic and memory-budgeted merge sort against sorted()
+"""
+
+import pytest
+
+from conftest import as_container, as_list, make_values
+from sorting_algorithms import SortingAlgorithms
+
+
+@pytest.mark.parametrize('mode', ['bottom_up', 'natural', 'classic'])
+def test_matches_sorted(mode, shape, container):
+    values = make_values(shape)
+    result = SortingAlgorithms().merge_sort(as_container(values, container), mode=mode)
+    assert as_list(result) == sorted(values)
+
+
+def test_bottom_up_allocates_one_buffer():
+    sorter = SortingAlgorithms(metrics_level='full')
+    sorter.merge_sort(make_values('random', size=1000), vectorized=False)
+    assert sorter.metrics.aux_allocated == 1000
+
+
+def test_natural_is_linear_on_sorted_input():
+    sorter = SortingAlgorithms(metrics_level='counters')
+    sorter.merge_sort(list(range(1000)), mode='natural')
+    assert sorter.metrics.comparisons < 1000
+
+
+def test_natural_merges_existing_runs():
+    runs = [sorted(make_values('random', 200, seed)) for seed in range(4)]
+    values = [value for run in runs for value in run]
+    natural = SortingAlgorithms(metrics_level='counters')
+    assert natural.merge_sort(values, mode='natural') == sorted(values)
+    bottom_up = SortingAlgorithms(metrics_level='counters')
+    bottom_up.merge_sort(values, vectorized=False)
+    # Two merge passes over the 4 runs instead of log2(800) of them
+    assert natural.metrics.comparisons < bottom_up.metrics.comparisons
+
+
+@pytest.mark.parametrize('max_aux_bytes', [0, 64, 1024])
+def test_budgeted(max_aux_bytes, shape, container):
+    values = make_values(shape)
+    result = SortingAlgorithms().merge_sort(as_container(values, container),
+                                            max_aux_bytes=max_aux_bytes)
+    assert as_list(result) == sorted(values)
+
+
+@pytest.mark.parametrize('max_aux_bytes', [0, 800])
+def test_budgeted_is_stable_and_within_budget(max_aux_bytes):
+    # 1 == 1.0, so the types show the original order
+    values = [value % 7 if index % 2 else float(value % 7)
+              for index, value in enumerate(make_values('random', size=2000))]
+    sorter = SortingAlgorithms(metrics_level='counters')
+    result = sorter.merge_sort(values, max_aux_bytes=max_aux_bytes)
+    assert [type(value) for value in result] == [type(value) for value in sorted(values)]
+    assert sorter.metrics.aux_peak_bytes <= max_aux_bytes
+
+
+def test_budget_cant_be_combined_with_key():
+    with pytest.raises(ValueError):
+        SortingAlgorithms().merge_sort([2, 1], key=abs, max_aux_bytes=0)
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        SortingAlgorithms().merge_sort([3, 1, 2], mode='bogus')
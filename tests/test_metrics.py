@@ -0,0 +1,109 @@
+"""
+Metrics Tests
+Metrics levels and memory instrumentation
+"""
+
+import tracemalloc
+
+import pytest
+
+from conftest import make_values
+from sorting_algorithms import SortingAlgorithms
+
+# Engines with a pure Python path that counts, and how to call them
+ENGINES = {
+    'introsort': lambda sorter, values: sorter.quick_sort(values, vectorized=False),
+    'classic_quick_sort': lambda sorter, values: sorter.quick_sort(values, mode='classic'),
+    'bottom_up': lambda sorter, values: sorter.merge_sort(values, vectorized=False),
+    'natural': lambda sorter, values: sorter.merge_sort(values, mode='natural'),
+    'classic_merge_sort': lambda sorter, values: sorter.merge_sort(values, mode='classic'),
+}
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_level_none_counts_nothing(engine):
+    values = make_values('random', size=2000)
+    sorter = SortingAlgorithms(metrics_level='none')
+    assert ENGINES[engine](sorter, values) == sorted(values)
+    assert sorter.metrics.comparisons == 0
+    assert sorter.metrics.swaps == 0
+    assert sorter.metrics.memory_usage == 0
+    assert sorter.metrics.execution_time > 0
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_level_counters_counts(engine):
+    values = make_values('random', size=2000)
+    sorter = SortingAlgorithms(metrics_level='counters')
+    assert ENGINES[engine](sorter, values) == sorted(values)
+    assert sorter.metrics.comparisons > len(values)
+    assert sorter.metrics.memory_usage == 0
+    assert sorter.metrics.memory_peak == 0
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_levels_agree_on_the_counts(engine):
+    values = make_values('random', size=2000)
+    counters = SortingAlgorithms(metrics_level='counters')
+    full = SortingAlgorithms(metrics_level='full', memory_mode='tracemalloc')
+    ENGINES[engine](counters, values)
+    ENGINES[engine](full, values)
+    assert counters.metrics.comparisons == full.metrics.comparisons
+
+
+def test_metrics_are_reset_between_calls():
+    sorter = SortingAlgorithms(metrics_level='counters')
+    sorter.quick_sort(make_values('random', size=2000), vectorized=False)
+    sorter.quick_sort([2, 1], vectorized=False)
+    assert sorter.metrics.comparisons < 10
+
+
+@pytest.mark.parametrize('memory_mode', ['tracemalloc', 'tracemalloc_levels'])
+def test_tracemalloc_measures_the_merge_buffer(memory_mode):
+    values = make_values('random', size=5000)
+    sorter = SortingAlgorithms(memory_mode=memory_mode)
+    sorter.merge_sort(values, vectorized=False)
+    # The copy of the input plus one buffer of n list slots
+    assert sorter.metrics.memory_peak >= 2 * 8 * len(values)
+    assert sorter.metrics.memory_usage <= sorter.metrics.memory_peak
+    assert bool(sorter.metrics.memory_by_level) == (memory_mode == 'tracemalloc_levels')
+    # Tracing started for the call is stopped again
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracemalloc_already_running_is_left_running():
+    tracemalloc.start()
+    try:
+        sorter = SortingAlgorithms(memory_mode='tracemalloc')
+        sorter.quick_sort(make_values('random', size=1000), vectorized=False)
+        assert sorter.metrics.memory_peak > 0
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_level_counters_skips_tracemalloc():
+    sorter = SortingAlgorithms(metrics_level='counters', memory_mode='tracemalloc')
+    sorter.merge_sort(make_values('random', size=1000), vectorized=False)
+    assert sorter.metrics.memory_peak == 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_aux_space_counters():
+    values = make_values('random', size=5000)
+    merge = SortingAlgorithms(metrics_level='counters')
+    merge.merge_sort(values, vectorized=False)
+    assert merge.metrics.aux_allocated == merge.metrics.aux_peak == len(values)
+    assert merge.metrics.aux_peak_bytes == 8 * len(values)
+    assert merge.metrics.aux_live == 0
+    
+    quick = SortingAlgorithms(metrics_level='counters')
+    quick.quick_sort(values, vectorized=False)
+    assert quick.metrics.aux_peak == 0
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        SortingAlgorithms(metrics_level='everything')
+    with pytest.raises(ValueError):
+        SortingAlgorithms(memory_mode='psychic')
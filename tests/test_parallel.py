@@ -0,0 +1,112 @@
+"""
+Parallel Sort Tests
+Shared-memory merge sort and the work-stealing quick sort
+"""
+
+import os
+import threading
+from array import array
+
+import pytest
+
+from conftest import as_container, as_list, make_values
+from sorting_algorithms import SortingAlgorithms, Thresholds
+from tracer import RecursionTracer
+from typed_buffers import np
+from work_stealing import WorkStealingPool
+
+
+def shared_memory_segments() -> set:
+    return set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+
+
+@pytest.mark.parametrize('shape', ['random', 'sorted', 'duplicates'])
+def test_parallel_merge_sort(shape):
+    values = make_values(shape, size=5000)
+    result = SortingAlgorithms().parallel_merge_sort(values, workers=2, threshold=0)
+    assert result == sorted(values)
+
+
+def test_parallel_merge_sort_small_input_is_serial():
+    values = make_values('random', size=50)
+    assert SortingAlgorithms().parallel_merge_sort(values, workers=2) == sorted(values)
+
+
+def test_parallel_merge_sort_overflow_releases_shared_memory():
+    before = shared_memory_segments()
+    values = make_values('random', size=5000) + [2 ** 64]
+    with pytest.raises(OverflowError):
+        SortingAlgorithms().parallel_merge_sort(values, workers=2, threshold=0)
+    assert shared_memory_segments() <= before
+
+
+def test_parallel_merge_sort_invalid_workers():
+    with pytest.raises(ValueError):
+        SortingAlgorithms().parallel_merge_sort([1, 2], workers=0)
+
+
+def test_parallel_quick_sort():
+    values = make_values('random', size=20000)
+    assert SortingAlgorithms().parallel_quick_sort(values, workers=3) == sorted(values)
+
+
+def test_parallel_quick_sort_adds_up_thread_counters():
+    values = make_values('random', size=20000)
+    sorter = SortingAlgorithms(metrics_level='counters')
+    sorter.parallel_quick_sort(values, workers=4, grain_size=500)
+    assert sorter.metrics.comparisons >= len(values)
+
+
+def test_work_stealing_pool_runs_spawned_tasks():
+    done = []
+    lock = threading.Lock()
+    
+    def handler(worker_id, task, push):
+        if task > 0:
+            push(task - 1)
+            push(task - 1)
+        with lock:
+            done.append(task)
+    
+    WorkStealingPool(3).run([6], handler)
+    assert len(done) == 2 ** 7 - 1
+
+
+@pytest.mark.parametrize('container', ['array', 'memoryview', 'ndarray'])
+def test_parallel_quick_sort_typed_buffers(container):
+    values = make_values('random', size=20000)
+    if container == 'memoryview':
+        arr = memoryview(array('q', values))
+    else:
+        arr = as_container(values, container)
+    result = SortingAlgorithms().parallel_quick_sort(arr, workers=3, grain_size=1000)
+    assert as_list(result) == sorted(values)
+    assert as_list(arr) == values
+
+
+@pytest.mark.skipif(np is None, reason="NumPy is not installed")
+def test_parallel_quick_sort_keeps_nan_last():
+    values = np.random.default_rng(14).normal(size=20000)
+    values[::100] = np.nan
+    result = SortingAlgorithms().parallel_quick_sort(values, workers=2, grain_size=500)
+    assert np.isnan(result[-200:]).all()
+    np.testing.assert_array_equal(result[:-200], np.sort(values)[:-200])
+
+
+def test_parallel_quick_sort_threads_use_the_sorter_thresholds():
+    values = make_values('random', size=20000)
+    comparisons = []
+    for insertion_sort_threshold in (2, 64):
+        thresholds = Thresholds(insertion_sort_threshold=insertion_sort_threshold)
+        sorter = SortingAlgorithms(metrics_level='counters', thresholds=thresholds)
+        assert sorter.parallel_quick_sort(values, workers=2, grain_size=500) == sorted(values)
+        comparisons.append(sorter.metrics.comparisons)
+    # Insertion sort on leaves of up to 64 values compares much more
+    assert comparisons[0] < comparisons[1]
+
+
+def test_parallel_quick_sort_threads_report_to_the_tracer():
+    tracer = RecursionTracer()
+    sorter = SortingAlgorithms(tracer=tracer)
+    sorter.parallel_quick_sort(make_values('random', size=20000), workers=2, grain_size=500)
+    assert any(event[0] == 'partition' for event in tracer.events)
@@ -0,0 +1,35 @@
+"""
+Quick Sort Tests
+Introsort and classic quick sort against sorted()
+"""
+
+import pytest
+
+from conftest import as_container, as_list, make_values
+from sorting_algorithms import SortingAlgorithms
+
+
+@pytest.mark.parametrize('mode', ['introsort', 'classic'])
+def test_matches_sorted(mode, shape, container):
+    values = make_values(shape)
+    result = SortingAlgorithms().quick_sort(as_container(values, container), mode=mode)
+    assert as_list(result) == sorted(values)
+
+
+@pytest.mark.parametrize('shape', ['sorted', 'reversed', 'duplicates'])
+def test_introsort_bad_shapes_stay_shallow(shape):
+    # Textbook pivots would recurse n deep on these
+    values = make_values(shape, size=20000)
+    assert SortingAlgorithms().quick_sort(values, vectorized=False) == sorted(values)
+
+
+def test_copy_leaves_the_input_alone():
+    values = make_values('random')
+    original = list(values)
+    SortingAlgorithms().quick_sort(values)
+    assert values == original
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        SortingAlgorithms().quick_sort([3, 1, 2], mode='bogus')
@@ -0,0 +1,61 @@
+"""
+Results Store Tests
+"""
+
+import pytest
+
+from results_store import ResultStore
+
+
+def sample(**overrides):
+    row = {'engine': 'quick_sort', 'distribution': 'random', 'size': 100, 'seed': 1,
+           'iteration': 0, 'time': 0.5, 'comparisons': 10, 'swaps': 4, 'memory': 0}
+    row.update(overrides)
+    return row
+
+
+def test_summaries_and_series():
+    store = ResultStore()
+    store.append(**sample(time=0.5))
+    store.append(**sample(iteration=1, time=1.5, comparisons=30))
+    store.append(**sample(size=200, time=2.0))
+    assert len(store) == 3
+    assert store.has('quick_sort', 'random', 100, 1, 1)
+    assert not store.has('quick_sort', 'random', 100, 1, 2)
+    summary = store.summary('quick_sort', 'random', 100)
+    assert summary['samples'] == 2
+    assert summary['min_time'] == 0.5
+    assert summary['time'] == 1.0
+    assert summary['comparisons'] == 20
+    assert store.summary('merge_sort', 'random', 100) is None
+    assert store.series('quick_sort', 'random', 'time') == ([100, 200], [1.0, 2.0])
+    assert [row['iteration'] for row in store.rows(size=100)] == [0, 1]
+    assert store.values('size') == [100, 200]
+
+
+def test_missing_columns():
+    row = sample()
+    del row['swaps']
+    with pytest.raises(ValueError):
+        ResultStore().append(**row)
+
+
+def test_reload_and_resume(tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    with ResultStore(path) as store:
+        store.append(**sample())
+        store.append(**sample(iteration=1))
+    # An interrupted write leaves a partial last line behind
+    with open(path, 'a') as file:
+        file.write('{"engine": "quick')
+    with ResultStore(path) as store:
+        assert len(store) == 2
+        store.append(**sample(iteration=2))
+    assert len(ResultStore(path)) == 3
+
+
+def test_corrupt_line_in_the_middle(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    path.write_text('not json\n{}\n')
+    with pytest.raises(ValueError):
+        ResultStore(str(path))
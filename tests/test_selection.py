@@ -0,0 +1,54 @@
+"""
+Selection and Partial Sort Tests
+"""
+
+import pytest
+
+from conftest import make_values
+from sorting_algorithms import SortingAlgorithms
+
+
+def test_select_kth_and_nth_element(shape):
+    values = make_values(shape)
+    ordered = sorted(values)
+    sorter = SortingAlgorithms()
+    for k in sorted({0, len(values) // 2, len(values) - 1}) if values else []:
+        assert sorter.select_kth(values, k) == ordered[k]
+        result = sorter.nth_element(values, k)
+        assert result[k] == ordered[k]
+        assert all(value <= result[k] for value in result[:k])
+        assert all(value >= result[k] for value in result[k + 1:])
+        assert sorted(result) == ordered
+
+
+@pytest.mark.parametrize('k', [0, 1, 20, 300])
+def test_partial_sort(k):
+    values = make_values('random')
+    result = SortingAlgorithms().partial_sort(values, k)
+    assert result[:k] == sorted(values)[:k]
+    assert sorted(result) == sorted(values)
+
+
+@pytest.mark.parametrize('k', [0, 5, 1000])
+def test_top_k(k):
+    values = make_values('duplicates')
+    ordered = sorted(values)
+    sorter = SortingAlgorithms()
+    assert sorter.top_k(iter(values), k) == ordered[::-1][:k]
+    assert sorter.top_k(iter(values), k, largest=False) == ordered[:k]
+
+
+def test_out_of_range():
+    sorter = SortingAlgorithms()
+    with pytest.raises(IndexError):
+        sorter.nth_element([1, 2], 2)
+    with pytest.raises(IndexError):
+        sorter.partial_sort([1, 2], 3)
+    with pytest.raises(ValueError):
+        sorter.top_k([1, 2], -1)
+
+
+def test_inplace():
+    values = make_values('random')
+    assert SortingAlgorithms().nth_element(values, 10, inplace=True) is values
+    assert values[10] == sorted(values)[10]
@@ -0,0 +1,99 @@
+"""
+Sorted Run Container Tests
+"""
+
+import random
+import threading
+from collections import Counter
+
+import pytest
+
+from sorted_container import SortedRunContainer
+
+
+def test_batches_and_queries():
+    rng = random.Random(9)
+    container = SortedRunContainer()
+    expected = []
+    for _ in range(30):
+        batch = [rng.randrange(1000) for _ in range(rng.randrange(1, 50))]
+        container.add_batch(batch)
+        expected.extend(batch)
+    expected.sort()
+    assert list(container) == expected
+    assert len(container) == len(expected)
+    assert list(container.range(100, 500)) == [value for value in expected if 100 <= value < 500]
+    assert container.count(expected[0]) == expected.count(expected[0])
+    assert -1 not in container
+
+
+def test_remove_and_compact():
+    values = [5, 1, 5, 3, 5, 2]
+    container = SortedRunContainer(values)
+    container.add_batch([5, 4])
+    container.remove(5)
+    container.discard(5)
+    container.discard(42)
+    with pytest.raises(KeyError):
+        container.remove(42)
+    assert list(container) == [1, 2, 3, 4, 5, 5]
+    container.compact()
+    assert len(container.runs) == 1
+    assert not container.deleted
+    assert list(container) == [1, 2, 3, 4, 5, 5]
+
+
+def test_aux_space_is_released():
+    container = SortedRunContainer()
+    for start in range(0, 1000, 10):
+        container.add_batch(range(start, start + 10))
+    assert container.metrics.aux_live == 0
+
+
+def test_concurrent_batches_and_compactions():
+    container = SortedRunContainer()
+    added = Counter()
+    lock = threading.Lock()
+    
+    def producer(seed):
+        rng = random.Random(seed)
+        for _ in range(40):
+            batch = [rng.randrange(500) for _ in range(rng.randrange(1, 30))]
+            container.add_batch(batch)
+            with lock:
+                added.update(batch)
+    
+    def compactor():
+        for _ in range(20):
+            container.compact_in_background()
+            container.compact()
+    
+    threads = [threading.Thread(target=producer, args=(seed,)) for seed in range(4)]
+    threads.append(threading.Thread(target=compactor))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    container.compact()
+    
+    assert list(container) == sorted(added.elements())
+    assert len(container) == sum(added.values())
+
+
+def test_removals_during_background_compaction():
+    rng = random.Random(10)
+    values = [rng.randrange(100) for _ in range(5000)]
+    container = SortedRunContainer()
+    for start in range(0, len(values), 100):
+        container.add_batch(values[start:start + 100])
+    remaining = Counter(values)
+    thread = container.compact_in_background()
+    for value in values[::7]:
+        if remaining[value]:
+            container.remove(value)
+            remaining[value] -= 1
+    container.add_batch([1000, 1001])
+    remaining.update([1000, 1001])
+    thread.join()
+    container.compact()
+    assert list(container) == sorted(remaining.elements())
@@ -0,0 +1,45 @@
+"""
+String Sort Tests
+Multikey quick sort against sorted()
+"""
+
+import random
+import string
+
+from sorting_algorithms import SortingAlgorithms
+
+
+def random_strings(count: int, seed: int = 0, alphabet: str = 'abc') -> list:
+    rng = random.Random(seed)
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randrange(12))) for _ in range(count)]
+
+
+def test_matches_sorted():
+    values = random_strings(500) + random_strings(200, 1, string.ascii_letters + 'é€')
+    assert SortingAlgorithms().string_sort(values) == sorted(values)
+
+
+def test_long_shared_prefixes():
+    prefix = 'x' * 200
+    values = [prefix + word for word in random_strings(300, 2)] + [prefix, prefix[:-1], '']
+    assert SortingAlgorithms().string_sort(values) == sorted(values)
+
+
+def test_prefix_checks_are_counted():
+    prefix = 'y' * 50
+    values = [prefix + word for word in random_strings(200, 3)]
+    sorter = SortingAlgorithms(metrics_level='counters')
+    sorter.string_sort(values)
+    assert sorter.metrics.comparisons >= len(values)
+
+
+def test_inplace():
+    values = random_strings(100)
+    expected = sorted(values)
+    assert SortingAlgorithms().string_sort(values, inplace=True) is values
+    assert values == expected
+
+
+def test_bytes():
+    values = [word.encode() for word in random_strings(300, 4)] + [b'\xff', b'\x00', b'']
+    assert SortingAlgorithms().string_sort(values) == sorted(values)
@@ -0,0 +1,97 @@
+"""
+Threshold and Tuning Profile Tests
+"""
+
+import json
+
+import pytest
+
+import autotune
+import sorting_algorithms
+from autotune import save_profile
+from conftest import make_values
+from sorting_algorithms import (INSERTION_SORT_THRESHOLD, SortingAlgorithms, Thresholds,
+                                default_thresholds, load_tuning_profile, profile_key)
+
+
+def test_defaults_and_update():
+    thresholds = Thresholds(MIN_MERGE=16)
+    assert thresholds.min_merge == 16
+    assert thresholds.insertion_sort_threshold == INSERTION_SORT_THRESHOLD
+    previous = thresholds.update({'insertion_sort_threshold': 4})
+    assert previous == {'insertion_sort_threshold': INSERTION_SORT_THRESHOLD}
+    assert thresholds.copy().to_dict() == thresholds.to_dict()
+
+
+@pytest.mark.parametrize('values', [
+    {'bogus': 1},
+    {'min_merge': 0},
+    {'min_merge': 2.5},
+    {'min_merge': True},
+    {'radix_pass_ratio': -1},
+    {'min_merge': 8, 'parallel_threshold': -1},
+])
+def test_invalid_values_change_nothing(values):
+    thresholds = Thresholds()
+    with pytest.raises(ValueError):
+        thresholds.update(values)
+    assert thresholds.to_dict() == Thresholds().to_dict()
+
+
+@pytest.mark.parametrize('insertion_sort_threshold', [1, 4, 64])
+def test_sorters_use_their_own_thresholds(insertion_sort_threshold):
+    tuned = SortingAlgorithms(thresholds=Thresholds(insertion_sort_threshold=insertion_sort_threshold))
+    default = SortingAlgorithms()
+    assert default.thresholds.insertion_sort_threshold == INSERTION_SORT_THRESHOLD
+    values = make_values('random')
+    assert tuned.quick_sort(values, vectorized=False) == sorted(values)
+    assert tuned.merge_sort(values, vectorized=False) == sorted(values)
+
+
+def test_load_profile(tmp_path):
+    path = str(tmp_path / 'profile.json')
+    assert load_tuning_profile(path).to_dict() == Thresholds().to_dict()
+    save_profile({'min_merge': 48}, path)
+    assert load_tuning_profile(path).min_merge == 48
+
+
+def test_sorters_load_the_default_profile(tmp_path, monkeypatch):
+    path = str(tmp_path / 'profile.json')
+    monkeypatch.delenv('SORTING_TUNING_PROFILE')
+    monkeypatch.setattr(sorting_algorithms, 'TUNING_PROFILE_PATH', path)
+    monkeypatch.setattr(autotune, 'TUNING_PROFILE_PATH', path)
+    # Where autotune.py saves by default
+    autotune.save_profile({'min_merge': 48})
+    assert SortingAlgorithms().thresholds.min_merge == 48
+
+
+def test_sorters_without_a_profile_entry_use_the_defaults(tmp_path, monkeypatch):
+    path = tmp_path / 'profile.json'
+    path.write_text(json.dumps({'other-host/CPython-3.0': {'thresholds': {'min_merge': 48}}}))
+    monkeypatch.setenv('SORTING_TUNING_PROFILE', str(path))
+    assert SortingAlgorithms().thresholds.to_dict() == Thresholds().to_dict()
+
+
+@pytest.mark.parametrize('content', [
+    'not json',
+    json.dumps({profile_key(): {'thresholds': {'min_merge': -3}}}),
+    json.dumps({profile_key(): {'thresholds': {'bogus': 3}}}),
+    json.dumps({profile_key(): {'thresholds': [1, 2]}}),
+])
+def test_load_invalid_profile(tmp_path, content):
+    path = tmp_path / 'profile.json'
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        load_tuning_profile(str(path))
+
+
+def test_profile_from_environment(tmp_path, monkeypatch):
+    path = str(tmp_path / 'profile.json')
+    save_profile({'vector_leaf_size': 99}, path)
+    monkeypatch.setenv('SORTING_TUNING_PROFILE', path)
+    assert default_thresholds().vector_leaf_size == 99
+    sorter = SortingAlgorithms()
+    assert sorter.thresholds.vector_leaf_size == 99
+    # Every sorter gets its own copy
+    sorter.thresholds.update({'vector_leaf_size': 5})
+    assert SortingAlgorithms().thresholds.vector_leaf_size == 99
@@ -0,0 +1,97 @@
+"""
+Recursion Tracer Tests
+"""
+
+import json
+import threading
+
+import pytest
+
+from conftest import make_values
+from sorting_algorithms import SortingAlgorithms
+from tracer import RecursionTracer
+
+
+def traced_sorter(**options):
+    tracer = RecursionTracer(**options)
+    return SortingAlgorithms(tracer=tracer), tracer
+
+
+@pytest.mark.parametrize('sort', ['quick_sort', 'merge_sort'])
+def test_records_nodes(sort):
+    sorter, tracer = traced_sorter()
+    values = make_values('random', size=2000)
+    assert getattr(sorter, sort)(values, vectorized=False) == sorted(values)
+    assert tracer.events
+    depths = [event[2] for event in tracer.events]
+    assert min(depths) == 0
+    assert all(event[7] <= event[6] + 1e-9 for event in tracer.events)
+
+
+def test_classic_quick_sort_forwards_keyword_arguments():
+    sorter, tracer = traced_sorter()
+    values = make_values('random', size=500)
+    assert sorter.quick_sort(values, mode='classic', vectorized=False) == sorted(values)
+    assert sorter.merge_sort(values, mode='classic') == sorted(values)
+
+
+def test_self_time_adds_up_to_root_duration():
+    sorter, tracer = traced_sorter()
+    sorter.quick_sort(make_values('random', size=3000), vectorized=False)
+    root = max(tracer.events, key=lambda event: event[6])
+    total_self = sum(event[7] for event in tracer.events)
+    assert total_self == pytest.approx(root[6], rel=1e-6)
+
+
+def test_sampling_keeps_time_with_ancestors():
+    sorter, tracer = traced_sorter(sample_every=3)
+    sorter.quick_sort(make_values('random', size=3000), vectorized=False)
+    assert all(event[7] >= 0 for event in tracer.events)
+
+
+def test_threads_keep_separate_stacks():
+    tracer = RecursionTracer()
+    # Threads wait for each other at the end, so none exits (and has its id
+    # reused) before the others are done
+    barrier = threading.Barrier(4)
+    
+    def work(seed):
+        SortingAlgorithms(tracer=tracer).merge_sort(make_values('random', 2000, seed),
+                                                    vectorized=False)
+        barrier.wait()
+    
+    threads = [threading.Thread(target=work, args=(seed,)) for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({event[8] for event in tracer.events}) == len(threads)
+    for event in tracer.events:
+        # Every recorded stack is a path of one thread's own calls
+        assert event[1][-1] == event[0]
+        assert event[1].count('merge_sort_helper') <= 1
+
+
+def test_exports(tmp_path):
+    sorter, tracer = traced_sorter(max_events=50)
+    sorter.quick_sort(make_values('random', size=3000), vectorized=False)
+    assert len(tracer.events) == 50
+    assert tracer.dropped > 0
+    
+    trace = tracer.to_chrome_trace(str(tmp_path / 'trace.json'))
+    assert json.loads((tmp_path / 'trace.json').read_text()) == trace
+    assert len(trace['traceEvents']) == 50
+    lines = tracer.to_collapsed_stacks(str(tmp_path / 'stacks.txt'))
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    histograms = tracer.depth_histograms(bins=4, name='partition')
+    assert sum(entry['nodes'] for entry in histograms.values()) <= 50
+    
+    sorter.set_tracer(None)
+    tracer.clear()
+    sorter.quick_sort([3, 2, 1])
+    assert not tracer.events
+
+
+def test_invalid_sampling():
+    with pytest.raises(ValueError):
+        RecursionTracer(sample_every=0)
@@ -0,0 +1,75 @@
+"""
+Typed Buffer Tests
+array.array, memoryview and NumPy inputs, in place and vectorized
+"""
+
+from array import array
+
+import pytest
+
+from conftest import as_container, as_list, make_values
+from sorting_algorithms import SortingAlgorithms
+from typed_buffers import as_numpy_view, copy_buffer, np, store_values
+
+
+@pytest.mark.parametrize('sort', ['quick_sort', 'merge_sort'])
+def test_inplace_sorts_the_input(sort, container):
+    values = make_values('random')
+    arr = as_container(values, container)
+    assert getattr(SortingAlgorithms(), sort)(arr, inplace=True) is arr
+    assert as_list(arr) == sorted(values)
+
+
+@pytest.mark.parametrize('sort', ['quick_sort', 'merge_sort'])
+def test_memoryview_is_sorted_in_place(sort):
+    values = make_values('random')
+    buffer = array('q', values)
+    getattr(SortingAlgorithms(), sort)(memoryview(buffer), inplace=True)
+    assert buffer.tolist() == sorted(values)
+
+
+@pytest.mark.parametrize('sort', ['quick_sort', 'merge_sort'])
+@pytest.mark.parametrize('vectorized', [True, False])
+def test_vectorized_and_python_engines_agree(sort, vectorized):
+    if np is None:
+        pytest.skip("NumPy is not installed")
+    values = make_values('random', size=5000)
+    result = getattr(SortingAlgorithms(), sort)(array('q', values), vectorized=vectorized)
+    assert isinstance(result, array)
+    assert result.tolist() == sorted(values)
+
+
+def test_vectorized_needs_a_numeric_buffer():
+    with pytest.raises(ValueError):
+        SortingAlgorithms().quick_sort([3, 1, 2], vectorized=True)
+
+
+@pytest.mark.skipif(np is None, reason="NumPy is not installed")
+def test_vectorized_keeps_nan_last():
+    rng = np.random.default_rng(2)
+    values = rng.normal(size=5000)
+    values[rng.choice(5000, 50, replace=False)] = np.nan
+    result = SortingAlgorithms().quick_sort(values, vectorized=True)
+    assert len(result) == len(values)
+    assert np.isnan(result[-50:]).all()
+    assert (result[:-50] == np.sort(values)[:-50]).all()
+
+
+@pytest.mark.skipif(np is None, reason="NumPy is not installed")
+def test_vectorized_keeps_signed_zeros():
+    values = np.array([0.0, -0.0] * 1500 + [1.0, -1.0] * 500)
+    result = SortingAlgorithms().quick_sort(values, vectorized=True)
+    assert np.signbit(result).sum() == np.signbit(values).sum()
+
+
+def test_helpers():
+    buffer = array('d', [3.0, 1.0])
+    copy = copy_buffer(memoryview(buffer))
+    assert isinstance(copy, array) and copy.typecode == 'd'
+    store_values(buffer, [1.0, 3.0])
+    assert buffer.tolist() == [1.0, 3.0]
+    assert as_numpy_view([1, 2]) is None
+    if np is not None:
+        view = as_numpy_view(buffer)
+        view[0] = 7.0
+        assert buffer[0] == 7.0
@@ -0,0 +1,186 @@
+"""
+Tracer Module
+Records what happens at every recursion node of a sort (depth, size,
+partition balance, time) and exports it as a Chrome trace, a collapsed
+stack flamegraph or per-depth histograms
+"""
+
+import json
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, List
+
+
+class RecursionTracer:
+    """Collects one record per traced call (recursion node) of a sort"""
+    
+    def __init__(self, sample_every: int = 1, min_size: int = 0, max_events: int = 1_000_000):
+        """
+        Args:
+            sample_every: Record every k-th node only (timing is skipped for
+                          the others, which keeps the overhead bounded)
+            min_size: Don't record nodes working on fewer elements than this
+            max_events: Stop recording once this many nodes are stored
+        """
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self.min_size = min_size
+        self.max_events = max_events
+        # (name, stack, depth, size, balance, start, duration, self_time, thread id)
+        self.events = []
+        self.dropped = 0   # Nodes not recorded because max_events was reached
+        self._origin = time.perf_counter()
+        self._seen = 0
+        # Open nodes of every thread: [name, start time or None if not
+        # sampled, time of sampled descendants, recursive]
+        self._local = threading.local()
+    
+    def _open_frames(self) -> list:
+        """Open nodes of the calling thread, outermost first"""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+    
+    def wrap(self, name: str, method: Callable, size_of: Callable, balance_of: Callable = None,
+             recursive: bool = True):
+        """
+        Wrap a bound method so every call is recorded as a node
+        
+        Args:
+            name: Name shown in the exports
+            method: Bound method to wrap
+            size_of: Called with the method's arguments, returns the number
+                     of elements the call works on
+            balance_of: Called with the result and the arguments, returns
+                        smaller side / bigger side (1.0 is perfectly
+                        balanced), or None if the node has no split
+            recursive: Whether the method is a recursion step (a sort
+                       helper) rather than work done inside one (a
+                       partition or merge); only recursion steps count
+                       towards the depth
+        
+        Returns:
+            Function with the same signature as method
+        """
+        @wraps(method)
+        def traced(*args, **kwargs):
+            size = size_of(*args, **kwargs)
+            self._seen += 1
+            sampled = size >= self.min_size and self._seen % self.sample_every == 0
+            stack = self._open_frames()
+            frame = [name, time.perf_counter() if sampled else None, 0.0, recursive]
+            stack.append(frame)
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                stack.pop()
+            if sampled:
+                balance = balance_of(result, *args, **kwargs) if balance_of else None
+                self._record(stack, frame, size, balance)
+            return result
+        return traced
+    
+    def _record(self, stack: list, frame: list, size: int, balance: float):
+        """Store a finished sampled node (stack holds its open ancestors)"""
+        name, start, child_time, recursive = frame
+        duration = time.perf_counter() - start
+        # Unsampled nodes in between don't record anything, so the time
+        # goes to the nearest ancestor that will
+        for ancestor in reversed(stack):
+            if ancestor[1] is not None:
+                ancestor[2] += duration
+                break
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+        # Recursion depth: the root sort call is depth 0, and a partition or
+        # merge has the depth of the recursion step that runs it
+        depth = sum(1 for ancestor in stack if ancestor[3])
+        if not recursive:
+            depth = max(depth - 1, 0)
+        path = tuple(ancestor[0] for ancestor in stack) + (name,)
+        self.events.append((name, path, depth, size, balance, start - self._origin,
+                            duration, duration - child_time, threading.get_ident()))
+    
+    def clear(self):
+        """Forget everything recorded so far"""
+        self.events = []
+        self.dropped = 0
+        self._seen = 0
+        self._origin = time.perf_counter()
+    
+    def to_chrome_trace(self, path: str = None) -> dict:
+        """
+        Export as Chrome trace JSON (open in chrome://tracing or Perfetto)
+        
+        Args:
+            path: File to write the JSON to (optional)
+        
+        Returns:
+            The trace as a dictionary
+        """
+        trace_events = []
+        for name, _, depth, size, balance, start, duration, _, thread in self.events:
+            args = {'depth': depth, 'size': size}
+            if balance is not None:
+                args['balance'] = round(balance, 4)
+            trace_events.append({'name': name, 'ph': 'X', 'pid': 0, 'tid': thread,
+                                 'ts': start * 1e6, 'dur': duration * 1e6, 'args': args})
+        trace = {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+        if path:
+            with open(path, 'w') as file:
+                json.dump(trace, file)
+        return trace
+    
+    def to_collapsed_stacks(self, path: str = None) -> List[str]:
+        """
+        Export as collapsed stacks for flamegraph.pl / speedscope
+        
+        Each line is "outer;inner;node self_time_in_microseconds". Time
+        spent in nodes that weren't sampled counts as the own time of the
+        nearest sampled ancestor.
+        
+        Args:
+            path: File to write the lines to (optional)
+        
+        Returns:
+            The lines, heaviest stack first
+        """
+        totals = {}
+        for _, stack, _, _, _, _, _, self_time, _ in self.events:
+            totals[stack] = totals.get(stack, 0.0) + self_time
+        lines = [f"{';'.join(stack)} {round(total * 1e6)}"
+                 for stack, total in sorted(totals.items(), key=lambda item: -item[1])]
+        if path:
+            with open(path, 'w') as file:
+                file.write('\n'.join(lines) + '\n')
+        return lines
+    
+    def depth_histograms(self, bins: int = 10, name: str = None) -> Dict[int, dict]:
+        """
+        Summarize the recorded nodes per recursion depth
+        
+        Args:
+            bins: Number of equal-width buckets for the balance ratios
+            name: Only count nodes of this kind (e.g. 'partition')
+        
+        Returns:
+            {depth: {'nodes', 'elements', 'time', 'balance'}} by recursion
+            depth (see wrap), where balance
+            counts nodes per bucket from 0 (one side empty) to 1 (even split)
+        """
+        histograms = {}
+        for node_name, _, depth, size, balance, _, duration, _, _ in self.events:
+            if name is not None and node_name != name:
+                continue
+            entry = histograms.setdefault(depth, {'nodes': 0, 'elements': 0, 'time': 0.0,
+                                                  'balance': [0] * bins})
+            entry['nodes'] += 1
+            entry['elements'] += size
+            entry['time'] += duration
+            if balance is not None:
+                entry['balance'][min(int(balance * bins), bins - 1)] += 1
+        return dict(sorted(histograms.items()))
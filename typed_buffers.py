@@ -0,0 +1,104 @@
+"""
+Typed Buffers Module
+Helpers that let the sorting algorithms work on array.array, memoryview
+and NumPy arrays as well as on plain lists
+"""
+
+import importlib
+import sys
+from array import array
+from importlib.util import find_spec
+
+
+class _LazyModule:
+    """Stand-in for a module that is only imported when first used"""
+    
+    def __init__(self, name: str):
+        self._name = name
+    
+    def __getattr__(self, attribute: str):
+        value = getattr(importlib.import_module(self._name), attribute)
+        # Cache it so later lookups don't come through here again
+        setattr(self, attribute, value)
+        return value
+
+
+# NumPy is optional and slow to import, so it is only imported once a
+# NumPy code path actually runs
+NUMPY_AVAILABLE = find_spec('numpy') is not None
+np = _LazyModule('numpy') if NUMPY_AVAILABLE else None
+
+
+def is_ndarray(arr) -> bool:
+    """True if arr is a NumPy array (without importing NumPy to find out)"""
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(arr, numpy.ndarray)
+
+
+def copy_buffer(arr):
+    """
+    Copy the input into a new container of the same kind
+    
+    Lists, array.array and NumPy arrays are copied as the same type.
+    A memoryview is copied into an array.array with the same format.
+    
+    Args:
+        arr: Sequence of numbers
+        
+    Returns:
+        A new, independent container holding the same values
+    """
+    if isinstance(arr, list):
+        return arr.copy()
+    if isinstance(arr, array):
+        return array(arr.typecode, arr)
+    if isinstance(arr, memoryview):
+        return array(arr.format, arr)
+    if is_ndarray(arr):
+        return arr.copy()
+    return list(arr)
+
+
+def as_numpy_view(arr):
+    """
+    Get a NumPy array that shares memory with arr, without copying
+    
+    Args:
+        arr: array.array, memoryview or NumPy array
+        
+    Returns:
+        A 1-D numeric NumPy array viewing arr's memory, or None if NumPy
+        isn't installed or arr can't be viewed that way
+    """
+    if not NUMPY_AVAILABLE or isinstance(arr, list):
+        return None
+    if is_ndarray(arr):
+        view = arr
+    else:
+        try:
+            view = np.asarray(arr)
+        except (TypeError, ValueError):
+            return None
+    if view.ndim != 1 or view.dtype.kind not in 'iuf' or not view.flags.writeable:
+        return None
+    if view.base is None and view is not arr:
+        # np.asarray had to copy, so this wouldn't be a view
+        return None
+    return view
+
+
+def store_values(target, values):
+    """
+    Write values into target in place (target[:] = values)
+    
+    Args:
+        target: List, array.array, memoryview or NumPy array to overwrite
+        values: Sequence with the same number of values
+    """
+    if values is target:
+        return
+    if isinstance(target, array) and not isinstance(values, array):
+        values = array(target.typecode, values)
+    elif isinstance(target, memoryview):
+        values = array(target.format, values)
+    target[:] = values
@@ -0,0 +1,111 @@
+"""
+Work Stealing Module
+A small thread pool where every worker owns a deque of tasks and idle
+workers steal from the others
+"""
+
+import threading
+from collections import deque
+from typing import Any, Callable, List
+
+
+class WorkStealingPool:
+    """Thread pool that runs tasks which can spawn more tasks"""
+    
+    def __init__(self, workers: int):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+    
+    def run(self, tasks: List[Any], handler: Callable[[int, Any, Callable[[Any], None]], None]):
+        """
+        Run tasks until every task (and every task they spawn) is finished
+        
+        Each worker pops its newest task from its own deque (good cache
+        locality) while idle workers steal the oldest task from another
+        worker's deque (usually the biggest piece of work).
+        
+        Args:
+            tasks: Initial tasks, handed out round-robin to the workers
+            handler: Called as handler(worker_id, task, push) on a worker
+                     thread; push(new_task) queues more work on that worker
+        """
+        self._deques = [deque() for _ in range(self.workers)]
+        self._condition = threading.Condition()
+        self._pending = len(tasks)
+        self._errors = []
+        
+        for i, task in enumerate(tasks):
+            self._deques[i % self.workers].append(task)
+        
+        threads = [threading.Thread(target=self._worker_loop, args=(worker_id, handler))
+                   for worker_id in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        if self._errors:
+            raise self._errors[0]
+    
+    def _worker_loop(self, worker_id: int, handler: Callable):
+        """Keep taking tasks until there is no work left anywhere"""
+        def push(task):
+            self._push(worker_id, task)
+        
+        while True:
+            task = self._next_task(worker_id)
+            if task is None:
+                return
+            try:
+                handler(worker_id, task, push)
+            except BaseException as error:
+                with self._condition:
+                    self._errors.append(error)
+                    self._condition.notify_all()
+            finally:
+                with self._condition:
+                    self._pending -= 1
+                    if self._pending == 0:
+                        self._condition.notify_all()
+    
+    def _push(self, worker_id: int, task: Any):
+        """Queue a new task on a worker's own deque and wake an idle worker"""
+        with self._condition:
+            self._pending += 1
+            self._deques[worker_id].append(task)
+            self._condition.notify()
+    
+    def _next_task(self, worker_id: int):
+        """
+        Get the next task for a worker
+        
+        Returns:
+            A task, or None once all work is done (or a task failed)
+        """
+        # Fast path: newest task from our own deque, no lock needed
+        try:
+            return self._deques[worker_id].pop()
+        except IndexError:
+            pass
+        
+        # Tasks are only pushed while holding the lock, so scanning under it
+        # can't miss a push that happens just before we go to sleep
+        with self._condition:
+            while True:
+                if self._errors or self._pending == 0:
+                    return None
+                task = self._steal(worker_id)
+                if task is not None:
+                    return task
+                self._condition.wait()
+    
+    def _steal(self, worker_id: int):
+        """Take the oldest task from the first other worker that has one"""
+        for offset in range(self.workers):
+            victim = self._deques[(worker_id + offset) % self.workers]
+            try:
+                return victim.popleft()
+            except IndexError:
+                continue
+        return None